@@ -0,0 +1,220 @@
+"""
+Date normalization for the date-like string fields of the schemas.
+
+LLMs answer with "2025-03-01", "2025-03-01T00:00:00Z", "March 2026",
+"Mar 3, 2026", "Q3 2025", "H1 2026", "2026"... ``parse_date`` turns all of
+them into a ``datetime.date``:
+
+* ISO dates take a fast path through ``date.fromisoformat``,
+* the other formats are matched by precompiled regular expressions,
+* results are memoized, since the same strings come back again and again
+  (strings over ``MAX_CHARS`` characters are rejected without matching).
+
+Periods resolve to their first day ("Q3 2025" -> 2025-07-01,
+"March 2026" -> 2026-03-01, "2026" -> 2026-01-01). Numeric dates with
+slashes are read month first (03/04/2026 is March 4th) unless the first
+number cannot be a month (25/04/2026).
+
+"today" and "now" are resolved on every call, never at import time.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Annotated, Any, Optional
+
+from pydantic import BeforeValidator
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7,
+    "july": 7, "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12,
+    "december": 12,
+}  # fmt: skip
+
+RELATIVE = ("today", "now")
+
+_YMD = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})")
+_DMY = re.compile(r"(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})")
+_YM = re.compile(r"(\d{4})[-/.](\d{1,2})")
+_QUARTER = re.compile(
+    r"(?:q([1-4])[\s,/-]*(?:fy)?(\d{4}))|(?:(\d{4})[\s,/-]*q([1-4]))"
+)
+_HALF = re.compile(
+    r"(?:h([12])[\s,/-]*(?:fy)?(\d{4}))|(?:(\d{4})[\s,/-]*h([12]))"
+)
+_MONTH_DAY_YEAR = re.compile(
+    r"([a-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})"
+)
+_DAY_MONTH_YEAR = re.compile(
+    r"(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?([a-z]+)\.?,?\s+(\d{4})"
+)
+_MONTH_YEAR = re.compile(r"([a-z]+)\.?,?\s+(?:of\s+)?(\d{4})")
+_YEAR = re.compile(r"(?:fy\s*)?(\d{4})")
+# Longer text is not a date, and is neither matched nor cached.
+MAX_CHARS = 40
+# What follows the date in "2025-03-01T10:00:00Z" or "2025-03-01 10:00".
+_TIME = re.compile(r"\d{2}:\d{2}")
+
+
+@lru_cache(maxsize=8192)
+def _parse(text: str) -> Optional[date]:
+    """Parse a non relative date string; None if no format matches."""
+    if len(text) == 10:
+        try:
+            return date.fromisoformat(text)
+        except ValueError:
+            pass
+    elif len(text) > 10 and text[10] in "Tt " and _TIME.match(text, 11):
+        try:
+            return date.fromisoformat(text[:10])
+        except ValueError:
+            pass
+
+    text = text.strip().lower()
+    try:
+        match = _YMD.fullmatch(text)
+        if match:
+            year, month, day = match.groups()
+            return date(int(year), int(month), int(day))
+        match = _DMY.fullmatch(text)
+        if match:
+            first, second, year = (int(part) for part in match.groups())
+            if first > 12:
+                return date(year, second, first)
+            return date(year, first, second)
+        match = _QUARTER.fullmatch(text)
+        if match:
+            quarter, year, year_, quarter_ = match.groups()
+            month = 3 * int(quarter or quarter_) - 2
+            return date(int(year or year_), month, 1)
+        match = _HALF.fullmatch(text)
+        if match:
+            half, year, year_, half_ = match.groups()
+            month = 6 * int(half or half_) - 5
+            return date(int(year or year_), month, 1)
+        match = _YM.fullmatch(text)
+        if match:
+            return date(int(match[1]), int(match[2]), 1)
+        match = _MONTH_DAY_YEAR.fullmatch(text)
+        if match:
+            return date(int(match[3]), MONTHS[match[1]], int(match[2]))
+        match = _DAY_MONTH_YEAR.fullmatch(text)
+        if match:
+            return date(int(match[3]), MONTHS[match[2]], int(match[1]))
+        match = _MONTH_YEAR.fullmatch(text)
+        if match:
+            return date(int(match[2]), MONTHS[match[1]], 1)
+        match = _YEAR.fullmatch(text)
+        if match:
+            return date(int(match[1]), 1, 1)
+    except (KeyError, ValueError):
+        return None
+    return None
+
+
+def parse_date(value: Any, today: Optional[date] = None) -> date:
+    """
+    Return ``value`` as a ``date``. Raises ValueError for anything that
+    is not a date, a datetime or a string in one of the known formats.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date: {value!r}")
+    result = _parse(value) if len(value) <= MAX_CHARS else None
+    if result is None:
+        if value.strip().lower() in RELATIVE:
+            return today or date.today()
+        raise ValueError(f"Invalid date: {value!r}")
+    return result
+
+
+def normalize_date(value: Any, today: Optional[date] = None) -> str:
+    """``parse_date`` formatted as ``YYYY-MM-DD``."""
+    return parse_date(value, today).isoformat()
+
+
+def today_iso() -> str:
+    """Today's date as ``YYYY-MM-DD``, computed at call time."""
+    return date.today().isoformat()
+
+
+def coerce_date(value: Any) -> Any:
+    """
+    Normalize dates for free-form fields: known formats become
+    ``YYYY-MM-DD``, anything else is returned unchanged.
+    """
+    if value is None:
+        return value
+    try:
+        return normalize_date(value)
+    except ValueError:
+        return value
+
+
+# String field that is normalized to YYYY-MM-DD whenever it holds a date.
+NormalizedDate = Annotated[str, BeforeValidator(coerce_date)]
+
+
+def cache_info():
+    return _parse.cache_info()
+
+
+def clear_cache():
+    _parse.cache_clear()
+
+
+def benchmark(size: Optional[int] = None) -> dict:
+    """
+    Normalize ``size`` (default 1M) date strings drawn from a pool of
+    formats LLMs produce, cold and with a warm cache, against a plain
+    ``strptime`` of the ISO format.
+    """
+    import calendar
+    import random
+    import time
+
+    size = size or 1_000_000
+    rng = random.Random(0)
+    pool = []
+    for year in range(2020, 2031):
+        for month in range(1, 13):
+            name = calendar.month_name[month]
+            pool += [
+                f"{year}-{month:02d}-15",
+                f"{year}-{month:02d}-15T09:30:00Z",
+                f"{name} {year}",
+                f"{name[:3]} 3, {year}",
+                f"Q{(month - 1) // 3 + 1} {year}",
+                f"{month:02d}/15/{year}",
+            ]
+    corpus = [rng.choice(pool) for _ in range(size)]
+    iso = [f"{rng.randint(2020, 2030)}-03-15" for _ in range(size)]
+
+    def run(func, values):
+        start = time.perf_counter()
+        for value in values:
+            func(value)
+        return time.perf_counter() - start
+
+    clear_cache()
+    cold_s = run(normalize_date, corpus)
+    warm_s = run(normalize_date, corpus)
+    clear_cache()
+    iso_s = run(normalize_date, iso)
+    strptime_s = run(
+        lambda value: datetime.strptime(value, "%Y-%m-%d").date(), iso
+    )
+    return {
+        "config": {"strings": size, "distinct": len(pool)},
+        "mixed_formats_first_pass_s": cold_s,
+        "mixed_formats_warm_s": warm_s,
+        "mixed_formats_per_s": size / warm_s,
+        "iso_normalize_s": iso_s,
+        "iso_strptime_s": strptime_s,
+        "iso_speedup_vs_strptime": round(strptime_s / iso_s, 2),
+    }
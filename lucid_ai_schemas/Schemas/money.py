@@ -0,0 +1,215 @@
+"""
+Money and quantity parsing for the funding/revenue fields.
+
+``parse_money`` reads the amounts users and LLMs write, e.g. "$2.5M",
+"1,200,000", "€500k", "EUR 1.5 million", "2.000.000,50 €", "about 3bn",
+and returns the number plus the detected currency:
+
+    >>> parse_money("€500k")
+    Money(amount=500000, currency='EUR')
+
+Parsing is memoized, so repeated strings cost a dictionary lookup.
+
+The package schemas keep their amount fields as given; their
+``money(field)`` method returns the parsed ``Money``. ``MoneyAmount`` is
+an annotated type a schema can opt into to store amounts normalized at
+validation instead: amount strings become the number and its currency
+code, "€500k" as "500000 EUR" and "1,200,000" as "1200000", numbers are
+kept as numbers, and text that is not an amount ("not sure yet") is
+kept as is. ``parse_money`` reads a normalized amount back.
+"""
+
+import re
+from functools import lru_cache
+from typing import Annotated, Any, NamedTuple, Optional, Union
+
+from pydantic import BeforeValidator, StrictFloat, StrictInt
+
+CURRENCIES = {
+    "$": "USD", "us$": "USD", "usd": "USD", "dollar": "USD",
+    "dollars": "USD", "€": "EUR", "eur": "EUR", "euro": "EUR",
+    "euros": "EUR", "£": "GBP", "gbp": "GBP", "pound": "GBP",
+    "pounds": "GBP", "¥": "JPY", "jpy": "JPY", "yen": "JPY",
+    "₹": "INR", "inr": "INR", "rupees": "INR", "₪": "ILS", "ils": "ILS",
+    "nis": "ILS", "shekels": "ILS", "cad": "CAD", "c$": "CAD",
+    "aud": "AUD", "a$": "AUD", "chf": "CHF",
+}  # fmt: skip
+
+MULTIPLIERS = {
+    "k": 10**3, "thousand": 10**3,
+    "m": 10**6, "mm": 10**6, "mn": 10**6, "mil": 10**6,
+    "million": 10**6, "millions": 10**6,
+    "b": 10**9, "bn": 10**9, "billion": 10**9, "billions": 10**9,
+    "t": 10**12, "tn": 10**12, "trillion": 10**12,
+}  # fmt: skip
+
+
+def _alternatives(words) -> str:
+    # Longest first so "mm" wins over "m" and "us$" over "$".
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+_CURRENCY = _alternatives(CURRENCIES)
+# Longer text is not an amount, and is neither matched nor cached.
+MAX_CHARS = 64
+# Every run of spaces can be matched one way only (a separator in the
+# number is followed by a digit, the spaces after a word belong to it),
+# so a failed match does not backtrack over them.
+_AMOUNT = re.compile(
+    rf"""
+    (?:(?:about|around|approx(?:imately|\.)?|roughly|~|up\ to|over|under)
+    \s*)?
+    (?:(?P<pre>{_CURRENCY})\s*)?
+    (?P<number>\d+(?:[,.\ ]\d{{1,3}})*(?:[.,]\d+)?)\s*
+    (?:(?P<suffix>{_alternatives(MULTIPLIERS)})\.?\s*)?
+    (?P<post>{_CURRENCY})?
+    """,
+    re.VERBOSE,
+)
+
+
+class Money(NamedTuple):
+    amount: Union[int, float]
+    currency: Optional[str] = None
+
+    def __str__(self):
+        if self.currency:
+            return f"{self.amount} {self.currency}"
+        return str(self.amount)
+
+
+def _number(text: str, scaled: bool = False) -> float:
+    """
+    Read a number written with thousands separators and an optional
+    decimal part: "1,200,000", "1 200 000", "2.5", "2.000.000,50".
+    ``scaled`` numbers are followed by a multiplier, so a single
+    separator is their decimal point: "1.250" in "$1.250M".
+    """
+    text = text.replace(" ", "")
+    comma, dot = text.rfind(","), text.rfind(".")
+    if comma >= 0 and dot >= 0:
+        decimal = "," if comma > dot else "."
+    elif comma >= 0 or dot >= 0:
+        separator = "," if comma >= 0 else "."
+        groups = text.split(separator)
+        # A single separator followed by exactly three digits is a
+        # thousands separator; otherwise it is the decimal point.
+        thousands = len(groups) > 2 or (len(groups[-1]) == 3 and not scaled)
+        decimal = None if thousands else separator
+    else:
+        decimal = None
+    if decimal is None:
+        return float(text.replace(",", "").replace(".", ""))
+    thousands_sep = "." if decimal == "," else ","
+    return float(text.replace(thousands_sep, "").replace(decimal, "."))
+
+
+@lru_cache(maxsize=16384)
+def _parse(text: str) -> Optional[Money]:
+    match = _AMOUNT.fullmatch(text.strip().lower())
+    if not match:
+        return None
+    pre, post = match["pre"], match["post"]
+    if pre and post and CURRENCIES[pre] != CURRENCIES[post]:
+        return None
+    try:
+        amount = _number(match["number"], bool(match["suffix"]))
+    except ValueError:
+        return None
+    if match["suffix"]:
+        amount *= MULTIPLIERS[match["suffix"]]
+    amount = round(amount, 2)
+    if amount.is_integer():
+        amount = int(amount)
+    currency = pre or post
+    return Money(amount, CURRENCIES[currency] if currency else None)
+
+
+def parse_money(value: Any) -> Optional[Money]:
+    """
+    Parse an amount; returns None when ``value`` is not one (or is
+    longer than ``MAX_CHARS``). Numbers are returned as amounts without
+    a currency.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return Money(value)
+    if isinstance(value, str) and len(value) <= MAX_CHARS:
+        return _parse(value)
+    return None
+
+
+def coerce_money(value: Any) -> Any:
+    """
+    Normalize amount strings to text ("500000 EUR", see the module) and
+    reject booleans; leave numbers and anything else untouched for the
+    field's own validation.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid amount: {value}. Must not be a boolean.")
+    if not isinstance(value, str):
+        return value
+    money = _parse(value) if len(value) <= MAX_CHARS else None
+    return value if money is None else str(money)
+
+
+# A number, a normalized amount, or free text that is not an amount.
+MoneyAmount = Annotated[
+    Union[StrictInt, StrictFloat, str], BeforeValidator(coerce_money)
+]
+
+
+def cache_info():
+    return _parse.cache_info()
+
+
+def clear_cache():
+    _parse.cache_clear()
+
+
+def benchmark(size: Optional[int] = None) -> dict:
+    """
+    Parse ``size`` (default 1M) strings from a mixed corpus of amounts,
+    plain numbers and free text, first with unique strings (every call
+    misses the cache) and then with a realistic repeat rate.
+    """
+    import random
+    import time
+
+    size = size or 1_000_000
+    rng = random.Random(0)
+    templates = [
+        "${:.1f}M", "{:,}", "€{}k", "EUR {:.1f} million", "£{}", "{} USD",
+        "about ${}bn", "{:,} dollars", "not sure yet", "¥{:,}",
+    ]  # fmt: skip
+
+    def sample(unique: int) -> str:
+        template = rng.choice(templates)
+        return template.format(rng.randint(1, 999) + unique)
+
+    unique = [sample(i * 1000) for i in range(size)]
+    repeated = [sample(0) for _ in range(size)]
+
+    def run(values):
+        start = time.perf_counter()
+        for value in values:
+            parse_money(value)
+        return time.perf_counter() - start
+
+    clear_cache()
+    unique_s = run(unique)
+    clear_cache()
+    repeated_s = run(repeated)
+    return {
+        "config": {"strings": size, "templates": len(templates)},
+        "unique_s": unique_s,
+        "unique_per_s": size / unique_s,
+        "repeated_s": repeated_s,
+        "repeated_per_s": size / repeated_s,
+        "repeated_hit_rate": round(
+            cache_info().hits
+            / max(1, cache_info().hits + cache_info().misses),
+            3,
+        ),
+    }
@@ -1,10 +1,15 @@
-from datetime import datetime
+import datetime
 from enum import Enum
 import json
 import logging
+import sys
 from typing import Annotated, List, Optional, Any
 from pydantic import BaseModel, ConfigDict, Field, constr, field_validator
+from lucid_ai_schemas.Schemas.dates import (
+    NormalizedDate, parse_date, today_iso)
+from lucid_ai_schemas.Schemas.money import Money, parse_money
 from lucid_ai_schemas.Schemas.variable import MAX_LEN_STR_S
+from lucid_ai_schemas.introspect import module_models
 
 
 # Shared properties
@@ -14,6 +19,34 @@ class Ai_utilsBase(BaseModel):
     def to_dict(self):
         return self.model_dump()
 
+    def to_bytes(self, format: Optional[str] = None) -> bytes:
+        """Binary form of the instance, see ``lucid_ai_schemas.wire``."""
+        from lucid_ai_schemas.wire import encode
+        return encode(self, format)
+
+    @classmethod
+    def from_bytes(
+            cls, data: bytes, validate: bool = True,
+            allow_marshal: bool = False):
+        from lucid_ai_schemas.wire import decode
+        return decode(cls, data, validate, allow_marshal)
+
+
+class AmountsMixin:
+    """
+    Parsed view of the amount fields, which keep the value as given.
+    """
+
+    amount_fields = (
+        "funding_raise", "target_round_funding", "target_revenue_in_one_year")
+
+    def money(self, field: str) -> Optional[Money]:
+        """
+        ``field`` read by ``parse_money``: "$2.5M" gives
+        Money(2500000, 'USD'); None when it is not an amount.
+        """
+        return parse_money(getattr(self, field))
+
 
 class PromptUpdateSchema(Ai_utilsBase):
     prompt: str
@@ -170,7 +203,7 @@ class ExplainerSchema(Ai_utilsBase):
         description="The input of the explainer.")
 
     class Formula(BaseModel):
-        date: Optional[str] = Field(
+        date: Optional[NormalizedDate] = Field(
             default=None,
             description="The date of the formula.")
         name: Optional[str] = Field(
@@ -186,7 +219,7 @@ class ExplainerSchema(Ai_utilsBase):
         )
 
         class Transaction(BaseModel):
-            date: Optional[str] = Field(
+            date: Optional[NormalizedDate] = Field(
                 default=None,
                 description="The date of the transaction.")
             name: Optional[str] = Field(
@@ -197,8 +230,8 @@ class ExplainerSchema(Ai_utilsBase):
                 description="The amount of the transaction.")
 
 
-class AssumptionsInputSchema(Ai_utilsBase):
-    date: Optional[str] = Field(
+class AssumptionsInputSchema(Ai_utilsBase, AmountsMixin):
+    date: Optional[NormalizedDate] = Field(
         default=None,
         description="The date of the assumptions.")
     formulas: Optional[Any] = Field(
@@ -231,7 +264,7 @@ class AssumptionsInputSchema(Ai_utilsBase):
         description="""The amount of funding the business plans
         to raise in the future."""
     )
-    raise_next_round_date: Optional[str] = Field(
+    raise_next_round_date: Optional[NormalizedDate] = Field(
         default=None,
         description="""The date when the business plans to get funding,
         as a string."""
@@ -268,7 +301,7 @@ class AssumptionsGeneratorResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
-class CompanyDetailsSchema(Ai_utilsBase):
+class CompanyDetailsSchema(Ai_utilsBase, AmountsMixin):
     """
     Input schema for company details.
     """
@@ -306,7 +339,7 @@ class CompanyDetailsSchema(Ai_utilsBase):
         default=None, description="""The revenue the business expects
         to have in a year."""
     )
-    raise_next_round_date: Optional[str] = Field(
+    raise_next_round_date: Optional[NormalizedDate] = Field(
         default=None,
         description="""The date when the business plans to get funding,
         as a string."""
@@ -728,6 +761,19 @@ class Countries(str, Enum):
 sectors_list = [sector.value for sector in Sectors]
 stages_list = [stage.value for stage in Stages]
 countries_list = [country.value for country in Countries]
+# Immutable lookup tables for the validators: hashed instead of scanned,
+# and safe to share between threads.
+sectors_set = frozenset(sectors_list)
+stages_set = frozenset(stages_list)
+countries_set = frozenset(countries_list)
+
+
+def _is_one_of(value, values: frozenset) -> bool:
+    # Membership that treats unhashable input (a list, a dict) as invalid.
+    try:
+        return value in values
+    except TypeError:
+        return False
 
 
 class CompanyFieldExtractorResponse(BaseModel):
@@ -755,7 +801,7 @@ class CompanyFieldExtractorResponse(BaseModel):
     @field_validator("LOCATION", mode="before", check_fields=False)
     def validate_location(cls, value):
         # Validate LOCATION; default to USA if invalid.
-        if value not in countries_list:
+        if not _is_one_of(value, countries_set):
             logging.error(
                 f"""Invalid LOCATION: {value}.
                 Must be one of {countries_list}.""",
@@ -767,7 +813,7 @@ class CompanyFieldExtractorResponse(BaseModel):
     @field_validator("STAGE", mode="before", check_fields=False)
     def validate_stage(cls, value):
         # Validate STAGE; default to EARLY_STAGE if invalid.
-        if value not in stages_list:
+        if not _is_one_of(value, stages_set):
             logging.error(
                 f"""Invalid STAGES: {value}.
                 Must be one of {stages_list}.""",
@@ -795,7 +841,7 @@ class CompanyGoalsExtractorResponse(BaseModel):
     """
 
     WHEN: Optional[str] = Field(
-        default=str(datetime.now().strftime("%Y-%m-%d")),
+        default_factory=today_iso,
         description="When the company plans to raise funding",
     )
     FUNDING: Optional[int] = Field(
@@ -814,16 +860,18 @@ class CompanyGoalsExtractorResponse(BaseModel):
 
     @field_validator("WHEN", mode="before")
     def validate_date(cls, value: str) -> str:
+        if value is None:
+            return value
         try:
-            # Convert string to date
-            input_date = datetime.strptime(value, "%Y-%m-%d").date()
+            # Convert string to date (YYYY-MM-DD, March 2026, Q3 2025...)
+            input_date = parse_date(value)
         except ValueError:
             raise ValueError(
                 f"Invalid date format: {value}. Expected format: YYYY-MM-DD"
             )
         # If the date is before today, return today's date as a string
-        today_str = datetime.date.today().strftime("%Y-%m-%d")
-        return today_str if input_date < datetime.date.today() else value
+        today = datetime.date.today()
+        return max(input_date, today).isoformat()
 
     model_config = ConfigDict(extra="allow")
 
@@ -884,7 +932,7 @@ class PositionSchema(Ai_utilsBase):
         department: Optional[Departments] = Field(
             default=Departments.G_A,
             description="The department of the employee.")
-        start_date: Optional[str] = Field(
+        start_date: Optional[NormalizedDate] = Field(
             default=None,
             description="The start date of the employee.")
         geo_location: Optional[Countries] = Field(
@@ -896,7 +944,7 @@ class PositionSchema(Ai_utilsBase):
 
         @field_validator("geo_location", mode="before", check_fields=False)
         def validate_location(cls, value):
-            if value not in countries_list:
+            if not _is_one_of(value, countries_set):
                 logging.error(
                     f"""Invalid location: {value}.
                     Must be one of {countries_list}.""",
@@ -1001,7 +1049,7 @@ class PromptTypeResponse(BaseModel):
     @field_validator("location", mode="before", check_fields=False)
     def validate_location(cls, value):
         # Validate location; default to USA if invalid.
-        if value not in countries_list:
+        if not _is_one_of(value, countries_set):
             logging.error(
                 f"""Invalid location: {value}.
                 Must be one of {countries_list}.""",
@@ -1013,7 +1061,7 @@ class PromptTypeResponse(BaseModel):
     @field_validator("sector", mode="before", check_fields=False)
     def validate_sector(cls, value):
         # Validate sector; default to null if invalid.
-        if value not in sectors_list:
+        if not _is_one_of(value, sectors_set):
             logging.error(
                 f"""Invalid sector: {value}.
                 Must be one of {sectors_list}.""",
@@ -1065,7 +1113,7 @@ class SalaryGeneratorSchema(BaseModel):
 
         @field_validator("geo_location", mode="before", check_fields=False)
         def validate_location(cls, value):
-            if value not in countries_list:
+            if not _is_one_of(value, countries_set):
                 logging.error(
                     f"""Invalid location: {value}.
                     Must be one of {countries_list}.""",
@@ -1102,3 +1150,11 @@ class SalaryGeneratorResponse(BaseModel):
 
 
 SalaryGeneratorResponse.update_forward_refs()
+
+
+def schema_models() -> List[type]:
+    """
+    Every model of this module, nested models before the models that
+    contain them.
+    """
+    return module_models(sys.modules[__name__])
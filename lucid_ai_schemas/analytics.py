@@ -0,0 +1,315 @@
+"""
+Queryable store for LLM call logs.
+
+Records (``LogAIResponseObject`` instances, or the dicts written by
+``lucid_ai_schemas.logsink``) are flattened into an indexed SQLite table,
+so questions like "p95 ``response_time`` per prompt type over the last
+day" are answered from an index range scan instead of re-reading JSON:
+
+    store = CallLogStore("calls.db")
+    store.ingest_logs("/var/log/lucid")
+    store.latency_percentiles(since=time.time() - 86400)
+    # {"summarizer": {"count": 1200, "p50": 0.8, "p95": 2.1, "p99": 3.4}}
+
+Only the columns needed by the query helpers are stored; pass
+``keep_raw=True`` to also keep the full JSON of every record.
+"""
+
+import json
+import math
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Union
+
+from lucid_ai_schemas.Schemas.schemas import LogAIResponseObject
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_calls (
+    id INTEGER PRIMARY KEY,
+    logged_at REAL NOT NULL,
+    prompt_type TEXT NOT NULL,
+    response_time REAL,
+    failed INTEGER NOT NULL,
+    payload_bytes INTEGER NOT NULL,
+    response_bytes INTEGER NOT NULL,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS ai_calls_type_time
+    ON ai_calls (prompt_type, logged_at, response_time);
+CREATE INDEX IF NOT EXISTS ai_calls_time
+    ON ai_calls (logged_at);
+"""
+
+UNKNOWN_TYPE = "unknown"
+
+# One shared encoder; json.dumps builds a new one per call when given
+# non-default arguments.
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def default_prompt_type(record: dict) -> str:
+    """
+    Read the prompt type from ``prompt_object``, trying the
+    ``prompt_type`` and ``type`` keys.
+    """
+    prompt_object = record.get("prompt_object") or {}
+    return str(
+        prompt_object.get("prompt_type")
+        or prompt_object.get("type")
+        or UNKNOWN_TYPE
+    )
+
+
+def default_failed(record: dict) -> bool:
+    """A call failed if it has no response or the response has an error."""
+    response = record.get("response")
+    return not response or "error" in response
+
+
+def _size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    return len(_encode(value))
+
+
+class CallLogStore:
+    def __init__(
+        self,
+        path: str = ":memory:",
+        prompt_type: Callable[[dict], str] = default_prompt_type,
+        failed: Callable[[dict], bool] = default_failed,
+        keep_raw: bool = False,
+    ):
+        self.path = path
+        self.prompt_type = prompt_type
+        self.failed = failed
+        self.keep_raw = keep_raw
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _row(self, record: Union[LogAIResponseObject, dict]) -> tuple:
+        if isinstance(record, LogAIResponseObject):
+            record = record.model_dump()
+        logged_at = record.get("logged_at")
+        return (
+            time.time() if logged_at is None else logged_at,
+            self.prompt_type(record),
+            record.get("response_time"),
+            int(bool(self.failed(record))),
+            _size(record.get("payload")),
+            _size(record.get("response")),
+            _encode(record) if self.keep_raw else None,
+        )
+
+    def ingest(
+        self,
+        records: Iterable[Union[LogAIResponseObject, dict]],
+        batch_size: int = 10000,
+    ) -> int:
+        """
+        Insert records in batches of ``batch_size`` per transaction.
+        Returns the number of records inserted.
+        """
+        insert = (
+            "INSERT INTO ai_calls (logged_at, prompt_type, response_time, "
+            "failed, payload_bytes, response_bytes, raw) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)"
+        )
+        count = 0
+        batch = []
+        for record in records:
+            batch.append(self._row(record))
+            if len(batch) >= batch_size:
+                with self.connection:
+                    self.connection.executemany(insert, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            with self.connection:
+                self.connection.executemany(insert, batch)
+            count += len(batch)
+        return count
+
+    def ingest_logs(self, directory: str, prefix: str = "ai_responses"):
+        """Ingest every record written by a ``LogSink``."""
+        from lucid_ai_schemas.logsink import iter_records
+
+        return self.ingest(iter_records(directory, prefix))
+
+    @staticmethod
+    def _where(
+        since: Optional[float],
+        until: Optional[float],
+        prompt_type: Optional[str],
+    ):
+        clauses, params = [], []
+        if prompt_type is not None:
+            clauses.append("prompt_type = ?")
+            params.append(prompt_type)
+        if since is not None:
+            clauses.append("logged_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("logged_at < ?")
+            params.append(until)
+        where = " AND ".join(clauses) or "1"
+        return where, params
+
+    def latency_percentiles(
+        self,
+        percentiles: Sequence[float] = (0.5, 0.95, 0.99),
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        prompt_type: Optional[str] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Nearest-rank ``response_time`` percentiles per prompt type.
+        Percentiles are given as fractions, e.g. ``0.95`` -> ``"p95"``.
+        """
+        where, params = self._where(since, until, prompt_type)
+        # rank = ceil(p * n), computed in SQL so only the rows holding a
+        # percentile leave SQLite.
+        ranks = " OR ".join(
+            "rn = MAX(1, CAST(? * n AS INTEGER)"
+            " + (? * n > CAST(? * n AS INTEGER)))"
+            for _ in percentiles
+        )
+        query = f"""
+            WITH ranked AS (
+                SELECT prompt_type, response_time,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY prompt_type ORDER BY response_time
+                    ) AS rn,
+                    COUNT(*) OVER (PARTITION BY prompt_type) AS n
+                FROM ai_calls
+                WHERE response_time IS NOT NULL AND {where}
+            )
+            SELECT prompt_type, n, rn, response_time FROM ranked
+            WHERE {ranks}
+        """
+        rank_params = [p for p in percentiles for _ in range(3)]
+        result: Dict[str, Dict[str, float]] = {}
+        for type_, n, rn, value in self.connection.execute(
+            query, params + rank_params
+        ):
+            stats = result.setdefault(type_, {"count": n})
+            for p in percentiles:
+                if max(1, math.ceil(p * n)) == rn:
+                    stats[_label(p)] = value
+        return result
+
+    def failure_rates(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        prompt_type: Optional[str] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """Calls, failures and failure rate per prompt type."""
+        where, params = self._where(since, until, prompt_type)
+        rows = self.connection.execute(
+            f"""
+            SELECT prompt_type, COUNT(*), SUM(failed) FROM ai_calls
+            WHERE {where} GROUP BY prompt_type
+            """,
+            params,
+        )
+        return {
+            type_: {
+                "calls": calls,
+                "failures": failures,
+                "rate": failures / calls,
+            }
+            for type_, calls, failures in rows
+        }
+
+    def payload_sizes(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        prompt_type: Optional[str] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """Average and maximum payload/response JSON size per prompt type."""
+        where, params = self._where(since, until, prompt_type)
+        rows = self.connection.execute(
+            f"""
+            SELECT prompt_type,
+                AVG(payload_bytes), MAX(payload_bytes),
+                AVG(response_bytes), MAX(response_bytes)
+            FROM ai_calls WHERE {where} GROUP BY prompt_type
+            """,
+            params,
+        )
+        return {
+            row[0]: {
+                "avg_payload_bytes": row[1],
+                "max_payload_bytes": row[2],
+                "avg_response_bytes": row[3],
+                "max_response_bytes": row[4],
+            }
+            for row in rows
+        }
+
+
+def _label(percentile: float) -> str:
+    return "p" + f"{percentile * 100:g}".replace(".", "_")
+
+
+def benchmark(size: Optional[int] = None, directory: str = None) -> dict:
+    """
+    Ingest ``size`` synthetic records (default 10M) spread over a week
+    and time the query helpers over the last day.
+    """
+    import os
+    import random
+    import tempfile
+
+    size = size or 10_000_000
+    types = ["summarizer", "hiring", "explainer", "plots", "assumptions"]
+    now = time.time()
+    rng = random.Random(0)
+
+    def records():
+        for i in range(size):
+            yield {
+                "logged_at": now - rng.random() * 7 * 86400,
+                "prompt_object": {"type": types[i % len(types)]},
+                "response": None if i % 50 == 0 else {"ok": True},
+                "response_time": rng.lognormvariate(0, 0.5),
+                "payload": {"freetext": "x" * (i % 200)},
+            }
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        store = CallLogStore(os.path.join(tmp, "calls.db"))
+        start = time.perf_counter()
+        store.ingest(records())
+        ingest_s = time.perf_counter() - start
+
+        since = now - 86400
+        queries = {}
+        for name in ("latency_percentiles", "failure_rates", "payload_sizes"):
+            start = time.perf_counter()
+            getattr(store, name)(since=since)
+            queries[f"{name}_s"] = time.perf_counter() - start
+        db_bytes = os.path.getsize(store.path)
+        store.close()
+
+    return {
+        "config": {"records": size},
+        "ingest_s": ingest_s,
+        "ingest_records_per_s": size / ingest_s,
+        "db_bytes": db_bytes,
+        "queries_last_day": queries,
+    }
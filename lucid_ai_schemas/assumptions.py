@@ -0,0 +1,444 @@
+"""
+Compiled evaluation of ``AssumptionsGeneratorResponse`` calculations.
+
+Calculation values are free strings: numbers and amounts ("1200",
+"$2.5M", "3bn"), percentages ("2%"), numbers with a unit ("12 months")
+and simple expressions over other keys ("price * 12", "mrr * (1 - churn)",
+"max(cac / 3, 100)"). ``compile_value`` turns a value into Python code
+once, after checking that its syntax tree only holds numbers, names,
+arithmetic and ``min``/``max``/``abs``/``round`` calls, and caches it by
+text. Values longer than ``MAX_VALUE_LENGTH`` characters are rejected
+before any parsing. Numbers are evaluated as floats, so a huge result
+overflows into a ValueError instead of growing an ever larger integer.
+``AssumptionSet`` compiles a whole response, resolves the references
+between keys and evaluates them in dependency order:
+
+    assumptions = AssumptionSet.from_response(response)
+    assumptions.evaluate()                   # {"Price": 49.0, ...}
+    assumptions.evaluate({"churn": [0.01, 0.02, 0.05]})
+    # every key depending on churn is an array of 3 scenarios
+
+Keys are referenced by their identifier form (``identifier``): lower
+case, runs of other characters replaced by "_", so "Monthly Price" is
+``monthly_price``. Values given to ``evaluate`` override keys of the
+same identifier, or provide ``inputs``, names used by the expressions
+that are not keys. Sequences evaluate every dependent key over all the
+scenarios at once with NumPy, which is then needed
+(``pip install lucid_ai_schemas[numpy]``).
+"""
+
+import ast
+import re
+from functools import lru_cache, reduce
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+from typing import Tuple, Union
+
+from lucid_ai_schemas.Schemas.money import parse_money
+from lucid_ai_schemas.Schemas.schemas import AssumptionsGeneratorResponse
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+Calculation = AssumptionsGeneratorResponse.Calculation
+
+FUNCTIONS = ("min", "max", "abs", "round")
+# function -> (fewest, most arguments)
+_ARITY = {"min": (2, None), "max": (2, None), "abs": (1, 1), "round": (1, 2)}
+_SCALAR_FUNCTIONS = {"min": min, "max": max, "abs": abs, "round": round}
+_OPERATORS = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+_MAX_EXPONENT = 100
+# Longer values are rejected before parsing, and never cached.
+MAX_VALUE_LENGTH = 500
+
+_PERCENT = re.compile(r"^\s*([-+]?\d[\d,]*(?:\.\d+)?)\s*%\s*$")
+_WITH_UNIT = re.compile(r"^\s*([-+]?\d[\d,]*(?:\.\d+)?)\s+[^\W\d_][\w /]*$")
+# Inside expressions: "$2.5M", "€500k", "12.5%" and "1,200".
+_AMOUNT = re.compile(
+    r"[$€£]\s*\d[\d,]*(?:\.\d+)?(?:bn|[kmb])?"
+    r"|(?<![\w.])\d+(?:\.\d+)?(?:bn|[kmb])\b",
+    re.I,
+)
+_INNER_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%(?!\s*[\w.(])")
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+
+
+def identifier(key: str) -> str:
+    """The name expressions use for ``key``, e.g. ``monthly_price``."""
+    name = re.sub(r"\W+", "_", key.strip().lower()).strip("_")
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+class Compiled(NamedTuple):
+    text: str
+    constant: Optional[float]
+    code: Any
+    names: Tuple[str, ...]
+
+
+def _number(node: ast.AST, types=(int, float)) -> bool:
+    return (
+        isinstance(node, ast.Constant)
+        and isinstance(node.value, types)
+        and not isinstance(node.value, bool)
+    )
+
+
+def _check(node: ast.AST, names: set):
+    """Reject anything but arithmetic over numbers and names."""
+    if isinstance(node, ast.Expression):
+        return _check(node.body, names)
+    if isinstance(node, ast.Constant):
+        if not _number(node):
+            raise ValueError(f"constant {node.value!r}")
+        return
+    if isinstance(node, ast.Name):
+        names.add(node.id)
+        return
+    if isinstance(node, ast.BinOp) and isinstance(node.op, _OPERATORS):
+        if isinstance(node.op, ast.Pow) and not (
+            _number(node.right) and abs(node.right.value) <= _MAX_EXPONENT
+        ):
+            raise ValueError("exponent")
+        _check(node.left, names)
+        return _check(node.right, names)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, _OPERATORS):
+        return _check(node.operand, names)
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        function, count = node.func.id, len(node.args)
+        fewest, most = _ARITY[function]
+        if count < fewest or (most is not None and count > most):
+            raise ValueError(f"{function}() with {count} arguments")
+        if (
+            function == "round"
+            and count == 2
+            and not _number(node.args[1], int)
+        ):
+            raise ValueError("round() digits must be an integer")
+        for arg in node.args:
+            _check(arg, names)
+        return
+    raise ValueError(type(node).__name__)
+
+
+class _Floats(ast.NodeTransformer):
+    """
+    Integer constants to floats: arithmetic then costs the same whatever
+    the magnitude ("(9**100)**100" overflows instead of computing a
+    huge integer). The digits of ``round`` stay an integer.
+    """
+
+    def visit_Constant(self, node):
+        if type(node.value) is int:
+            node.value = float(node.value)
+        return node
+
+    def visit_Call(self, node):
+        keep = 1 if node.func.id == "round" else None
+        node.args[:keep] = [self.visit(arg) for arg in node.args[:keep]]
+        return node
+
+
+class _Names(ast.NodeTransformer):
+    """Name references to identifiers: ``Monthly_Price`` -> monthly_price."""
+
+    def visit_Name(self, node):
+        if node.id not in FUNCTIONS:
+            node.id = identifier(node.id)
+        return node
+
+
+def _amount(match: re.Match) -> str:
+    money = parse_money(match.group(0))
+    if money is None:
+        raise ValueError(f"amount {match.group(0)!r}")
+    return repr(money.amount)
+
+
+def _too_long(text: str):
+    if len(text) > MAX_VALUE_LENGTH:
+        raise ValueError(
+            f"Invalid calculation value: {text[:40]!r}... is longer than "
+            f"{MAX_VALUE_LENGTH} characters."
+        )
+
+
+def _compile(text: str) -> Compiled:
+    _too_long(text)
+    money = parse_money(text)
+    if money is not None:
+        return Compiled(text, float(money.amount), None, ())
+    for pattern, scale in ((_PERCENT, 0.01), (_WITH_UNIT, 1)):
+        match = pattern.match(text)
+        if match:
+            number = float(match.group(1).replace(",", "")) * scale
+            return Compiled(text, number, None, ())
+    source = _THOUSANDS.sub("", text)
+    source = _AMOUNT.sub(_amount, source)
+    source = _INNER_PERCENT.sub(r"(\1 / 100)", source)
+    try:
+        tree = _Names().visit(ast.parse(source.strip(), mode="eval"))
+        names: set = set()
+        _check(tree, names)
+        tree = _Floats().visit(tree)
+    except (SyntaxError, ValueError, OverflowError) as error:
+        raise ValueError(
+            f"Invalid calculation value: {text!r}. Must be a number, a "
+            f"percentage or arithmetic over other keys ({error})."
+        ) from None
+    code = compile(tree, "<calculation>", "eval")
+    names -= set(FUNCTIONS)
+    return Compiled(text, None, code, tuple(sorted(names)))
+
+
+_compile_cached = lru_cache(maxsize=16384)(_compile)
+
+
+def compile_value(text: str) -> Compiled:
+    """Compile a calculation value; cached by text."""
+    _too_long(text)
+    return _compile_cached(text)
+
+
+class AssumptionSet:
+    def __init__(
+        self,
+        calculations: Iterable[Union[Calculation, Mapping[str, Any]]],
+    ):
+        """
+        Compile ``calculations`` (``Calculation`` instances or key/value
+        dicts). Raises ValueError for values that do not compile, for
+        duplicate keys and for cycles between keys.
+        """
+        self.keys: Dict[str, str] = {}
+        self.compiled: Dict[str, Compiled] = {}
+        for calculation in calculations:
+            if isinstance(calculation, Mapping):
+                key, value = calculation.get("key"), calculation.get("value")
+            else:
+                key, value = calculation.key, calculation.value
+            if key is None or value is None:
+                continue
+            name = identifier(key)
+            if name in self.compiled:
+                raise ValueError(f"Invalid assumptions: duplicate key {key}.")
+            try:
+                self.compiled[name] = compile_value(value)
+            except ValueError as error:
+                raise ValueError(f"{key}: {error}") from None
+            self.keys[name] = key
+        self.inputs = sorted(
+            {
+                dependency
+                for compiled in self.compiled.values()
+                for dependency in compiled.names
+                if dependency not in self.compiled
+            }
+        )
+        self.order = self._order()
+
+    @classmethod
+    def from_response(
+        cls, response: AssumptionsGeneratorResponse
+    ) -> "AssumptionSet":
+        return cls(response.calculations or [])
+
+    def _order(self) -> List[str]:
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                cycle = " -> ".join(path + [name])
+                raise ValueError(f"Invalid assumptions: cycle {cycle}.")
+            state[name] = "visiting"
+            for dependency in self.compiled[name].names:
+                if dependency in self.compiled:
+                    visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.compiled:
+            visit(name, [])
+        return order
+
+    def evaluate(
+        self, scenarios: Optional[Mapping[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Every key by its original name. ``scenarios`` maps keys and
+        inputs (by name or identifier) to numbers, or to sequences of
+        one value per scenario.
+        """
+        values: Dict[str, Any] = {}
+        vectorized = False
+        for name, value in (scenarios or {}).items():
+            if isinstance(value, (int, float)):
+                value = float(value)
+            else:
+                if np is None:  # pragma: no cover
+                    raise ImportError(
+                        "Scenario vectors need NumPy: "
+                        "pip install lucid_ai_schemas[numpy]"
+                    )
+                value = np.asarray(value, dtype=float)
+                vectorized = True
+            values[identifier(name)] = value
+        missing = [name for name in self.inputs if name not in values]
+        if missing:
+            raise ValueError(f"Invalid scenarios: missing inputs {missing}.")
+        namespace = {
+            "__builtins__": {},
+            **(_VECTOR_FUNCTIONS if vectorized else _SCALAR_FUNCTIONS),
+        }
+        for name in self.order:
+            if name in values:
+                continue
+            compiled = self.compiled[name]
+            if compiled.code is None:
+                values[name] = compiled.constant
+                continue
+            try:
+                if vectorized:
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        values[name] = eval(compiled.code, namespace, values)
+                else:
+                    values[name] = eval(compiled.code, namespace, values)
+            except ZeroDivisionError:
+                raise ValueError(
+                    f"Invalid calculation {self.keys[name]}: "
+                    f"division by zero in {compiled.text!r}."
+                ) from None
+            except OverflowError:
+                raise ValueError(
+                    f"Invalid calculation {self.keys[name]}: "
+                    f"overflow in {compiled.text!r}."
+                ) from None
+            except (ArithmeticError, TypeError) as error:
+                raise ValueError(
+                    f"Invalid calculation {self.keys[name]}: {error} in "
+                    f"{compiled.text!r}."
+                ) from None
+            if isinstance(values[name], complex):
+                raise ValueError(
+                    f"Invalid calculation {self.keys[name]}: complex "
+                    f"result of {compiled.text!r}."
+                )
+        return {self.keys[name]: values[name] for name in self.order}
+
+
+if np is not None:
+    _VECTOR_FUNCTIONS = {
+        "min": lambda *args: reduce(np.minimum, args),
+        "max": lambda *args: reduce(np.maximum, args),
+        "abs": np.abs,
+        "round": np.round,
+    }
+else:  # pragma: no cover
+    _VECTOR_FUNCTIONS = {}
+
+
+SAMPLE = [
+    {"key": "Price", "value": "$49"},
+    {"key": "Customers", "value": "1,200"},
+    {"key": "Churn", "value": "2.5%"},
+    {"key": "Growth", "value": "8%"},
+    {"key": "CAC", "value": "$350"},
+    {"key": "Gross margin", "value": "78%"},
+    {"key": "MRR", "value": "price * customers"},
+    {"key": "Net growth", "value": "growth - churn"},
+    {"key": "MRR next month", "value": "mrr * (1 + net_growth)"},
+    {"key": "ARR", "value": "mrr_next_month * 12"},
+    {"key": "Payback", "value": "cac / (price * gross_margin)"},
+    {"key": "Lifetime", "value": "min(1 / churn, 60)"},
+    {"key": "LTV", "value": "price * gross_margin * lifetime"},
+    {"key": "LTV to CAC", "value": "round(ltv / cac, 2)"},
+    {"key": "Runway", "value": "18 months"},
+]
+
+
+def benchmark(size: Optional[int] = None) -> dict:
+    """
+    Evaluate ``SAMPLE`` over ``size`` (default 10000) churn/growth
+    scenarios: parsing every value again for each scenario, with the
+    compiled set one scenario at a time, and with NumPy vectors.
+    """
+    import random
+    import time
+
+    size = size or 10000
+    rng = random.Random(0)
+    scenarios = [
+        {"churn": rng.uniform(0.01, 0.08), "growth": rng.uniform(0, 0.2)}
+        for _ in range(size)
+    ]
+
+    def parse_every_time(scenario):
+        # Without caching: every value is parsed, checked and compiled.
+        values = {k: v for k, v in scenario.items()}
+        for item in SAMPLE:
+            name = identifier(item["key"])
+            if name in values:
+                continue
+            compiled = _compile(item["value"])
+            values[name] = (
+                compiled.constant
+                if compiled.code is None
+                else eval(compiled.code, dict(_SCALAR_FUNCTIONS), values)
+            )
+        return values
+
+    start = time.perf_counter()
+    parsed = [parse_every_time(s) for s in scenarios]
+    parse_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assumptions = AssumptionSet(SAMPLE)
+    compile_s = time.perf_counter() - start
+    start = time.perf_counter()
+    scalar = [assumptions.evaluate(s) for s in scenarios]
+    scalar_s = time.perf_counter() - start
+
+    results = {
+        "config": {"scenarios": size, "calculations": len(SAMPLE)},
+        "parse_every_time_s": parse_s,
+        "compile_s": compile_s,
+        "compiled_scalar_s": scalar_s,
+        "speedup_scalar": round(parse_s / scalar_s, 1),
+        "ltv_to_cac_matches": all(
+            p["ltv_to_cac"] == s["LTV to CAC"] for p, s in zip(parsed, scalar)
+        ),
+    }
+    if np is not None:
+        vectors = {
+            "churn": [s["churn"] for s in scenarios],
+            "growth": [s["growth"] for s in scenarios],
+        }
+        start = time.perf_counter()
+        vectorized = assumptions.evaluate(vectors)
+        vector_s = time.perf_counter() - start
+        results.update(
+            compiled_vector_s=vector_s,
+            speedup_vector=round(parse_s / vector_s, 1),
+            vector_matches=bool(
+                np.allclose(vectorized["ARR"], [s["ARR"] for s in scalar])
+            ),
+        )
+    return results
@@ -0,0 +1,507 @@
+"""
+Built-in performance benchmarks for lucid_ai_schemas.
+
+Run them with:
+
+    $ lucid_ai_schemas bench --output report.json
+
+The default ``schemas`` suite measures, for every schema in
+``lucid_ai_schemas.Schemas.schemas``:
+
+* import time of the schemas module (in a fresh interpreter),
+* cold first-validate / first-dump / first JSON Schema export
+  (in a fresh interpreter),
+* steady-state ``model_validate``, ``model_dump`` and
+  ``model_dump_json`` cost per call,
+* JSON Schema export cost,
+* memory per instance.
+
+Every schema is measured with a "micro" payload (one item in every list)
+and a "macro" payload (``size`` items in every list).
+
+The report is plain JSON with stable keys so two reports, e.g. from two
+releases, can be compared with ``lucid_ai_schemas bench --compare``.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional
+
+import pydantic
+import pydantic_core
+from pydantic import BaseModel
+
+from lucid_ai_schemas.Schemas import schemas
+
+REPORT_VERSION = 1
+
+# Suites other than ``schemas`` live next to the feature they measure and
+# are imported lazily, so ``bench`` does not pull in every optional module.
+SUITES: Dict[str, str] = {
+    "schemas": "lucid_ai_schemas.bench:run_schemas_suite",
+    "logsink": "lucid_ai_schemas.logsink:benchmark",
+    "analytics": "lucid_ai_schemas.analytics:benchmark",
+    "metrics": "lucid_ai_schemas.metrics:benchmark",
+    "dates": "lucid_ai_schemas.Schemas.dates:benchmark",
+    "money": "lucid_ai_schemas.Schemas.money:benchmark",
+    "trusted": "lucid_ai_schemas.trusted:benchmark",
+    "incremental": "lucid_ai_schemas.incremental:benchmark",
+    "tokens": "lucid_ai_schemas.tokens:benchmark",
+    "preload": "lucid_ai_schemas.preload:benchmark",
+    "replay": "lucid_ai_schemas.replay:benchmark",
+    "versions": "lucid_ai_schemas.versions:benchmark",
+    "singleflight": "lucid_ai_schemas.singleflight:benchmark",
+    "dag": "lucid_ai_schemas.dag:benchmark",
+    "synthetic": "lucid_ai_schemas.synthetic:benchmark",
+    "memory": "lucid_ai_schemas.memory:benchmark",
+    "compact": "lucid_ai_schemas.compact:benchmark",
+    "products": "lucid_ai_schemas.products:benchmark",
+    "assumptions": "lucid_ai_schemas.assumptions:benchmark",
+    "search": "lucid_ai_schemas.search:benchmark",
+    "templates": "lucid_ai_schemas.templates:benchmark",
+    "plots": "lucid_ai_schemas.plots:benchmark",
+    "explainer": "lucid_ai_schemas.explainer:benchmark",
+    "wire": "lucid_ai_schemas.wire:benchmark",
+    "caches": "lucid_ai_schemas.caches:benchmark",
+}
+
+
+def _position(i: int) -> dict:
+    return {
+        "id": i,
+        "role": "Software Engineer",
+        "bonus": 5000,
+        "full_name": f"Employee {i}",
+        "department": "rnd",
+        "start_date": "2025-03-01",
+        "geo_location": "Germany",
+        "yearly_salary": 90000,
+    }
+
+
+def _company_details(n: int) -> dict:
+    return {
+        "sectors": ["Fintech"] * n,
+        "freetext": "We build accounting software for small businesses.",
+        "location": "United Kingdom (UK)",
+        "products": [],
+        "company_stage": "Seed Stage",
+        "funding_raise": "$1.5M",
+        "target_employees_in_one_year": 12,
+        "target_revenue_in_one_year": 2000000,
+        "raise_next_round_date": "2026-06-01",
+        "target_round_funding": 5000000,
+    }
+
+
+def _transaction(i: int) -> dict:
+    return {"date": "2025-01-15", "name": f"Invoice {i}", "amount": 120.5}
+
+
+# Sample payload factories, one per top level schema.
+# Each factory takes the number of items to put in every list field.
+SAMPLES: Dict[str, Callable[[int], dict]] = {
+    "Ai_utilsBase": lambda n: {},
+    "PromptUpdateSchema": lambda n: {
+        "prompt": "Summarize the plan.",
+        "engine": "gpt-4o",
+    },
+    "OrchestratorSchema": lambda n: {
+        "branch_id": 42,
+        "freetext": "Show me revenue for the last quarter.",
+    },
+    "LogAIResponseObject": lambda n: {
+        "prompt_object": {"prompt": "Summarize", "type": "summarizer"},
+        "response": {"items": [{"id": i} for i in range(n)]},
+        "response_time": 1.25,
+        "payload": {"freetext": "hello"},
+        "parsed_input": "hello",
+    },
+    "PlotORFormulaSchema": lambda n: {
+        "formulas": [{"id": i, "name": f"Formula {i}"} for i in range(n)],
+        "freetext": "Plot revenue against costs.",
+    },
+    "PlotCollectionResponse": lambda n: {
+        "plots": [
+            {
+                "name": f"Plot {i}",
+                "type": "donut" if i % 2 else "Line",
+                "time_period": "2025-01-01:2025-12-31",
+                "formulas": [i, i + 1],
+            }
+            for i in range(n)
+        ]
+    },
+    "Ai_utilsUpdate": lambda n: {"id": 7},
+    "GetPromptSummarizerSchema": lambda n: {
+        "response": {"items": list(range(n))},
+        "user_input": "What changed?",
+        "prompt_type": "hiring",
+        "prompt_operation": "generate",
+    },
+    "StringResponse": lambda n: {"response": "ok"},
+    "ExplainerSchema": lambda n: {
+        "input": [
+            {
+                "date": "2025-01-31",
+                "name": f"Formula {i}",
+                "total_value": 1000.0,
+                "transactions": [_transaction(j) for j in range(n)],
+            }
+            for i in range(max(1, n // 100))
+        ]
+    },
+    "AssumptionsInputSchema": lambda n: {
+        "date": "2025-01-01",
+        "formulas": [{"id": i, "name": f"Formula {i}"} for i in range(n)],
+        "sectors": ["Fintech", "SaaS (Software as a Service)"],
+        "freetext": "We sell subscriptions.",
+        "location": "France",
+        "products": [{"name": "Pro plan"}],
+        "company_stage": "Seed Stage",
+        "funding_raise": "$1.5M",
+        "target_round_funding": "$5M",
+        "raise_next_round_date": "2026-06-01",
+        "target_revenue_in_one_year": "$2M",
+        "target_employees_in_one_year": 12,
+    },
+    "AssumptionsGeneratorResponse": lambda n: {
+        "calculations": [
+            {"key": f"growth_{i}", "value": "5%"} for i in range(n)
+        ]
+    },
+    "CompanyDetailsSchema": _company_details,
+    "ProductGeneratorOutput": lambda n: {
+        "products": [
+            {
+                "name": f"Product {i}",
+                "price": 49.0,
+                "amount_sold_last_m": 120,
+                "amount_sold_y_ago": 80,
+                "subscription_type": "Monthly Subscription",
+                "CAC": 35.0,
+            }
+            for i in range(n)
+        ]
+    },
+    "TemplateAssignerSchema": lambda n: dict(
+        _company_details(n), template_list="SaaS, Marketplace, Retail"
+    ),
+    "TemplateAssignerResponseSchema": lambda n: {"templates": "SaaS"},
+    "CompanyDetailsExpanderSchema": lambda n: {"freetext": ""},
+    "ExtractGoalsORFieldsInputSchema": lambda n: {
+        "freetext": "We want to raise $2M next year.",
+        "additional_info": "Seed stage fintech.",
+    },
+    "CompanyFieldExtractorResponse": lambda n: {
+        "LOCATION": "Spain",
+        "SECTORS": ["Fintech", "Payments"] * n,
+        "FUNDING": 1500000,
+        "STAGE": "Seed Stage",
+        "ai_response_time": 0.8,
+    },
+    "CompanyGoalsExtractorResponse": lambda n: {
+        "FUNDING": 2000000,
+        "REVENUE": 1000000,
+        "EMPLOYEES": 25,
+    },
+    "CompanySummaryRefinerSchema": lambda n: {
+        "seo_description": "Accounting software.",
+        "short_description": "We build accounting software.",
+        "scraped_website_data": "Pricing. About us. " * n,
+        "company_object": "{}",
+    },
+    "PositionSchema": lambda n: {
+        "positions": [_position(i) for i in range(n)]
+    },
+    "HiringGenerateSchema": lambda n: {
+        "sectors": "Fintech",
+        "balance": 250000,
+        "location": "Germany",
+        "stage": "Seed Stage",
+        "freetext": "Hire two engineers.",
+    },
+    "HiringDecreaseResponseSchema": lambda n: {
+        "positions": [{"id": i} for i in range(n)]
+    },
+    "HiringUpdateSchema": lambda n: {
+        "sectors": "Fintech",
+        "balance": 250000,
+        "location": "Germany",
+        "stage": "Seed Stage",
+        "freetext": "Give everyone a raise.",
+        "positions": [_position(i) for i in range(n)],
+    },
+    "PromptTypeSchema": lambda n: {"input": "Hire two engineers."},
+    "PromptTypeResponse": lambda n: {
+        "balance": 250000,
+        "location": "Germany",
+    },
+    "SalaryGeneratorSchema": lambda n: {
+        "positions": [
+            {
+                "id": i,
+                "role": "Engineer",
+                "department": "R&D",
+                "geo_location": "Germany",
+            }
+            for i in range(n)
+        ]
+    },
+    "SalaryGeneratorResponse": lambda n: {
+        "positions": [{"id": i, "yearly_salary": 90000} for i in range(n)]
+    },
+}
+
+
+def schema_classes() -> Dict[str, type]:
+    """
+    Return every top level pydantic model defined in the schemas module,
+    keyed by class name, in definition order.
+    """
+    return {
+        name: value
+        for name, value in vars(schemas).items()
+        if isinstance(value, type)
+        and issubclass(value, BaseModel)
+        and value.__module__ == schemas.__name__
+    }
+
+
+def _per_call(func: Callable[[], Any], number: int, repeat: int) -> dict:
+    """
+    Time ``func`` ``repeat`` times in batches of ``number`` calls and
+    return the per call cost in nanoseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter_ns() - start) / number)
+    return {
+        "min_ns": round(min(samples), 1),
+        "median_ns": round(statistics.median(samples), 1),
+    }
+
+
+def _memory_per_instance(model: type, payload: dict, count: int) -> int:
+    """Return the traced bytes retained by one validated instance."""
+    gc.collect()
+    # Leave the tracing of a caller that already traces alone.
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [model.model_validate(payload) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    del instances
+    return round((after - before) / count)
+
+
+def measure_schema(
+    model: type, payload: dict, number: int, repeat: int
+) -> dict:
+    """Return steady-state timings and memory for one schema/payload."""
+    instance = model.model_validate(payload)
+    return {
+        "validate": _per_call(
+            lambda: model.model_validate(payload), number, repeat
+        ),
+        "dump": _per_call(instance.model_dump, number, repeat),
+        "dump_json": _per_call(instance.model_dump_json, number, repeat),
+        "json_schema": _per_call(
+            model.model_json_schema, max(1, number // 10), repeat
+        ),
+        "memory_bytes": _memory_per_instance(
+            model, payload, max(1, min(number, 100))
+        ),
+    }
+
+
+# Times the schemas import before anything else from the package is loaded.
+_COLD_PROBE = """\
+import time
+start = time.perf_counter()
+import lucid_ai_schemas.Schemas.schemas
+import_s = time.perf_counter() - start
+from lucid_ai_schemas import bench
+bench._cold_probe({size}, import_s)
+"""
+
+
+def _cold_probe(size: int, import_s: float) -> None:  # pragma: no cover
+    """
+    Print cold timings as JSON. Runs in a fresh interpreter so the import
+    and the first call of every schema are really cold.
+    """
+    result: Dict[str, Any] = {"import_s": import_s, "schemas": {}}
+    for name, model in schema_classes().items():
+        payload = SAMPLES[name](size)
+        start = time.perf_counter()
+        instance = model.model_validate(payload)
+        first_validate = time.perf_counter() - start
+        start = time.perf_counter()
+        instance.model_dump()
+        first_dump = time.perf_counter() - start
+        start = time.perf_counter()
+        model.model_json_schema()
+        first_json_schema = time.perf_counter() - start
+        result["schemas"][name] = {
+            "first_validate_s": first_validate,
+            "first_dump_s": first_dump,
+            "first_json_schema_s": first_json_schema,
+        }
+    sys.stdout.write(json.dumps(result))
+
+
+def measure_cold(size: int, runs: int) -> dict:
+    """
+    Run ``_cold_probe`` in ``runs`` fresh interpreters and return the
+    median of every measurement.
+    """
+    code = _COLD_PROBE.format(size=size)
+    probes = []
+    for _ in range(runs):
+        probe = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        if probe.returncode:
+            raise RuntimeError(f"Cold probe failed:\n{probe.stderr}")
+        probes.append(json.loads(probe.stdout))
+
+    cold: Dict[str, Any] = {
+        "import_s": statistics.median(p["import_s"] for p in probes),
+        "schemas": {},
+    }
+    for name, first in probes[0]["schemas"].items():
+        cold["schemas"][name] = {
+            key: statistics.median(p["schemas"][name][key] for p in probes)
+            for key in first
+        }
+    return cold
+
+
+def environment() -> dict:
+    """Describe the interpreter and package versions behind a report."""
+    with open(os.path.join(os.path.dirname(__file__), "VERSION")) as fh:
+        version = fh.read().strip()
+    return {
+        "lucid_ai_schemas": version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "pydantic": pydantic.VERSION,
+        "pydantic_core": pydantic_core.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_schemas_suite(
+    size: Optional[int] = None,
+    number: int = 200,
+    repeat: int = 5,
+    cold_runs: int = 3,
+    only: Optional[List[str]] = None,
+) -> dict:
+    """
+    Run the micro and macro benchmarks for every schema (or only the
+    schemas named in ``only``).
+    """
+    size = size or 1000
+    classes = schema_classes()
+    if only:
+        unknown = set(only) - set(classes)
+        if unknown:
+            raise ValueError(f"Unknown schemas: {sorted(unknown)}")
+        classes = {name: classes[name] for name in only}
+
+    cold = measure_cold(size, cold_runs) if cold_runs else None
+    results = {}
+    for name, model in classes.items():
+        results[name] = {
+            "micro": measure_schema(model, SAMPLES[name](1), number, repeat),
+            "macro": measure_schema(
+                model,
+                SAMPLES[name](size),
+                max(1, number // size),
+                repeat,
+            ),
+        }
+        if cold:
+            results[name]["cold"] = cold["schemas"][name]
+    return {
+        "config": {
+            "size": size,
+            "number": number,
+            "repeat": repeat,
+            "cold_runs": cold_runs,
+        },
+        "import_s": cold["import_s"] if cold else None,
+        "schemas": results,
+    }
+
+
+def run_suite(name: str, **options) -> dict:
+    """Resolve a suite from ``SUITES`` and run it."""
+    if name not in SUITES:
+        raise ValueError(f"Unknown suite: {name}. Choose from {list(SUITES)}")
+    module_name, func_name = SUITES[name].split(":")
+    func = getattr(import_module(module_name), func_name)
+    return func(**options)
+
+
+def report(suites: Dict[str, dict]) -> dict:
+    """Wrap suite results with the metadata needed to compare reports."""
+    return {
+        "report_version": REPORT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "suites": suites,
+    }
+
+
+def _flatten(value: Any, prefix: str = "") -> Dict[str, float]:
+    if isinstance(value, dict):
+        flat: Dict[str, float] = {}
+        for key, item in value.items():
+            if key == "config":
+                continue
+            flat.update(_flatten(item, f"{prefix}{key}."))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix[:-1]: value}
+    return {}
+
+
+def compare(old: dict, new: dict) -> Dict[str, dict]:
+    """
+    Compare two reports metric by metric.
+
+    Returns ``{metric: {"old", "new", "ratio"}}`` for every numeric metric
+    found in both reports; a ratio above 1 means ``new`` is slower/bigger.
+    """
+    old_flat = _flatten(old.get("suites", {}))
+    new_flat = _flatten(new.get("suites", {}))
+    diff = {}
+    for key in sorted(old_flat.keys() & new_flat.keys()):
+        before, after = old_flat[key], new_flat[key]
+        diff[key] = {
+            "old": before,
+            "new": after,
+            "ratio": round(after / before, 3) if before else None,
+        }
+    return diff
@@ -0,0 +1,165 @@
+"""
+Build-once caches that threads share without a lock.
+
+The package keeps a few tables per model: field kinds, trusted
+builders, wire layouts, compact plans, JSON schemas. They are built
+on first use and never change afterwards, so a hit needs no lock at
+all: ``Memo`` is a dict whose misses call the function and publish the
+result with ``dict.setdefault``.
+
+    @Memo
+    def layout(model):
+        return _Layout(model)
+
+    layout(PositionSchema)        # built once, then a dict lookup
+    layout[PositionSchema]        # the same, cheaper on hot paths
+    len(layout), layout.cache_clear()
+
+Two threads missing the same key at the same time may both build it;
+the first result published wins and both get it, so a key maps to one
+object for the life of the cache. The functions are pure, so building
+twice only costs time, once per key. Under the GIL and in free-threaded
+builds alike the dict operations are atomic, and no thread waits on
+another to read a built entry.
+
+``benchmark`` measures how validation of ``PositionSchema`` and
+``SalaryGeneratorResponse`` payloads scales with threads and processes.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+
+class Memo(dict):
+    """``func(key)``, computed once per key (see the module)."""
+
+    def __init__(self, func: Callable[[Any], Any]):
+        super().__init__()
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
+
+    def __missing__(self, key):
+        # Built outside any lock; the first result published wins.
+        return self.setdefault(key, self.func(key))
+
+    # ``memo(key)`` is ``memo[key]``; hot paths index, which skips the
+    # call.
+    __call__ = dict.__getitem__
+
+    def cache_clear(self):
+        self.clear()
+
+    def __repr__(self):
+        return f"Memo({self.func.__qualname__}, {len(self)} entries)"
+
+
+# Per process payloads, set by ``_init``.
+_state: Dict[str, Any] = {}
+
+
+def _init(payloads: Dict[str, list]):
+    from lucid_ai_schemas.Schemas import schemas
+
+    _state.update(
+        models=[
+            (getattr(schemas, name), batch) for name, batch in payloads.items()
+        ]
+    )
+
+
+def _validate(rounds: int) -> int:
+    """Validate every payload ``rounds`` times; returns the count."""
+    validated = 0
+    for _ in range(rounds):
+        for model, batch in _state["models"]:
+            for payload in batch:
+                model.model_validate(payload)
+            validated += len(batch)
+    return validated
+
+
+def benchmark(
+    size: Optional[int] = None,
+    workers: Optional[int] = None,
+    rounds: int = 8,
+) -> dict:
+    """
+    Validate ``rounds`` batches per worker of 50 ``PositionSchema`` and
+    50 ``SalaryGeneratorResponse`` payloads of ``size`` (default 20)
+    positions, with 1, 2, 4... up to ``workers`` (default: the CPU count,
+    at least 4) threads, then processes: payloads per second and the
+    speedup over one worker. The work grows with the workers, so perfect
+    scaling is a speedup equal to the worker count. Also the cost of a
+    ``Memo`` hit against an ``lru_cache`` hit.
+    """
+    import logging
+    import os
+    import sys
+    import time
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from functools import lru_cache
+
+    from lucid_ai_schemas.bench import SAMPLES, _per_call
+
+    size = size or 20
+    cpus = os.cpu_count() or 1
+    workers = workers or max(4, cpus)
+    counts = [1]
+    while counts[-1] * 2 < workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != workers:
+        counts.append(workers)
+    payloads = {
+        name: [SAMPLES[name](size) for _ in range(50)]
+        for name in ("PositionSchema", "SalaryGeneratorResponse")
+    }
+    _init(payloads)
+    _validate(1)  # build the validators before timing
+
+    def run(pool, count):
+        # Warm every worker, then time ``count`` equal shares of work.
+        list(pool.map(_validate, [1] * count))
+        start = time.perf_counter()
+        validated = sum(pool.map(_validate, [rounds] * count))
+        return validated / (time.perf_counter() - start)
+
+    def curve(executor, **kwargs):
+        rates = {}
+        for count in counts:
+            with executor(count, **kwargs) as pool:
+                rates[count] = run(pool, count)
+        return {
+            count: {
+                "payloads_per_s": round(rate),
+                "speedup": round(rate / rates[1], 2),
+                "efficiency": round(rate / rates[1] / count, 2),
+            }
+            for count, rate in rates.items()
+        }
+
+    logging.disable(logging.CRITICAL)
+    try:
+        threads = curve(ThreadPoolExecutor)
+        processes = curve(
+            ProcessPoolExecutor, initializer=_init, initargs=(payloads,)
+        )
+    finally:
+        logging.disable(logging.NOTSET)
+
+    memo = Memo(str)
+    cached = lru_cache(maxsize=None)(str)
+    memo(1), cached(1)
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return {
+        "config": {
+            "positions": size,
+            "rounds": rounds,
+            "workers": counts,
+            "cpus": cpus,
+            "gil_enabled": is_gil_enabled() if is_gil_enabled else True,
+        },
+        "threads": threads,
+        "processes": processes,
+        "memo_hit": _per_call(lambda: memo[1], 100_000, repeat=5),
+        "lru_cache_hit": _per_call(lambda: cached(1), 100_000, repeat=5),
+    }
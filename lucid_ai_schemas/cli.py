@@ -1,28 +1,239 @@
 """CLI interface for lucid_ai_schemas project.
 
-Be creative! do whatever you want!
+Commands:
 
-- Install click or typer and create a CLI app
-- Use builtin argparse
-- Start a web application
-- Import things from your .base module
+    $ lucid_ai_schemas bench [--suite NAME] [--output PATH]
+    $ lucid_ai_schemas bench --compare OLD.json NEW.json
+    $ lucid_ai_schemas replay LOG_DIR --old OLD_SCHEMAS [--new NEW_SCHEMAS]
+    $ lucid_ai_schemas fake-llm [--port PORT] [--latency SECONDS]
 """
 
+import argparse
+import json
+import sys
 
-def main():  # pragma: no cover
+
+def _bench(args):
+    from lucid_ai_schemas import bench
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path) as fh:
+                reports.append(json.load(fh))
+        result = bench.compare(*reports)
+    else:
+        options = {}
+        if args.size is not None:
+            options["size"] = args.size
+        if args.suite == "schemas":
+            options.update(
+                number=args.number,
+                repeat=args.repeat,
+                cold_runs=args.cold_runs,
+                only=args.schema,
+            )
+        result = bench.report(
+            {args.suite: bench.run_suite(args.suite, **options)}
+        )
+
+    _write(result, args.output)
+
+
+def _replay(args):
+    from lucid_ai_schemas.replay import replay_logs
+
+    result = replay_logs(
+        args.directory,
+        args.old,
+        prefix=args.prefix,
+        new=args.new,
+        schema_for=args.schema,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        examples=args.examples,
+    )
+    _write(result, args.output)
+
+
+def _fake_llm(args):  # pragma: no cover
+    import asyncio
+
+    from lucid_ai_schemas.synthetic import serve
+
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                latency=args.latency,
+                jitter=args.jitter,
+                chunk_size=args.chunk_size,
+                chunk_delay=args.chunk_delay,
+                items=args.items,
+                invalid_rate=args.invalid_rate,
+                seed=args.seed,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def _write(result, output):
+    text = json.dumps(result, indent=2, default=str)
+    if output:
+        with open(output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def build_parser():
+    from lucid_ai_schemas.bench import SUITES
+
+    parser = argparse.ArgumentParser(prog="lucid_ai_schemas")
+    commands = parser.add_subparsers(dest="command")
+
+    bench = commands.add_parser(
+        "bench", help="Run the performance benchmarks."
+    )
+    bench.add_argument(
+        "--suite",
+        choices=sorted(SUITES),
+        default="schemas",
+        help="Benchmark suite to run (default: schemas).",
+    )
+    bench.add_argument(
+        "--size",
+        type=int,
+        default=None,
+        help="Problem size; the meaning depends on the suite.",
+    )
+    bench.add_argument(
+        "--number",
+        type=int,
+        default=200,
+        help="Calls per timing sample (schemas suite).",
+    )
+    bench.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timing samples per measurement (schemas suite).",
+    )
+    bench.add_argument(
+        "--cold-runs",
+        type=int,
+        default=3,
+        help="Fresh interpreters for cold timings, 0 to skip.",
+    )
+    bench.add_argument(
+        "--schema",
+        action="append",
+        help="Only benchmark this schema (repeatable).",
+    )
+    bench.add_argument(
+        "--output", "-o", help="Write the JSON report here instead of stdout."
+    )
+    bench.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Compare two reports instead of running benchmarks.",
+    )
+    bench.set_defaults(func=_bench)
+
+    replay = commands.add_parser(
+        "replay",
+        help="Replay logged responses through two schema versions.",
+    )
+    replay.add_argument("directory", help="Directory written by a LogSink.")
+    replay.add_argument(
+        "--old",
+        required=True,
+        help="Old schemas: a module name or the path of a schemas.py.",
+    )
+    replay.add_argument(
+        "--new",
+        default="lucid_ai_schemas.Schemas.schemas",
+        help="New schemas (default: the installed ones).",
+    )
+    replay.add_argument(
+        "--prefix", default="ai_responses", help="Log file prefix."
+    )
+    replay.add_argument(
+        "--schema",
+        default=None,
+        help="Validate every response with this schema instead of the "
+        "one named in prompt_object.",
+    )
+    replay.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU, 0 for none).",
+    )
+    replay.add_argument("--chunk-size", type=int, default=1000)
+    replay.add_argument(
+        "--examples",
+        type=int,
+        default=5,
+        help="Examples kept per schema and kind of difference.",
+    )
+    replay.add_argument(
+        "--output", "-o", help="Write the JSON report here instead of stdout."
+    )
+    replay.set_defaults(func=_replay)
+
+    fake_llm = commands.add_parser(
+        "fake-llm",
+        help="Serve synthetic schema responses for load tests.",
+    )
+    fake_llm.add_argument("--host", default="127.0.0.1")
+    fake_llm.add_argument("--port", type=int, default=8080)
+    fake_llm.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds before the first byte of every reply.",
+    )
+    fake_llm.add_argument(
+        "--jitter", type=float, default=0.0, help="Latency +/- seconds."
+    )
+    fake_llm.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="Characters per event of streamed replies.",
+    )
+    fake_llm.add_argument(
+        "--chunk-delay",
+        type=float,
+        default=0.0,
+        help="Seconds between events of streamed replies.",
+    )
+    fake_llm.add_argument(
+        "--items", type=int, default=3, help="Length of generated lists."
+    )
+    fake_llm.add_argument(
+        "--invalid-rate",
+        type=float,
+        default=0.0,
+        help="Share of replies with an injected error.",
+    )
+    fake_llm.add_argument("--seed", type=int, default=None)
+    fake_llm.set_defaults(func=_fake_llm)
+    return parser
+
+
+def main(argv=None):  # pragma: no cover
     """
     The main function executes on commands:
     `python -m lucid_ai_schemas` and `$ lucid_ai_schemas `.
-
-    This is your program's entry point.
-
-    You can change this function to do whatever you want.
-    Examples:
-        * Run a test suite
-        * Run a server
-        * Do some other stuff
-        * Run a command line application (Click, Typer, ArgParse)
-        * List all available tasks
-        * Run an application (Flask, FastAPI, Django, etc.)
     """
-    print("This will do something")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return
+    args.func(args)
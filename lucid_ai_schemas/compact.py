@@ -0,0 +1,269 @@
+"""
+Opt-in compaction of repeated values in validated instances.
+
+Large hiring plans repeat the same ``role`` strings and dates thousands of
+times, and every repetition is its own string object once the payload went
+through ``json.loads`` or a date validator. Compact mode shares them:
+
+    from lucid_ai_schemas import compact
+
+    compact.enable()
+    plan = PositionSchema.model_validate(json.loads(text))  # compacted
+    compact.disable()
+
+    compact.compact(instance)  # or compact one instance explicitly
+
+After validation (``model_validate``, ``model_validate_json`` and
+``__init__``), every string of at most ``MAX_INTERNED`` characters held by
+a field, an extra field or a list is interned, so equal strings are one
+object across the process. Longer strings (free text) are left alone.
+
+Fields typed ``Sectors | str`` (``CompanyFieldExtractorResponse.SECTORS``,
+``PromptTypeResponse.sector``) keep the strings as they were sent, because
+pydantic prefers the exact ``str`` match; compaction swaps the strings
+that are ``Sectors`` values, whatever their length, for the value string
+of the member, shared with the enum. They stay plain ``str``: ``str()``,
+f-strings and ``model_dump()`` give the same text as without compaction.
+Enum fields (``Departments``, ``Countries``...) already hold shared
+members, which cost one pointer like a small int code would.
+
+Nothing else changes: attributes keep their types and values, and
+``model_fields_set`` is untouched.
+"""
+
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from enum import Enum
+from types import UnionType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from lucid_ai_schemas.caches import Memo
+from lucid_ai_schemas.introspect import resolve
+from lucid_ai_schemas.metrics import schema_models
+from lucid_ai_schemas.patching import Patch, install, patch, restore
+
+# Same limit as the string cache of pydantic's JSON parser.
+MAX_INTERNED = 64
+_intern = sys.intern
+
+# model -> methods wrapped by enable()
+_patched: Dict[type, List[Patch]] = {}
+# Serializes enable() and disable().
+_lock = threading.Lock()
+_METHODS = ("model_validate", "model_validate_json", "__init__")
+
+
+def _scan(model: type, annotation: Any, found: dict) -> dict:
+    """Whether ``annotation`` can hold strings or models, and its enum."""
+    annotation = resolve(model, annotation)
+    args = get_args(annotation)
+    if get_origin(annotation) in (Union, UnionType):
+        enums = [
+            a for a in args if isinstance(a, type) and issubclass(a, Enum)
+        ]
+        if enums and str in args:
+            found["enum"] = enums[0]
+    if annotation is str or (
+        isinstance(annotation, type) and issubclass(annotation, BaseModel)
+    ):
+        found["compact"] = True
+    for arg in args:
+        if arg is not type(None):
+            _scan(model, arg, found)
+    return found
+
+
+def _action(enum: Optional[type]) -> Callable[[Any], Any]:
+    canonical = None
+    if enum is not None:
+        # The value strings of the members, never the members themselves.
+        values = {m.value: m.value for m in enum._value2member_map_.values()}
+        canonical = values.get
+
+    def action(value):
+        kind = type(value)
+        if kind is str:
+            if canonical is not None:
+                shared = canonical(value)
+                if shared is not None:
+                    return shared
+            if len(value) <= MAX_INTERNED:
+                return _intern(value)
+            return value
+        if kind is list:
+            value[:] = [action(item) for item in value]
+        elif isinstance(value, BaseModel):
+            compact(value)
+        return value
+
+    return action
+
+
+@Memo
+def _plan(model: type) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+    """The fields of ``model`` worth compacting, and how."""
+    plan = []
+    for name, field in model.model_fields.items():
+        found = _scan(model, field.annotation, {})
+        if found.get("compact"):
+            plan.append((name, _action(found.get("enum"))))
+    return tuple(plan)
+
+
+_extra = _action(None)
+
+
+def compact(instance: BaseModel) -> BaseModel:
+    """Compact ``instance`` and its nested instances in place."""
+    values = instance.__dict__
+    for name, action in _plan[type(instance)]:
+        value = values.get(name)
+        if value is not None:
+            values[name] = action(value)
+    extra = instance.__pydantic_extra__
+    if extra:
+        for name, value in extra.items():
+            extra[name] = _extra(value)
+    return instance
+
+
+def _wrap_method(found: Patch):
+    if found.attribute != "__init__":
+
+        def wrapper(cls, *args, **kwargs):
+            return compact(found.call(cls, *args, **kwargs))
+
+        return classmethod(wrapper)
+
+    def __init__(self, *args, **kwargs):
+        found.call(self, *args, **kwargs)
+        compact(self)
+
+    return __init__
+
+
+def enabled() -> bool:
+    return bool(_patched)
+
+
+def enable(models: Optional[Iterable[type]] = None):
+    """Compact the instances of ``models`` (default: every schema)."""
+    with _lock:
+        if enabled():
+            return
+        models = schema_models() if models is None else list(models)
+        # Every method is looked up before any is wrapped.
+        for model in models:
+            _patched[model] = [patch(model, a) for a in _METHODS]
+        for patches in _patched.values():
+            for found in patches:
+                install(found, _wrap_method(found))
+
+
+def disable():
+    with _lock:
+        for patches in _patched.values():
+            for found in patches:
+                restore(found)
+        _patched.clear()
+
+
+@contextmanager
+def compacted(models: Optional[Iterable[type]] = None):
+    enable(models)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def benchmark(size: Optional[int] = None) -> dict:
+    """
+    Validate a ``size``-row (default 100000) hiring plan from JSON text,
+    and as ``json.loads`` output, with and without compact mode. Compares
+    the retained size (``memory.footprint``) and the validation time.
+    """
+    import gc
+    import json
+    import random
+    import time
+
+    from lucid_ai_schemas.memory import footprint
+    from lucid_ai_schemas.Schemas.schemas import (
+        CompanyFieldExtractorResponse,
+        Countries,
+        Departments,
+        PositionSchema,
+        Sectors,
+    )
+
+    size = size or 100000
+    rng = random.Random(0)
+    roles = [
+        f"{level} {job}"
+        for level in ("Junior", "Senior", "Lead")
+        for job in ("Engineer", "Designer", "Account Executive", "Analyst")
+    ]
+    countries = [c.value for c in Countries][:30]
+    departments = [d.value for d in Departments]
+    text = json.dumps(
+        {
+            "positions": [
+                {
+                    "id": i,
+                    "role": rng.choice(roles),
+                    "full_name": f"Employee {i}",
+                    "department": rng.choice(departments),
+                    "start_date": f"202{rng.randrange(6, 9)}-"
+                    f"{rng.randrange(1, 13):02d}",
+                    "geo_location": rng.choice(countries),
+                    "yearly_salary": 50000 + i % 1000 * 100,
+                }
+                for i in range(size)
+            ]
+        }
+    )
+    sectors = [s.value for s in Sectors]
+    fields = json.dumps(
+        {"SECTORS": [rng.choice(sectors) for _ in range(size)]}
+    )
+    cases = {
+        "PositionSchema.validate_json": (PositionSchema, text, True),
+        "PositionSchema.validate": (PositionSchema, text, False),
+        "CompanyFieldExtractorResponse.validate": (
+            CompanyFieldExtractorResponse,
+            fields,
+            False,
+        ),
+    }
+    results: Dict[str, Any] = {"config": {"rows": size}}
+    for name, (model, data, from_json) in cases.items():
+        row = {}
+        for mode in ("default", "compact"):
+            payload = data if from_json else json.loads(data)
+            gc.collect()
+            with compacted([model]) if mode == "compact" else nullcontext():
+                start = time.perf_counter()
+                if from_json:
+                    instance = model.model_validate_json(payload)
+                else:
+                    instance = model.model_validate(payload)
+                seconds = time.perf_counter() - start
+            del payload
+            fp = footprint(instance)
+            row[mode] = {
+                "validate_s": seconds,
+                "bytes": fp.total,
+                "duplicate_string_bytes": fp.duplicate_strings,
+            }
+            del instance
+        row["bytes_saved"] = row["default"]["bytes"] - row["compact"]["bytes"]
+        row["saved_ratio"] = round(
+            row["bytes_saved"] / row["default"]["bytes"], 3
+        )
+        results[name] = row
+    return results
@@ -0,0 +1,423 @@
+"""
+Async DAG executor for prompt chains.
+
+A chain is declared as nodes: the input schema of a prompt, the response
+schema it answers with, the nodes it needs and a function building its
+input from their validated responses. ``DAG.run`` starts every node as
+soon as the nodes it needs are done, so independent prompts run
+concurrently, with at most ``concurrency`` LLM calls at once:
+
+    result = await ONBOARDING.run(llm, {"freetext": "..."}, concurrency=4)
+    result.responses["salaries"]  # a validated SalaryGeneratorResponse
+    result.timings["hiring"]      # {"start_s", "wait_s", "call_s", ...}
+
+``llm`` is any ``async def llm(node, input_instance, response_schema)``
+returning the raw response (a dict or a JSON string); ``StubLLM`` is a
+local stand-in for tests and load tests.
+
+``ONBOARDING`` is the onboarding chain. After ``expand``, the ``fields``
+and ``goals`` extractions run together; ``hiring`` only needs the
+extracted fields, so it (and then ``salaries``) runs alongside
+``templates`` and ``assumptions``:
+
+    expand -> fields + goals -> templates -> assumptions
+    expand -> fields -> hiring -> salaries
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+from lucid_ai_schemas.Schemas import schemas
+
+LLM = Callable[[str, BaseModel, type], Awaitable[Any]]
+
+
+class Node:
+    def __init__(
+        self,
+        name: str,
+        input_schema: type,
+        response_schema: type,
+        build: Callable[[Dict[str, BaseModel], dict], dict],
+        after: Iterable[str] = (),
+    ):
+        """
+        ``build(responses, context)`` returns the input payload, given the
+        validated responses of the nodes in ``after`` and the run context.
+        """
+        self.name = name
+        self.input_schema = input_schema
+        self.response_schema = response_schema
+        self.build = build
+        self.after = tuple(after)
+
+    def __repr__(self):
+        return f"Node({self.name!r}, after={self.after!r})"
+
+
+class NodeFailed(RuntimeError):
+    """A node could not build its input, call the LLM or validate."""
+
+    def __init__(self, node: str, error: BaseException):
+        super().__init__(f"Node {node!r} failed: {error!r}")
+        self.node = node
+
+
+class Result:
+    def __init__(self, responses: Dict[str, BaseModel], timings: dict):
+        self.responses = responses
+        self.timings = timings
+
+    @property
+    def wall_s(self) -> float:
+        return max(t["end_s"] for t in self.timings.values())
+
+    @property
+    def sequential_s(self) -> float:
+        """What the run would have taken one node after the other."""
+        return sum(
+            t["call_s"] + t["validate_s"] for t in self.timings.values()
+        )
+
+
+class DAG:
+    def __init__(self, nodes: Iterable[Node]):
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Invalid DAG: duplicate node {node.name}.")
+            self.nodes[node.name] = node
+        for node in self.nodes.values():
+            for name in node.after:
+                if name not in self.nodes:
+                    raise ValueError(
+                        f"Invalid DAG: {node.name} needs unknown node {name}."
+                    )
+        self.order = self._order()
+
+    def _order(self):
+        """Topological order; raises ValueError on cycles."""
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                cycle = " -> ".join(path + [name])
+                raise ValueError(f"Invalid DAG: cycle {cycle}.")
+            state[name] = "visiting"
+            for dependency in self.nodes[name].after:
+                visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
+
+    async def run(
+        self,
+        llm: LLM,
+        context: Optional[dict] = None,
+        concurrency: int = 4,
+    ) -> Result:
+        """
+        Run every node. Raises ``NodeFailed`` for the first node that
+        fails, after cancelling the nodes still running and waiting for
+        them to finish.
+        """
+        context = context or {}
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        done = {name: loop.create_future() for name in self.nodes}
+        responses: Dict[str, BaseModel] = {}
+        timings: Dict[str, dict] = {}
+        origin = time.perf_counter()
+
+        async def execute(node: Node):
+            for name in node.after:
+                await done[name]
+            ready = time.perf_counter()
+            try:
+                payload = node.build(responses, context)
+                instance = node.input_schema.model_validate(payload)
+                async with semaphore:
+                    started = time.perf_counter()
+                    raw = await llm(node.name, instance, node.response_schema)
+                called = time.perf_counter()
+                if isinstance(raw, (str, bytes)):
+                    response = node.response_schema.model_validate_json(raw)
+                else:
+                    response = node.response_schema.model_validate(raw)
+            except Exception as error:
+                raise NodeFailed(node.name, error) from error
+            end = time.perf_counter()
+            responses[node.name] = response
+            timings[node.name] = {
+                "start_s": ready - origin,
+                "wait_s": started - ready,
+                "call_s": called - started,
+                "validate_s": end - called,
+                "end_s": end - origin,
+            }
+            done[node.name].set_result(response)
+
+        tasks = [
+            asyncio.ensure_future(execute(self.nodes[name]))
+            for name in self.order
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for future in done.values():
+                future.cancel()
+            # Wait for the cancelled nodes and retrieve the failures of
+            # the others, so no task outlives the run.
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return Result(responses, timings)
+
+
+class StubLLM:
+    def __init__(
+        self,
+        responses: Dict[str, Any],
+        latency: float = 0.0,
+        latencies: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Answer node ``name`` with ``responses[name]``: a payload, or a
+        function of the input instance returning one. Each call sleeps
+        ``latencies[name]`` (default ``latency``) seconds.
+        """
+        self.responses = responses
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.calls: Dict[str, BaseModel] = {}
+
+    async def __call__(self, node, instance, response_schema):
+        self.calls[node] = instance
+        await asyncio.sleep(self.latencies.get(node, self.latency))
+        response = self.responses[node]
+        return response(instance) if callable(response) else response
+
+
+def _value(value):
+    # Enum members -> their values, for schemas typed with plain strings.
+    return getattr(value, "value", value)
+
+
+_AMOUNTS = (
+    "funding_raise",
+    "target_round_funding",
+    "target_revenue_in_one_year",
+)
+
+
+def _company(responses: Dict[str, BaseModel], context: dict) -> dict:
+    """Company fields shared by the templates/assumptions inputs."""
+    fields, goals = responses["fields"], responses["goals"]
+    return {
+        "freetext": responses["expand"].response or context.get("freetext"),
+        "sectors": [_value(sector) for sector in fields.SECTORS or []],
+        "location": _value(fields.LOCATION),
+        "company_stage": _value(fields.STAGE),
+        "funding_raise": fields.FUNDING,
+        "target_round_funding": goals.FUNDING,
+        "target_revenue_in_one_year": goals.REVENUE,
+        "target_employees_in_one_year": goals.EMPLOYEES,
+        "raise_next_round_date": goals.WHEN,
+    }
+
+
+def _assumptions(responses, context) -> dict:
+    payload = _company(responses, context)
+    # AssumptionsInputSchema takes the amounts as text.
+    for name in _AMOUNTS:
+        if payload[name] is not None:
+            payload[name] = str(payload[name])
+    payload["formulas"] = responses["templates"].templates
+    return payload
+
+
+def _extract(responses, context) -> dict:
+    payload = {"freetext": responses["expand"].response or context["freetext"]}
+    if context.get("additional_info") is not None:
+        payload["additional_info"] = context["additional_info"]
+    return payload
+
+
+def _hiring(responses, context) -> dict:
+    fields = responses["fields"]
+    return {
+        "sectors": ", ".join(_value(s) for s in fields.SECTORS or []),
+        "balance": context.get("balance", fields.FUNDING),
+        "location": _value(fields.LOCATION),
+        "stage": _value(fields.STAGE),
+        "freetext": responses["expand"].response,
+    }
+
+
+def _salaries(responses, context) -> dict:
+    return {
+        "positions": [
+            {
+                "id": position.id,
+                "role": position.role,
+                "department": position.department,
+                "geo_location": position.geo_location,
+            }
+            for position in responses["hiring"].positions or []
+        ]
+    }
+
+
+ONBOARDING = DAG(
+    [
+        Node(
+            "expand",
+            schemas.CompanyDetailsExpanderSchema,
+            schemas.StringResponse,
+            lambda responses, context: {"freetext": context["freetext"]},
+        ),
+        Node(
+            "fields",
+            schemas.ExtractGoalsORFieldsInputSchema,
+            schemas.CompanyFieldExtractorResponse,
+            _extract,
+            after=["expand"],
+        ),
+        Node(
+            "goals",
+            schemas.ExtractGoalsORFieldsInputSchema,
+            schemas.CompanyGoalsExtractorResponse,
+            _extract,
+            after=["expand"],
+        ),
+        Node(
+            "templates",
+            schemas.TemplateAssignerSchema,
+            schemas.TemplateAssignerResponseSchema,
+            lambda responses, context: {
+                **_company(responses, context),
+                "template_list": context.get("template_list"),
+            },
+            after=["fields", "goals"],
+        ),
+        Node(
+            "assumptions",
+            schemas.AssumptionsInputSchema,
+            schemas.AssumptionsGeneratorResponse,
+            _assumptions,
+            after=["fields", "goals", "templates"],
+        ),
+        Node(
+            "hiring",
+            schemas.HiringGenerateSchema,
+            schemas.PositionSchema,
+            _hiring,
+            after=["expand", "fields"],
+        ),
+        Node(
+            "salaries",
+            schemas.SalaryGeneratorSchema,
+            schemas.SalaryGeneratorResponse,
+            _salaries,
+            after=["hiring"],
+        ),
+    ]
+)
+
+
+def onboarding_stub(latency: float = 0.0, positions: int = 3) -> StubLLM:
+    """A ``StubLLM`` answering the ``ONBOARDING`` nodes plausibly."""
+    return StubLLM(
+        {
+            "expand": {"response": "We build budgeting software for SMBs."},
+            "fields": {
+                "LOCATION": "Germany",
+                "SECTORS": ["Fintech"],
+                "FUNDING": 500000,
+                "STAGE": "Seed Stage",
+            },
+            "goals": {
+                "WHEN": "Q3 2030",
+                "FUNDING": 3000000,
+                "REVENUE": 1000000,
+                "EMPLOYEES": 25,
+            },
+            "templates": {"templates": "SaaS Starter"},
+            "assumptions": json.dumps(
+                {"calculations": [{"key": "churn", "value": "2%"}]}
+            ),
+            "hiring": {
+                "positions": [
+                    {
+                        "id": i,
+                        "role": "Engineer",
+                        "department": "rnd",
+                        "geo_location": "Germany",
+                    }
+                    for i in range(positions)
+                ]
+            },
+            "salaries": lambda instance: {
+                "positions": [
+                    {"id": p.id, "yearly_salary": 80000}
+                    for p in instance.positions
+                ]
+            },
+        },
+        latency=latency,
+    )
+
+
+def benchmark(
+    size: Optional[int] = None, latency: float = 0.05, concurrency: int = 4
+) -> dict:
+    """
+    Run the onboarding chain ``size`` (default 20) times against a stub
+    LLM answering in ``latency`` seconds, with the DAG executor and one
+    node after the other, as before.
+    """
+    runs = size or 20
+    llm = onboarding_stub(latency)
+    context = {"freetext": "Budgeting software", "template_list": "all"}
+
+    # The same nodes, each one waiting for the previous one.
+    order = [ONBOARDING.nodes[name] for name in ONBOARDING.order]
+    chain = DAG(
+        Node(n.name, n.input_schema, n.response_schema, n.build, after)
+        for n, after in zip(order, [()] + [[n.name] for n in order])
+    )
+
+    async def sequential():
+        start = time.perf_counter()
+        await chain.run(llm, context, concurrency=1)
+        return time.perf_counter() - start
+
+    async def concurrent():
+        start = time.perf_counter()
+        result = await ONBOARDING.run(llm, context, concurrency)
+        return time.perf_counter() - start, result
+
+    sequential_s = [asyncio.run(sequential()) for _ in range(runs)]
+    concurrent_runs = [asyncio.run(concurrent()) for _ in range(runs)]
+    concurrent_s = [seconds for seconds, _ in concurrent_runs]
+    timings = concurrent_runs[-1][1].timings
+    return {
+        "config": {
+            "runs": runs,
+            "latency_s": latency,
+            "concurrency": concurrency,
+        },
+        "sequential_mean_s": sum(sequential_s) / runs,
+        "dag_mean_s": sum(concurrent_s) / runs,
+        "speedup": round(sum(sequential_s) / sum(concurrent_s), 2),
+        "node_timings": timings,
+    }
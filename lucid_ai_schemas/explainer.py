@@ -0,0 +1,330 @@
+"""
+Downsampling of ``ExplainerSchema`` transactions before prompting.
+
+A formula can carry tens of thousands of transactions, while the
+explainer only needs the ones that move the total. ``TransactionReducer``
+streams over transactions and keeps, per formula and period, the
+``top`` transactions by absolute amount in a bounded heap; the others
+are rolled into one "Other" row per period, so totals are preserved:
+
+    reducer = TransactionReducer(top=20, period="month")
+    for formula, transactions in source:     # any iterables, e.g. a cursor
+        reducer.feed(formula, transactions)
+    explainer = reducer.result()              # a valid ExplainerSchema
+
+    downsample(explainer, top=20)             # same, from a schema
+
+Memory is bounded by ``top`` transactions per formula and period, not by
+the number of transactions fed. Periods are "month", "quarter", "year"
+or None (one group per formula), taken from the transaction dates (any
+format ``coerce_date`` normalizes); transactions without a usable date
+form their own group. Kept transactions stay in their input order, the
+"Other" row of a period follows them, dated the first day of the period
+(None for the undated group). Transactions without an amount only count
+in the "Other" rows.
+"""
+
+import heapq
+from itertools import count
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from lucid_ai_schemas.Schemas.dates import coerce_date
+from lucid_ai_schemas.Schemas.schemas import ExplainerSchema
+
+Formula = ExplainerSchema.Formula
+Transaction = ExplainerSchema.Formula.Transaction
+
+PERIODS = ("month", "quarter", "year", None)
+OTHER = "Other ({count} transactions)"
+# Distinct dates remembered per formula.
+_MAX_DATES = 100_000
+
+
+def _period_key(period: Optional[str]):
+    """``date -> (group key, first day)`` for ``period``."""
+
+    def key(value):
+        day = coerce_date(value)
+        if (
+            period is None
+            or not isinstance(day, str)
+            or len(day) != 10
+            or day[4] != "-"
+        ):
+            return None, None
+        if period == "month":
+            return day[:7], day[:8] + "01"
+        if period == "year":
+            return day[:4], day[:5] + "01-01"
+        month = (int(day[5:7]) - 1) // 3 * 3 + 1
+        start = f"{day[:4]}-{month:02d}-01"
+        return start, start
+
+    return key
+
+
+class _Group:
+    __slots__ = ("heap", "other_count", "other_amount", "start")
+
+    def __init__(self, start):
+        # (|amount|, -order, order, transaction) min-heap: the smallest,
+        # then the latest, is evicted first.
+        self.heap: list = []
+        self.other_count = 0
+        self.other_amount = 0.0
+        self.start = start
+
+
+def _fields(transaction) -> tuple:
+    if isinstance(transaction, dict):
+        return (
+            transaction.get("date"),
+            transaction.get("name"),
+            transaction.get("amount"),
+        )
+    return transaction.date, transaction.name, transaction.amount
+
+
+class TransactionReducer:
+    def __init__(self, top: int = 20, period: Optional[str] = "month"):
+        if period not in PERIODS:
+            raise ValueError(
+                f"Invalid period: {period}. Must be one of {PERIODS}."
+            )
+        if top < 0:
+            raise ValueError(f"Invalid top: {top}. Must be >= 0.")
+        self.top = top
+        self.period = period
+        self._key = _period_key(period)
+        self._order = count()
+        # One (formula fields, {period key: group}) per fed formula.
+        self._formulas: List[Tuple[dict, Dict[Any, _Group]]] = []
+        self.seen = 0
+
+    def feed(
+        self,
+        formula: Union[Formula, dict, str],
+        transactions: Optional[Iterable[Union[Transaction, dict]]] = None,
+    ):
+        """
+        Reduce ``transactions`` (by default those of ``formula``) into a
+        new formula of the result. ``formula`` is a ``Formula``, its dict
+        or its name; its other fields are kept as they are.
+        """
+        if isinstance(formula, str):
+            fields = {"name": formula}
+        elif isinstance(formula, dict):
+            fields = dict(formula)
+        else:
+            fields = {
+                name: getattr(formula, name) for name in Formula.model_fields
+            }
+        if transactions is None:
+            transactions = fields.get("transactions") or ()
+        fields.pop("transactions", None)
+        groups: Dict[Any, _Group] = {}
+        self._formulas.append((fields, groups))
+
+        top, key, order = self.top, self._key, self._order
+        push, pushpop = heapq.heappush, heapq.heappushpop
+        # date -> group, for the dates of this formula
+        by_date: Dict[Any, _Group] = {}
+        seen = 0
+        for transaction in transactions:
+            seen += 1
+            if type(transaction) is dict:
+                date = transaction.get("date")
+                amount = transaction.get("amount")
+            else:
+                date, amount = transaction.date, transaction.amount
+            group = by_date.get(date)
+            if group is None:
+                period, start = key(date)
+                group = groups.get(period)
+                if group is None:
+                    group = groups[period] = _Group(start)
+                if len(by_date) < _MAX_DATES:
+                    by_date[date] = group
+            if amount is None:
+                group.other_count += 1
+                continue
+            size = abs(amount)
+            heap = group.heap
+            if len(heap) < top:
+                n = next(order)
+                push(heap, (size, -n, n, transaction))
+            elif top and size > heap[0][0]:
+                n = next(order)
+                evicted = pushpop(heap, (size, -n, n, transaction))
+                group.other_count += 1
+                group.other_amount += _fields(evicted[3])[2]
+            else:
+                group.other_count += 1
+                group.other_amount += amount
+        self.seen += seen
+
+    def formulas(self) -> List[dict]:
+        """The reduced formulas, as payloads."""
+        reduced = []
+        for fields, groups in self._formulas:
+            transactions = []
+            for group in groups.values():
+                for entry in sorted(group.heap, key=itemgetter(2)):
+                    date, name, amount = _fields(entry[3])
+                    transactions.append(
+                        {"date": date, "name": name, "amount": amount}
+                    )
+                if group.other_count:
+                    transactions.append(
+                        {
+                            "date": group.start,
+                            "name": OTHER.format(count=group.other_count),
+                            "amount": group.other_amount,
+                        }
+                    )
+            reduced.append({**fields, "transactions": transactions})
+        return reduced
+
+    def result(self) -> ExplainerSchema:
+        """The reduced formulas as a validated ``ExplainerSchema``."""
+        return ExplainerSchema.model_validate({"input": self.formulas()})
+
+
+def downsample(
+    explainer: Union[ExplainerSchema, dict],
+    top: int = 20,
+    period: Optional[str] = "month",
+) -> ExplainerSchema:
+    """``explainer`` with its transactions reduced (see the module)."""
+    if isinstance(explainer, dict):
+        formulas = explainer.get("input") or ()
+    else:
+        formulas = explainer.input or ()
+    reducer = TransactionReducer(top, period)
+    for formula in formulas:
+        reducer.feed(formula)
+    return reducer.result()
+
+
+def benchmark(
+    size: Optional[int] = None, formulas: int = 10, top: int = 20
+) -> dict:
+    """
+    Reduce ``formulas`` formulas of ``size`` (default 200000) generated
+    transactions in total over a year, keeping the ``top`` per month:
+    throughput against sorting every period of a materialized list, peak
+    memory streaming from a generator against materializing it, and the
+    prompt tokens before and after.
+    """
+    import random
+    import time
+    import tracemalloc
+
+    from lucid_ai_schemas.tokens import count_tokens
+    from lucid_ai_schemas.trusted import construct
+
+    size = size or 200_000
+    per_formula = size // formulas
+    days = [f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in (1, 15)]
+
+    def transactions(seed):
+        rng = random.Random(seed)
+        for i in range(per_formula):
+            yield {
+                "date": days[i * len(days) // per_formula],
+                "name": f"Vendor {rng.randrange(500)}",
+                "amount": round(rng.lognormvariate(4, 1.5), 2)
+                * rng.choice((1, 1, 1, -1)),
+            }
+
+    names = [f"Formula {f}" for f in range(formulas)]
+
+    def reduce(sources):
+        reducer = TransactionReducer(top, "month")
+        for name, rows in zip(names, sources):
+            reducer.feed(name, rows)
+        return reducer
+
+    # A caller already tracing keeps its traces and peak: the peak of a
+    # phase is then only known (else None) if it rose above the earlier.
+    tracing = tracemalloc.is_tracing()
+
+    def peak_kb(func):
+        if not tracing:
+            tracemalloc.reset_peak()
+        start, earlier = tracemalloc.get_traced_memory()
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        if tracing and peak <= earlier:
+            return result, None
+        return result, (peak - start) // 1024
+
+    if not tracing:
+        tracemalloc.start()
+    try:
+        _, stream_peak_kb = peak_kb(
+            lambda: reduce(transactions(f) for f in range(formulas))
+        )
+        materialized, materialized_peak_kb = peak_kb(
+            lambda: [list(transactions(f)) for f in range(formulas)]
+        )
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    start = time.perf_counter()
+    reducer = reduce(materialized)
+    reduce_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for rows in materialized:
+        by_month: Dict[str, list] = {}
+        for row in rows:
+            by_month.setdefault(row["date"][:7], []).append(row)
+        for group in by_month.values():
+            group.sort(key=lambda row: -abs(row["amount"]))
+            other = sum(row["amount"] for row in group[top:])
+            group[top:] = [{"name": "Other", "amount": other}]
+    sort_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reduced = reducer.result()
+    emit_s = time.perf_counter() - start
+    full = construct(
+        ExplainerSchema,
+        {
+            "input": [
+                {
+                    "name": name,
+                    "date": "2025-12-31",
+                    "transactions": rows,
+                }
+                for name, rows in zip(names, materialized)
+            ]
+        },
+    )
+    tokens_full = count_tokens(full)
+    tokens_reduced = count_tokens(reduced)
+    totals_match = all(
+        abs(
+            sum(t["amount"] for t in rows)
+            - sum(t.amount for t in formula.transactions)
+        )
+        < 1e-6 * max(1.0, sum(abs(t["amount"]) for t in rows))
+        for rows, formula in zip(materialized, reduced.input)
+    )
+    return {
+        "config": {"transactions": size, "formulas": formulas, "top": top},
+        "reduce_s": reduce_s,
+        "transactions_per_s": round(size / reduce_s),
+        "sort_every_period_s": sort_s,
+        "emit_schema_s": emit_s,
+        "stream_peak_kb": stream_peak_kb,
+        "materialized_peak_kb": materialized_peak_kb,
+        "transactions_kept": sum(len(f.transactions) for f in reduced.input),
+        "tokens_full": tokens_full,
+        "tokens_reduced": tokens_reduced,
+        "token_reduction": round(tokens_full / tokens_reduced, 1),
+        "totals_match": totals_match,
+    }
@@ -0,0 +1,229 @@
+"""
+Incremental revalidation for forms edited one field at a time.
+
+During onboarding the user edits ``CompanyDetailsSchema`` /
+``TemplateAssignerSchema`` field by field. Instead of rebuilding the
+whole model on every save, an ``EditSession`` validates only the edited
+field and keeps the derived artifacts (serialized dict, JSON,
+fingerprint, rendered prompt) cached per field, recomputing only what
+the edit touched:
+
+    session = EditSession(TemplateAssignerSchema, data, render=render)
+    session.update("location", "Germany")  # validates "location" only
+    session.json, session.fingerprint, session.prompt
+    session.dirty  # {"location"}, until session.mark_clean()
+
+Edits that validate to the value the field already holds are no-ops.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from pydantic import BaseModel
+
+_dumps = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=str
+).encode
+
+
+class EditSession:
+    def __init__(
+        self,
+        model: type,
+        data: Optional[dict] = None,
+        render: Optional[Callable[[BaseModel], str]] = None,
+        prompt_fields: Optional[Iterable[str]] = None,
+        exclude_none: bool = True,
+    ):
+        """
+        ``render`` turns the instance into the prompt; it only runs again
+        after an edit to one of ``prompt_fields`` (default: every field).
+        ``exclude_none`` drops unset fields from the serialized forms, as
+        ``CompanyDetailsSchema.to_dict`` does.
+        """
+        self.model = model
+        self.instance = model.model_validate(data or {})
+        self.render = render
+        self.prompt_fields = (
+            frozenset(prompt_fields)
+            if prompt_fields is not None
+            else frozenset(model.model_fields)
+        )
+        self.exclude_none = exclude_none
+        self.dirty: Set[str] = set()
+        self._assign = model.__pydantic_validator__.validate_assignment
+        self._fragments: Dict[str, Optional[str]] = {}
+        self._values: Dict[str, Any] = {}
+        for name in model.model_fields:
+            self._serialize(name)
+        self._data: Optional[dict] = None
+        self._json: Optional[str] = None
+        self._fingerprint: Optional[str] = None
+        self._prompt: Optional[str] = None
+
+    def _serialize(self, name: str):
+        value = getattr(self.instance, name)
+        if value is None and self.exclude_none:
+            self._values.pop(name, None)
+            self._fragments[name] = None
+            return
+        dumped = self.instance.model_dump(mode="json", include={name})[name]
+        self._values[name] = dumped
+        self._fragments[name] = f"{_dumps(name)}:{_dumps(dumped)}"
+
+    def update(self, name: str, value: Any) -> bool:
+        """
+        Validate and apply a single field edit. Returns False when the
+        field already held the validated value. Raises ValidationError
+        (leaving the session untouched) for invalid values.
+        """
+        if name not in self.model.model_fields:
+            raise ValueError(
+                f"Invalid field: {name}. Must be one of "
+                f"{list(self.model.model_fields)}."
+            )
+        previous = getattr(self.instance, name)
+        self._assign(self.instance, name, value)
+        if getattr(self.instance, name) == previous:
+            return False
+        self.dirty.add(name)
+        self._serialize(name)
+        self._data = self._json = self._fingerprint = None
+        if name in self.prompt_fields:
+            self._prompt = None
+        return True
+
+    def update_many(self, changes: Dict[str, Any]) -> Set[str]:
+        """Apply several edits; returns the fields that changed."""
+        return {name for name, v in changes.items() if self.update(name, v)}
+
+    def mark_clean(self) -> Set[str]:
+        """Return the dirty fields (e.g. to persist them) and reset them."""
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    @property
+    def data(self) -> dict:
+        """The JSON-mode dump of the instance."""
+        if self._data is None:
+            self._data = dict(self._values)
+        return self._data
+
+    @property
+    def json(self) -> str:
+        """Compact JSON of ``data``, joined from cached field fragments."""
+        if self._json is None:
+            fragments = [f for f in self._fragments.values() if f is not None]
+            self._json = "{" + ",".join(fragments) + "}"
+        return self._json
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 of ``json``; equal payloads share a fingerprint."""
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(
+                self.json.encode("utf-8")
+            ).hexdigest()
+        return self._fingerprint
+
+    @property
+    def prompt(self) -> Optional[str]:
+        if self.render is None:
+            return None
+        if self._prompt is None:
+            self._prompt = self.render(self.instance)
+        return self._prompt
+
+
+def full_rebuild(
+    model: type,
+    data: dict,
+    render: Optional[Callable[[BaseModel], str]] = None,
+) -> tuple:
+    """What a save costs without a session: validate, dump, hash, render."""
+    instance = model.model_validate(data)
+    serialized = _dumps(instance.model_dump(mode="json", exclude_none=True))
+    fingerprint = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    prompt = render(instance) if render else None
+    return instance, serialized, fingerprint, prompt
+
+
+def benchmark(size: Optional[int] = None, template_kb: int = 20) -> dict:
+    """
+    Replay ``size`` (default 10k) single-field edits on a
+    ``TemplateAssignerSchema`` holding ``template_kb`` kB of templates,
+    measuring edit-to-ready latency (validated, serialized, fingerprinted
+    and rendered) for full rebuilds and for an ``EditSession``.
+    """
+    import statistics
+    import time
+
+    from lucid_ai_schemas.Schemas.schemas import TemplateAssignerSchema
+
+    size = size or 10_000
+    data = {
+        "sectors": ["Fintech", "SaaS (Software as a Service)"],
+        "freetext": "We build budgeting software for small businesses.",
+        "location": "Germany",
+        "company_stage": "Seed",
+        "funding_raise": "$2.5M",
+        "target_employees_in_one_year": 25,
+        "target_revenue_in_one_year": "€1.2 million",
+        "raise_next_round_date": "Q3 2026",
+        "target_round_funding": "$10M",
+        "template_list": "template, " * (template_kb * 100),
+    }
+
+    def render(instance):
+        return (
+            f"Company: {instance.freetext}\nSectors: {instance.sectors}\n"
+            f"Location: {instance.location}\n"
+            f"Templates: {instance.template_list}"
+        )
+
+    prompt_fields = ("freetext", "sectors", "location", "template_list")
+    edits = [
+        ("freetext", lambda i: f"We build budgeting software, v{i}."),
+        ("location", lambda i: ("Germany", "France", "Israel")[i % 3]),
+        ("funding_raise", lambda i: f"${i % 50 + 1}M"),
+        ("target_employees_in_one_year", lambda i: i % 200),
+        ("raise_next_round_date", lambda i: f"Q{i % 4 + 1} 2027"),
+    ]
+
+    def replay(apply) -> list:
+        timings = []
+        for i in range(size):
+            name, value = edits[i % len(edits)]
+            start = time.perf_counter()
+            apply(name, value(i))
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    current = dict(data)
+
+    def rebuild(name, value):
+        current[name] = value
+        full_rebuild(TemplateAssignerSchema, current, render)
+
+    session = EditSession(
+        TemplateAssignerSchema, data, render, prompt_fields=prompt_fields
+    )
+
+    def incremental(name, value):
+        session.update(name, value)
+        session.json, session.fingerprint, session.prompt
+
+    results = {}
+    for label, apply in (("full_rebuild", rebuild), ("session", incremental)):
+        timings = sorted(replay(apply))
+        results[label] = {
+            "total_s": sum(timings),
+            "p50_us": statistics.median(timings) * 1e6,
+            "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+        }
+    results["speedup"] = round(
+        results["full_rebuild"]["total_s"] / results["session"]["total_s"], 2
+    )
+    results["config"] = {"edits": size, "template_kb": template_kb}
+    return results
@@ -0,0 +1,110 @@
+"""
+Helpers to look at the field types of the schemas.
+
+Several tools need to know, for every field, whether it holds a nested
+model, a list of nested models or an enum, without going through a full
+validation. ``field_kinds`` answers that once per model and caches it.
+"""
+
+import sys
+from enum import Enum
+from typing import Annotated, Any, Dict, ForwardRef, List, Optional, Tuple
+from typing import Union, get_args, get_origin
+from types import UnionType
+
+from pydantic import BaseModel
+
+from lucid_ai_schemas.caches import Memo
+
+# A field kind: ("model", Model), ("models", Model), ("enum", EnumClass),
+# ("enums", EnumClass) or None for anything else.
+Kind = Optional[Tuple[str, type]]
+
+
+def resolve(model: type, annotation: Any) -> Any:
+    """Evaluate string/ForwardRef annotations in the model's module."""
+    if isinstance(annotation, str):
+        annotation = ForwardRef(annotation)
+    if isinstance(annotation, ForwardRef):
+        namespace = vars(sys.modules[model.__module__])
+        return eval(annotation.__forward_arg__, namespace)
+    return annotation
+
+
+def unwrap(model: type, annotation: Any) -> Any:
+    """
+    Strip ``Annotated`` and ``Optional`` from an annotation. Unions of
+    more than one non-None type are returned as they are.
+    """
+    annotation = resolve(model, annotation)
+    while True:
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            annotation = resolve(model, get_args(annotation)[0])
+        elif origin in (Union, UnionType):
+            args = [a for a in get_args(annotation) if a is not type(None)]
+            if len(args) != 1:
+                return annotation
+            annotation = resolve(model, args[0])
+        else:
+            return annotation
+
+
+def _kind(model: type, annotation: Any) -> Kind:
+    annotation = unwrap(model, annotation)
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return ("model", annotation)
+        if issubclass(annotation, Enum):
+            return ("enum", annotation)
+        return None
+    if get_origin(annotation) in (list, List):
+        args = get_args(annotation)
+        item = _kind(model, args[0]) if args else None
+        if item and item[0] in ("model", "enum"):
+            return (item[0] + "s", item[1])
+    return None
+
+
+@Memo
+def field_kinds(model: type) -> Dict[str, Kind]:
+    """Kind of every field of ``model``."""
+    return {
+        name: _kind(model, field.annotation)
+        for name, field in model.model_fields.items()
+    }
+
+
+def nested_models(model: type) -> List[type]:
+    """Every model reachable from ``model``'s fields, ``model`` first."""
+    seen = [model]
+    for cls in seen:
+        for kind in field_kinds(cls).values():
+            if kind and kind[0] in ("model", "models"):
+                if kind[1] not in seen:
+                    seen.append(kind[1])
+    return seen
+
+
+def module_models(module) -> List[type]:
+    """
+    Every pydantic model defined in ``module``, nested models before the
+    models that contain them.
+    """
+    models: List[type] = []
+
+    def visit(cls):
+        for value in vars(cls).values():
+            if isinstance(value, type) and issubclass(value, BaseModel):
+                visit(value)
+        if cls not in models:
+            models.append(cls)
+
+    for value in vars(module).values():
+        if (
+            isinstance(value, type)
+            and issubclass(value, BaseModel)
+            and value.__module__ == module.__name__
+        ):
+            visit(value)
+    return models
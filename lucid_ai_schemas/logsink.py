@@ -0,0 +1,358 @@
+"""
+Buffered background sink for ``LogAIResponseObject`` records.
+
+``LogSink.emit`` only appends the record to a bounded in-memory ring
+buffer, so the request path never waits on serialization or disk. A
+background thread drains the buffer in batches, serializes the records to
+JSON lines and appends them to gzip compressed files that rotate like
+``logging.handlers.RotatingFileHandler``:
+
+    ai_responses.jsonl.gz      <- current file
+    ai_responses.1.jsonl.gz    <- newest backup
+    ai_responses.2.jsonl.gz    ...
+
+Every line is the dumped record plus a ``logged_at`` epoch timestamp taken
+at ``emit`` time.
+
+    sink = LogSink("/var/log/lucid")
+    sink.emit(LogAIResponseObject(response={...}, response_time=1.2))
+    ...
+    sink.close()  # also registered with atexit
+
+What happens when the buffer is full is controlled by ``policy``:
+
+* ``"drop"``: the new record is dropped,
+* ``"drop_oldest"``: the oldest buffered record is dropped,
+* ``"block"``: ``emit`` waits up to ``block_timeout`` seconds for room,
+  then drops the new record.
+
+Write errors never stop the background thread: a record that cannot be
+serialized is skipped, a batch that cannot be written (disk full, failed
+rotation) is lost; both are logged and counted in ``failed``.
+"""
+
+import asyncio
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Iterator, List, Optional, Tuple, Union
+
+from lucid_ai_schemas.Schemas.schemas import LogAIResponseObject
+
+POLICIES = ("drop", "drop_oldest", "block")
+
+Record = Union[LogAIResponseObject, dict]
+
+
+class LogSink:
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "ai_responses",
+        capacity: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        policy: str = "drop",
+        block_timeout: Optional[float] = 5.0,
+        compress: bool = True,
+        compresslevel: int = 6,
+        max_bytes: int = 64 * 1024 * 1024,
+        backup_count: int = 10,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Invalid policy: {policy}. Must be one of {POLICIES}."
+            )
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("capacity and batch_size must be positive.")
+        self.directory = directory
+        self.prefix = prefix
+        self.capacity = capacity
+        self.batch_size = min(batch_size, capacity)
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.compress = compress
+        self.compresslevel = compresslevel
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.emitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+        self._buffer: deque = deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name=f"LogSink({prefix})", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # Producer side
+
+    def emit(self, record: Record) -> bool:
+        """
+        Queue a record for writing. Returns False if the record was
+        dropped because the buffer is full (or the sink is closed).
+        """
+        item = (time.time(), record)
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            if len(self._buffer) >= self.capacity:
+                if self.policy == "drop":
+                    self.dropped += 1
+                    return False
+                if self.policy == "drop_oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                elif (
+                    not self._thread.is_alive()
+                    or not self._cond.wait_for(
+                        lambda: len(self._buffer) < self.capacity
+                        or self._closed,
+                        self.block_timeout,
+                    )
+                    or self._closed
+                ):
+                    self.dropped += 1
+                    return False
+            self._buffer.append(item)
+            self.emitted += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    async def aemit(self, record: Record) -> bool:
+        """
+        ``emit`` for coroutines. With the ``block`` policy the wait happens
+        in a worker thread so the event loop is never blocked.
+        """
+        if self.policy == "block":
+            return await asyncio.to_thread(self.emit, record)
+        return self.emit(record)
+
+    # Consumer side
+
+    @property
+    def path(self) -> str:
+        return self._file(0)
+
+    def _file(self, index: int) -> str:
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        name = self.prefix if index == 0 else f"{self.prefix}.{index}"
+        return os.path.join(self.directory, name + suffix)
+
+    def _take(self) -> List[Tuple[float, Record]]:
+        with self._cond:
+            count = min(len(self._buffer), self.batch_size)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            if batch:
+                self._cond.notify_all()
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= self.batch_size
+                    or self._closed,
+                    self.flush_interval,
+                )
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """Write everything currently buffered."""
+        with self._write_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    return
+                try:
+                    self._write(batch)
+                except Exception:
+                    self.failed += len(batch)
+                    logging.error(
+                        f"LogSink({self.prefix}): lost a batch of "
+                        f"{len(batch)} records.",
+                        exc_info=True,
+                    )
+
+    def _write(self, batch: List[Tuple[float, Record]]):
+        lines = []
+        for logged_at, record in batch:
+            try:
+                lines.append(self._line(logged_at, record))
+            except Exception:
+                self.failed += 1
+                logging.error(
+                    f"LogSink({self.prefix}): skipped a record that does "
+                    "not serialize.",
+                    exc_info=True,
+                )
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode()
+        if self.compress:
+            # Each batch is a complete gzip member; gzip readers
+            # transparently concatenate members.
+            data = gzip.compress(data, compresslevel=self.compresslevel)
+
+        path = self._file(0)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(path, "ab") as fh:
+            fh.write(data)
+        self.written += len(lines)
+
+    @staticmethod
+    def _line(logged_at: float, record: Record) -> str:
+        if isinstance(record, LogAIResponseObject):
+            body = record.model_dump_json()
+            return f'{{"logged_at":{logged_at!r},{body[1:]}'
+        return json.dumps({"logged_at": logged_at, **record}, default=str)
+
+    def _rotate(self):
+        if self.backup_count < 1:
+            os.remove(self._file(0))
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self._file(index)
+            if os.path.exists(source):
+                os.replace(source, self._file(index + 1))
+        os.replace(self._file(0), self._file(1))
+
+    def close(self):
+        """Stop the background thread and write whatever is buffered."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_lines(directory: str, prefix: str = "ai_responses") -> Iterator[str]:
+    """
+    Yield the raw JSON line of every record written by a ``LogSink``,
+    oldest file first. Compressed and plain files are both read.
+    """
+    files = []
+    for name in os.listdir(directory):
+        if not name.startswith(prefix + "."):
+            continue
+        middle = name.removeprefix(prefix).split(".")[1]
+        if middle == "jsonl":
+            index = 0
+        elif middle.isdigit():
+            index = int(middle)
+        else:
+            continue
+        files.append((index, os.path.join(directory, name)))
+
+    for _, path in sorted(files, reverse=True):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt") as fh:
+            for line in fh:
+                if line.strip():
+                    yield line
+
+
+def iter_records(
+    directory: str, prefix: str = "ai_responses"
+) -> Iterator[dict]:
+    """Yield every record written by a ``LogSink``, oldest file first."""
+    for line in iter_lines(directory, prefix):
+        yield json.loads(line)
+
+
+def benchmark(
+    size: Optional[int] = None, rate: int = 5000, directory: str = None
+) -> dict:
+    """
+    Measure the per-call cost of logging at ``rate`` calls per second,
+    comparing ``LogSink.emit`` with a synchronous JSON write per call.
+    ``size`` is the number of calls per mode (default 5 seconds worth).
+    """
+    import statistics
+    import tempfile
+
+    calls = size or rate * 5
+    record = LogAIResponseObject(
+        prompt_object={"prompt": "Summarize", "type": "summarizer"},
+        response={
+            "items": [{"id": i, "name": f"item {i}"} for i in range(20)]
+        },
+        response_time=1.25,
+        payload={"freetext": "hello"},
+        parsed_input="hello",
+    )
+
+    def paced(call) -> List[int]:
+        interval = 1e9 / rate
+        start = time.perf_counter_ns()
+        latencies = []
+        for i in range(calls):
+            deadline = start + i * interval
+            while time.perf_counter_ns() < deadline:
+                pass
+            before = time.perf_counter_ns()
+            call()
+            latencies.append(time.perf_counter_ns() - before)
+        return latencies
+
+    def summary(latencies: List[int]) -> dict:
+        ordered = sorted(latencies)
+        return {
+            "mean_ns": round(statistics.fmean(ordered), 1),
+            "p50_ns": ordered[len(ordered) // 2],
+            "p99_ns": ordered[int(len(ordered) * 0.99)],
+            "max_ns": ordered[-1],
+        }
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        sync_path = os.path.join(tmp, "sync.jsonl")
+        with open(sync_path, "a") as fh:
+
+            def sync_write():
+                fh.write(record.model_dump_json() + "\n")
+                fh.flush()
+
+            sync = paced(sync_write)
+
+        sink = LogSink(tmp, capacity=max(1000, rate))
+        buffered = paced(lambda: sink.emit(record))
+        start = time.perf_counter()
+        sink.close()
+        close_s = time.perf_counter() - start
+
+    return {
+        "config": {"calls": calls, "rate": rate},
+        "sync_write": summary(sync),
+        "sink_emit": summary(buffered),
+        "sink_written": sink.written,
+        "sink_dropped": sink.dropped,
+        "sink_close_s": close_s,
+    }
@@ -0,0 +1,326 @@
+"""
+Deep memory accounting for schema instances.
+
+``footprint`` walks an instance and everything it references, counting
+every object once, and reports where the bytes are:
+
+    fp = footprint(PositionSchema.model_validate(plan))
+    fp.total                      # bytes retained by the instance
+    fp.fields["positions[].role"] # bytes of every role string
+    fp.duplicate_strings          # bytes of strings equal to another one
+
+Field paths are dotted, ``[]`` stands for the items of a list and ``{}``
+for the keys and values of a dict; the path of a nested model is the cost
+of the instance itself (its ``__dict__``, fields set and extras), and
+``(self)`` that of the root. Objects shared with the rest of the process
+are not counted: enum members (``Countries``, ``Departments``...),
+``None``, booleans and small ints.
+
+``by_schema`` does the same for every live schema instance of the
+process, grouped by schema type. Nested models are counted under their
+own type, so the totals add up:
+
+    by_schema()["PositionSchema.Positions"]  # {"count", "total", "fields"...}
+
+``profile_allocations`` is the tracemalloc mode: it traces validation and
+serialization of a payload separately and reports what each phase keeps
+and allocates at peak, split between pydantic and the schema validators.
+"""
+
+import gc
+import sys
+import tracemalloc
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+_getsizeof = sys.getsizeof
+
+
+class Footprint:
+    def __init__(self):
+        self.total = 0
+        self.fields: Dict[str, int] = {}
+        self.objects = 0
+        self.strings = 0
+        self.duplicate_strings = 0
+        self.shared = 0
+
+    def as_dict(self, top: Optional[int] = None) -> dict:
+        fields = sorted(self.fields.items(), key=lambda f: -f[1])
+        return {
+            "total": self.total,
+            "objects": self.objects,
+            "strings": self.strings,
+            "duplicate_strings": self.duplicate_strings,
+            "shared_references": self.shared,
+            "fields": dict(fields[:top] if top else fields),
+        }
+
+    def __repr__(self):
+        return f"Footprint(total={self.total}, objects={self.objects})"
+
+
+def _shared(value: Any) -> bool:
+    """Objects that exist anyway, whoever references them."""
+    if value is None or value is True or value is False:
+        return True
+    if isinstance(value, (Enum, type)):
+        return True
+    return type(value) is int and -5 <= value <= 256
+
+
+class _Walker:
+    def __init__(self, stop_models: bool = False):
+        # Nested models are skipped when they are accounted on their own.
+        self.stop_models = stop_models
+        self.seen = set()
+        self.texts: Dict[str, int] = {}
+        self.nested: list = []
+
+    def walk(self, value: Any, path: str, fp: Footprint, root: bool = True):
+        if _shared(value):
+            fp.shared += 1
+            return
+        if id(value) in self.seen:
+            return
+        if isinstance(value, BaseModel) and not root and self.stop_models:
+            self.nested.append(value)
+            return
+        self.seen.add(id(value))
+        size = _getsizeof(value)
+        children: Iterable = ()
+        if isinstance(value, BaseModel):
+            size += _getsizeof(value.__dict__)
+            size += _getsizeof(value.__pydantic_fields_set__)
+            prefix = f"{path}." if path else ""
+            children = [
+                (item, prefix + name) for name, item in value.__dict__.items()
+            ]
+            extra = value.__pydantic_extra__
+            if extra is not None:
+                size += _getsizeof(extra)
+                children += [
+                    (item, prefix + str(name)) for name, item in extra.items()
+                ]
+            path = path or "(self)"
+        elif isinstance(value, str):
+            fp.strings += size
+            if value in self.texts and self.texts[value] != id(value):
+                fp.duplicate_strings += size
+            else:
+                self.texts[value] = id(value)
+        elif isinstance(value, dict):
+            children = [
+                (item, f"{path}{{}}")
+                for pair in value.items()
+                for item in pair
+            ]
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            children = [(item, f"{path}[]") for item in value]
+        fp.total += size
+        fp.objects += 1
+        fp.fields[path] = fp.fields.get(path, 0) + size
+        for child, child_path in children:
+            self.walk(child, child_path, fp, root=False)
+
+
+def footprint(instance: Any) -> Footprint:
+    """Deep retained size of ``instance``, by field path."""
+    fp = Footprint()
+    _Walker().walk(instance, "", fp)
+    return fp
+
+
+def live_instances(
+    predicate: Optional[Callable[[type], bool]] = None,
+) -> Iterable[BaseModel]:
+    """
+    The model instances alive in the process, by default those of the
+    schemas of this package.
+    """
+    if predicate is None:
+
+        def predicate(cls):
+            return cls.__module__.startswith("lucid_ai_schemas.")
+
+    for obj in gc.get_objects():
+        cls = type(obj)
+        if issubclass(cls, BaseModel) and predicate(cls):
+            yield obj
+
+
+def by_schema(
+    instances: Optional[Iterable[BaseModel]] = None, top: int = 10
+) -> Dict[str, dict]:
+    """
+    Count and retained bytes of every live schema instance (or of
+    ``instances``), by schema type, with the ``top`` fields of each type.
+    Objects referenced by several instances are counted once.
+    """
+    if instances is None:
+        instances = live_instances()
+    walker = _Walker(stop_models=True)
+    totals: Dict[type, Footprint] = {}
+    counts: Dict[type, int] = {}
+    for instance in instances:
+        pending = [instance]
+        while pending:
+            item = pending.pop()
+            if id(item) in walker.seen:
+                continue
+            cls = type(item)
+            fp = totals.get(cls)
+            if fp is None:
+                fp = totals[cls] = Footprint()
+            counts[cls] = counts.get(cls, 0) + 1
+            walker.walk(item, "", fp)
+            pending.extend(walker.nested)
+            walker.nested.clear()
+    report = {}
+    for cls, fp in sorted(totals.items(), key=lambda item: -item[1].total):
+        summary = fp.as_dict(top)
+        del summary["objects"], summary["shared_references"]
+        report[cls.__qualname__] = {"count": counts[cls], **summary}
+    return report
+
+
+def _category(filename: str) -> str:
+    path = filename.replace("\\", "/")
+    if "/lucid_ai_schemas/" in path:
+        return "schema validators"
+    if "/pydantic" in path:
+        return "pydantic"
+    if "/json/" in path:
+        return "json"
+    return "other"
+
+
+def _trace(func: Callable[[], Any], owned: bool) -> tuple:
+    """
+    Run ``func`` traced; its result and the allocation figures. The
+    traces and peak are reset only if tracing is ``owned``, not the
+    caller's.
+    """
+    gc.collect()
+    if owned:
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    start, start_peak = tracemalloc.get_traced_memory()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    by_category: Dict[str, int] = {}
+    for stat in after.compare_to(before, "filename"):
+        if stat.size_diff > 0:
+            category = _category(stat.traceback[0].filename)
+            by_category[category] = (
+                by_category.get(category, 0) + stat.size_diff
+            )
+    return result, {
+        "retained": current - start,
+        # Unknown if it stayed under a peak the caller reached before.
+        "peak": peak - start if owned or peak > start_peak else None,
+        "retained_by": by_category,
+    }
+
+
+def profile_allocations(model: type, payload: dict) -> dict:
+    """
+    Trace ``model_validate`` of ``payload``, then ``model_dump`` and
+    ``model_dump_json`` of the instance. ``retained`` is what a phase
+    keeps (the instance, the dump), ``peak`` its high-water mark above
+    the start, ``retained_by`` the retained bytes by allocating code.
+    Allocations inside pydantic-core are attributed to pydantic.
+
+    If tracemalloc is already tracing, its traces and peak are left
+    alone, and ``peak`` is None when it stayed under the earlier peak.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        instance, validation = _trace(
+            lambda: model.model_validate(payload), not tracing
+        )
+        dump, python = _trace(instance.model_dump, not tracing)
+        del dump
+        text, json_ = _trace(instance.model_dump_json, not tracing)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return {
+        "validation": validation,
+        "serialization": {"python": python, "json": json_},
+        "json_chars": len(text),
+        "footprint": footprint(instance).total,
+    }
+
+
+def benchmark(size: Optional[int] = None) -> dict:
+    """
+    Account a ``size``-position (default 10000) ``PositionSchema`` and an
+    ``ExplainerSchema`` with a year of daily transactions (``size`` in
+    total), then profile their validation and serialization.
+    """
+    import time
+
+    from lucid_ai_schemas.bench import SAMPLES
+    from lucid_ai_schemas.Schemas.schemas import (
+        ExplainerSchema,
+        PositionSchema,
+    )
+
+    size = size or 10000
+    per_day = max(1, size // 365)
+    transactions = [
+        {
+            "name": f"Vendor {t % 50}",
+            "date": f"2025-{1 + d // 31 % 12:02d}-{1 + d % 28:02d}",
+            "amount": float(t),
+        }
+        for d in range(365)
+        for t in range(per_day)
+    ]
+    explainer = {
+        "input": [
+            {
+                "name": "Operating expenses",
+                "date": "2025-12-31",
+                "total_value": 1000.0,
+                "transactions": transactions,
+            }
+        ]
+    }
+    payloads = {
+        "PositionSchema": (PositionSchema, SAMPLES["PositionSchema"](size)),
+        "ExplainerSchema": (ExplainerSchema, explainer),
+    }
+    results: Dict[str, Any] = {
+        "config": {"positions": size, "transactions": per_day * 365},
+        "schemas": {},
+    }
+    instances = []
+    for name, (model, payload) in payloads.items():
+        instance = model.model_validate(payload)
+        instances.append(instance)
+        start = time.perf_counter()
+        fp = footprint(instance)
+        walk_s = time.perf_counter() - start
+        items = size if model is PositionSchema else len(transactions)
+        results["schemas"][name] = {
+            "footprint": fp.as_dict(top=8),
+            "bytes_per_item": round(fp.total / items),
+            "footprint_s": walk_s,
+            "allocations": profile_allocations(model, payload),
+        }
+    start = time.perf_counter()
+    report = by_schema(instances)
+    results["by_schema"] = {
+        name: {key: row[key] for key in ("count", "total")}
+        for name, row in report.items()
+    }
+    results["by_schema_s"] = time.perf_counter() - start
+    return results
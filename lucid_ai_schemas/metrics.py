@@ -0,0 +1,599 @@
+"""
+Opt-in validation/serialization metrics for the schemas.
+
+Nothing is instrumented until ``enable()`` is called, so a disabled
+process runs the exact same code paths as if this module did not exist.
+
+    from lucid_ai_schemas import metrics
+
+    metrics.enable()
+    ...
+    metrics.snapshot()           # Python API
+    metrics.render_prometheus()  # Prometheus text exposition format
+    metrics.disable()
+
+When enabled, every schema in ``lucid_ai_schemas.Schemas.schemas`` records,
+per schema:
+
+* ``validate`` / ``validate_json`` / ``init`` / ``dump`` / ``dump_json``
+  call counts, latency histograms and validation errors,
+* payload sizes for the JSON paths (``validate_json`` input and
+  ``dump_json`` output),
+
+and per field validator (``validate_location``, ``normalize_department``,
+``validate_balance``...):
+
+* call counts and latency histograms,
+* coercions: the validator returned something other than its input,
+* fallbacks: the validator logged an error and substituted a default.
+
+Nested models validated as part of their parent are only counted under
+the parent; their field validators are counted under the model defining
+them.
+
+Only public attributes are touched: ``enable`` sets wrappers of the
+methods above on the schema classes, and ``disable`` removes them.
+Field validators are timed with a profile hook (``sys.setprofile``) that
+the validation wrappers install in the calling thread for the duration
+of the call, so validators run outside ``model_validate``,
+``model_validate_json`` and ``__init__`` are not counted. While another
+profiler (``cProfile``, a debugger) is active the hook stays off and
+only the operations are recorded.
+"""
+
+import dis
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from lucid_ai_schemas.introspect import module_models
+from lucid_ai_schemas.Schemas import schemas
+from lucid_ai_schemas.patching import Patch, install, patch, restore
+
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)  # fmt: skip
+SIZE_BUCKETS = (
+    100, 1000, 10000, 100000, 1000000, 10000000,
+)  # fmt: skip
+
+# Methods wrapped when enabled: attribute -> (operation, kind)
+_METHODS = {
+    "model_validate": ("validate", "class"),
+    "model_validate_json": ("validate_json", "class"),
+    "__init__": ("init", "instance"),
+    "model_dump": ("dump", "instance"),
+    "model_dump_json": ("dump_json", "instance"),
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram"):
+        """Add the observations of ``other`` (same buckets) to this one."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the ``q`` quantile; None when
+        empty, infinity when it falls past the last bucket.
+        """
+        if not self.count:
+            return None
+        rank, total = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, count)`` pairs as exposed by Prometheus."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            result.append((str(bound), total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class OperationStats:
+    __slots__ = ("latency", "errors", "payload_bytes")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.errors = 0
+        self.payload_bytes = Histogram(SIZE_BUCKETS)
+
+    def merge(self, other: "OperationStats"):
+        self.latency.merge(other.latency)
+        self.errors += other.errors
+        self.payload_bytes.merge(other.payload_bytes)
+
+
+class ValidatorStats:
+    __slots__ = ("latency", "coercions", "fallbacks")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.coercions = 0
+        self.fallbacks = 0
+
+    def merge(self, other: "ValidatorStats"):
+        self.latency.merge(other.latency)
+        self.coercions += other.coercions
+        self.fallbacks += other.fallbacks
+
+
+class _Shard:
+    """The observations of one thread."""
+
+    __slots__ = ("operations", "validators")
+
+    def __init__(self):
+        self.operations: Dict[Tuple[str, str], OperationStats] = {}
+        self.validators: Dict[Tuple[str, str], ValidatorStats] = {}
+
+
+def _merged(tables: Iterable[dict], new) -> dict:
+    merged: dict = {}
+    for table in tables:
+        for key, value in list(table.items()):
+            total = merged.get(key)
+            if total is None:
+                total = merged[key] = new()
+            total.merge(value)
+    return merged
+
+
+class MetricsRegistry:
+    """
+    Each thread records into its own shard, so observing never waits on
+    another thread; the lock only guards the list of shards, and the
+    shards are added up when reading.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._shards: List[_Shard] = []
+        self._local = threading.local()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self.lock:
+                self._shards.append(shard)
+        return shard
+
+    @property
+    def operations(self) -> Dict[Tuple[str, str], OperationStats]:
+        """Every thread's operation stats, added up."""
+        with self.lock:
+            shards = list(self._shards)
+        return _merged((s.operations for s in shards), OperationStats)
+
+    @property
+    def validators(self) -> Dict[Tuple[str, str], ValidatorStats]:
+        """Every thread's validator stats, added up."""
+        with self.lock:
+            shards = list(self._shards)
+        return _merged((s.validators for s in shards), ValidatorStats)
+
+    def reset(self):
+        with self.lock:
+            for shard in self._shards:
+                shard.operations.clear()
+                shard.validators.clear()
+
+    def observe_operation(
+        self,
+        schema: str,
+        operation: str,
+        seconds: float,
+        error: bool = False,
+        size: Optional[int] = None,
+    ):
+        operations = self._shard().operations
+        stats = operations.get((schema, operation))
+        if stats is None:
+            stats = operations[(schema, operation)] = OperationStats()
+        stats.latency.observe(seconds)
+        stats.errors += error
+        if size is not None:
+            stats.payload_bytes.observe(size)
+
+    def observe_validator(
+        self,
+        schema: str,
+        validator: str,
+        seconds: float,
+        coerced: bool,
+        fallback: bool,
+    ):
+        validators = self._shard().validators
+        stats = validators.get((schema, validator))
+        if stats is None:
+            stats = validators[(schema, validator)] = ValidatorStats()
+        stats.latency.observe(seconds)
+        stats.coercions += coerced
+        stats.fallbacks += fallback
+
+    def snapshot(self) -> dict:
+        operations, validators = self.operations, self.validators
+        return {
+            "operations": {
+                f"{schema}.{operation}": {
+                    "latency_seconds": stats.latency.to_dict(),
+                    "errors": stats.errors,
+                    "payload_bytes": stats.payload_bytes.to_dict(),
+                }
+                for (schema, operation), stats in operations.items()
+            },
+            "validators": {
+                f"{schema}.{validator}": {
+                    "latency_seconds": stats.latency.to_dict(),
+                    "coercions": stats.coercions,
+                    "fallbacks": stats.fallbacks,
+                }
+                for (schema, validator), stats in validators.items()
+            },
+        }
+
+    def render_prometheus(self, prefix: str = "lucid_schema") -> str:
+        lines: List[str] = []
+
+        def histogram(name, help_, series):
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for labels, hist in series:
+                for le, count in hist.cumulative():
+                    lines.append(
+                        f'{prefix}_{name}_bucket{{{labels},le="{le}"}} '
+                        f"{count}"
+                    )
+                lines.append(f"{prefix}_{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{prefix}_{name}_count{{{labels}}} {hist.count}")
+
+        def counter(name, help_, series):
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in series:
+                lines.append(f"{prefix}_{name}{{{labels}}} {value}")
+
+        operations = sorted(
+            (f'schema="{s}",operation="{o}"', stats)
+            for (s, o), stats in self.operations.items()
+        )
+        validators = sorted(
+            (f'schema="{s}",validator="{v}"', stats)
+            for (s, v), stats in self.validators.items()
+        )
+        histogram(
+            "operation_seconds",
+            "Latency of schema validation and serialization calls.",
+            [(labels, stats.latency) for labels, stats in operations],
+        )
+        counter(
+            "operation_errors_total",
+            "Schema calls that raised a ValidationError.",
+            [(labels, stats.errors) for labels, stats in operations],
+        )
+        histogram(
+            "payload_bytes",
+            "Size of JSON payloads validated or produced.",
+            [
+                (labels, stats.payload_bytes)
+                for labels, stats in operations
+                if stats.payload_bytes.count
+            ],
+        )
+        histogram(
+            "validator_seconds",
+            "Latency of field validators.",
+            [(labels, stats.latency) for labels, stats in validators],
+        )
+        counter(
+            "validator_coercions_total",
+            "Field validator calls that changed their input.",
+            [(labels, stats.coercions) for labels, stats in validators],
+        )
+        counter(
+            "validator_fallbacks_total",
+            "Field validator calls that fell back to a default.",
+            [(labels, stats.fallbacks) for labels, stats in validators],
+        )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+_local = threading.local()
+
+
+class _FallbackCounter(logging.Filter):
+    """
+    Counts the errors the schema validators log right before falling
+    back to a default value. Never filters anything out.
+    """
+
+    def filter(self, record):
+        if (
+            record.levelno >= logging.ERROR
+            and record.pathname == schemas.__file__
+        ):
+            _local.fallbacks = getattr(_local, "fallbacks", 0) + 1
+        return True
+
+
+_fallback_counter = _FallbackCounter()
+# model -> methods wrapped by enable()
+_patched: Dict[type, List[Patch]] = {}
+# Profile hook timing the field validators, set by enable().
+_profile = None
+# Serializes enable() and disable().
+_lock = threading.Lock()
+
+
+def schema_models(module=schemas) -> List[type]:
+    """
+    Every pydantic model of ``module``, nested models before the models
+    that contain them (see ``introspect.module_models``).
+    """
+    return module_models(module)
+
+
+def _wrap_method(found: Patch):
+    operation, kind = _METHODS[found.attribute]
+    schema = found.model.__qualname__
+    attribute = found.attribute
+    registry = REGISTRY
+    # Field validators only run in these.
+    profiled = operation in ("validate", "validate_json", "init")
+
+    if kind == "class":
+
+        def wrapper(cls, data, *args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            profile = _profile if sys.getprofile() is None else None
+            if profile is not None:
+                sys.setprofile(profile)
+            try:
+                return found.call(cls, data, *args, **kwargs)
+            except ValidationError:
+                error = True
+                raise
+            finally:
+                if profile is not None:
+                    sys.setprofile(None)
+                size = len(data) if operation == "validate_json" else None
+                registry.observe_operation(
+                    cls.__qualname__,
+                    operation,
+                    time.perf_counter() - start,
+                    error,
+                    size,
+                )
+
+        return classmethod(wrapper)
+
+    def method(self, *args, **kwargs):
+        start = time.perf_counter()
+        error = False
+        result = None
+        profile = None
+        if profiled and sys.getprofile() is None:
+            profile = _profile
+        if profile is not None:
+            sys.setprofile(profile)
+        try:
+            result = found.call(self, *args, **kwargs)
+            return result
+        except ValidationError:
+            error = True
+            raise
+        finally:
+            if profile is not None:
+                sys.setprofile(None)
+            size = len(result) if operation == "dump_json" else None
+            registry.observe_operation(
+                type(self).__qualname__,
+                operation,
+                time.perf_counter() - start,
+                error,
+                size if result is not None else None,
+            )
+
+    method.__name__ = attribute
+    method.__qualname__ = f"{schema}.{attribute}"
+    return method
+
+
+def _validator_codes(models: Iterable[type]) -> Dict[object, Tuple[str, str]]:
+    """
+    The code of the methods ``models`` define in their own module (the
+    field validators, the only ones pydantic runs while validating):
+    ``code -> (schema, method)``.
+    """
+    codes = {}
+    for model in models:
+        for name, value in list(vars(model).items()):
+            func = getattr(value, "__func__", value)
+            code = getattr(func, "__code__", None)
+            if code is not None and func.__module__ == model.__module__:
+                codes[code] = (model.__qualname__, name)
+    return codes
+
+
+_RETURNS = frozenset(
+    dis.opmap[name]
+    for name in ("RETURN_VALUE", "RETURN_CONST")
+    if name in dis.opmap
+)
+
+
+def _profiler(codes: Dict[object, Tuple[str, str]]):
+    """
+    The profile hook timing the validators in ``codes``: their input is
+    their second argument (after ``cls``), their result what they return.
+    Calls that raise are not recorded, like with the operations.
+    """
+    registry = REGISTRY
+    perf_counter = time.perf_counter
+    # frame -> (fallbacks before, input, start); frames are per thread.
+    running: dict = {}
+
+    def profile(frame, event, arg):
+        if event == "call":
+            code = frame.f_code
+            if code in codes:
+                value = None
+                if code.co_argcount > 1:
+                    value = frame.f_locals.get(code.co_varnames[1])
+                fallbacks = getattr(_local, "fallbacks", 0)
+                running[frame] = (fallbacks, value, perf_counter())
+        elif event == "return" and frame in running:
+            fallbacks, value, start = running.pop(frame)
+            seconds = perf_counter() - start
+            # None is also what a frame left by an exception returns.
+            code = frame.f_code
+            if arg is None and code.co_code[frame.f_lasti] not in _RETURNS:
+                return
+            schema, name = codes[code]
+            registry.observe_validator(
+                schema,
+                name,
+                seconds,
+                coerced=arg is not value and arg != value,
+                fallback=getattr(_local, "fallbacks", 0) != fallbacks,
+            )
+
+    return profile
+
+
+def enabled() -> bool:
+    return bool(_patched)
+
+
+def enable(models: Optional[Iterable[type]] = None):
+    """
+    Instrument ``models`` (default: every schema): their public
+    validation and serialization methods are wrapped, and the field
+    validators they define are timed by a profile hook (see the module).
+    """
+    global _profile
+    with _lock:
+        if enabled():
+            return
+        models = list(models) if models is not None else schema_models()
+        _profile = _profiler(_validator_codes(models))
+        # Every method is looked up before any is wrapped.
+        for model in models:
+            _patched[model] = [patch(model, a) for a in _METHODS]
+        for patches in _patched.values():
+            for found in patches:
+                install(found, _wrap_method(found))
+        logging.getLogger().addFilter(_fallback_counter)
+
+
+def disable():
+    """Remove every wrapper installed by ``enable``."""
+    global _profile
+    with _lock:
+        if not enabled():
+            return
+        logging.getLogger().removeFilter(_fallback_counter)
+        for patches in _patched.values():
+            for found in patches:
+                restore(found)
+        _patched.clear()
+        _profile = None
+
+
+@contextmanager
+def instrumented(models: Optional[Iterable[type]] = None):
+    enable(models)
+    try:
+        yield REGISTRY
+    finally:
+        disable()
+
+
+def snapshot() -> dict:
+    return REGISTRY.snapshot()
+
+
+def render_prometheus(prefix: str = "lucid_schema") -> str:
+    return REGISTRY.render_prometheus(prefix)
+
+
+def reset():
+    REGISTRY.reset()
+
+
+def benchmark(size: Optional[int] = None, number: int = 200) -> dict:
+    """
+    Validate a ``PositionSchema`` with ``size`` positions (default 100)
+    before enabling, while enabled and after disabling the metrics.
+    """
+    from lucid_ai_schemas.bench import SAMPLES, _per_call
+
+    size = size or 100
+    payload = SAMPLES["PositionSchema"](size)
+    model = schemas.PositionSchema
+
+    def measure():
+        return _per_call(
+            lambda: model.model_validate(payload), number, repeat=5
+        )
+
+    logging.disable(logging.CRITICAL)
+    try:
+        never_enabled = measure()
+        with instrumented():
+            enabled_ = measure()
+        disabled = measure()
+        reset()
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        "config": {"positions": size, "number": number},
+        "never_enabled": never_enabled,
+        "enabled": enabled_,
+        "disabled_after_enable": disabled,
+        "disabled_overhead_ratio": round(
+            disabled["median_ns"] / never_enabled["median_ns"], 3
+        ),
+        "enabled_overhead_ratio": round(
+            enabled_["median_ns"] / never_enabled["median_ns"], 3
+        ),
+    }
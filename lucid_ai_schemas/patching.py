@@ -0,0 +1,91 @@
+"""
+Wrapping model methods so that several tools can stack their wrappers.
+
+``metrics`` and ``compact`` both wrap ``model_validate``, ``__init__``...
+on the schemas. Each wrapper calls whatever was installed before it
+(pydantic's method, an override of the schema, or the wrapper of the
+other tool), and removing a wrapper puts back exactly what it replaced,
+whatever the order the tools are enabled and disabled in:
+
+    found = patch(model, "model_validate")
+    install(found, classmethod(lambda cls, data: found.call(cls, data)))
+    ...
+    restore(found)
+"""
+
+import threading
+from typing import Any, Callable, List
+
+_MISSING = object()
+# Installed patches, to unlink a wrapper another one was stacked on.
+_installed: List["Patch"] = []
+_lock = threading.Lock()
+
+
+class Patch:
+    __slots__ = (
+        "model",
+        "attribute",
+        "original",
+        "call",
+        "previous",
+        "wrapper",
+    )
+
+    def __init__(self, model: type, attribute: str):
+        self.model = model
+        self.attribute = attribute
+        # What the model resolves the attribute to, as stored in a class.
+        self.original = _resolve(model, attribute)
+        # The function the wrapper calls: ``call(cls or self, ...)``.
+        self.call: Callable[..., Any] = _function(self.original)
+        # What the model itself held, put back by ``restore``.
+        self.previous = vars(model).get(attribute, _MISSING)
+        self.wrapper = None
+
+
+def _resolve(model: type, attribute: str):
+    for klass in model.__mro__:
+        if attribute in vars(klass):
+            return vars(klass)[attribute]
+    raise AttributeError(f"{model.__name__} has no attribute {attribute}")
+
+
+def _function(raw) -> Callable[..., Any]:
+    return getattr(raw, "__func__", raw)
+
+
+def patch(model: type, attribute: str) -> Patch:
+    """
+    What ``model.attribute`` is now, to be wrapped. Take every patch of
+    a batch before installing any, so that a model does not wrap the
+    wrapper just installed on its base class.
+    """
+    return Patch(model, attribute)
+
+
+def install(found: Patch, wrapper):
+    """Set ``wrapper`` (a function or a classmethod) on the model."""
+    with _lock:
+        found.wrapper = wrapper
+        setattr(found.model, found.attribute, wrapper)
+        _installed.append(found)
+
+
+def restore(found: Patch):
+    """Remove the wrapper of ``found``, keeping any stacked on top of it."""
+    with _lock:
+        _installed.remove(found)
+        model, attribute = found.model, found.attribute
+        if vars(model).get(attribute, _MISSING) is found.wrapper:
+            if found.previous is _MISSING:
+                delattr(model, attribute)
+            else:
+                setattr(model, attribute, found.previous)
+        # Wrappers that call this one call what it called instead.
+        for other in _installed:
+            if other.original is found.wrapper:
+                other.original = found.original
+                other.call = _function(found.original)
+            if other.previous is found.wrapper:
+                other.previous = found.previous
@@ -0,0 +1,369 @@
+"""
+Series materialization for the plots of ``PlotCollectionResponse``.
+
+Needs NumPy (``pip install lucid_ai_schemas[numpy]``). The formula time
+series are loaded once into a ``SeriesTable``, one row per formula over a
+shared calendar; ``PlotEngine`` then materializes every plot of a
+response in one batched pass:
+
+    table = SeriesTable.from_series({7: {"2025-01-01": 10.0, ...}, ...})
+    engine = PlotEngine(table)
+    charts = engine.materialize(response)   # one Chart per plot
+    charts[0].dates, charts[0].series, charts[0].data["top"]
+
+Every distinct ``time_period`` ("YYYY-MM-DD:YYYY-MM-DD", both ends
+included, any format ``parse_date`` reads) is parsed once into calendar
+columns. The series of every (formula, period) pair used by the plots
+are cut out of the table together, one slice per period, and cached with
+their totals, so plots sharing formulas and periods (and later calls)
+reuse them. A plot without ``time_period`` covers the whole calendar.
+
+``Chart.series`` is always formulas x dates (NaN where a formula has no
+value). ``Chart.data`` depends on the layout of the ``GraphType``:
+
+* ``series`` (Area, Bar, Line): nothing more.
+* ``stacked`` (Stacked): ``top``, the cumulative sums drawn, and
+  ``base``, where each band starts (missing values count as 0).
+* ``combo`` (BarCombo): ``bars``, all formulas but the last, and
+  ``line``, the last one.
+* ``stacked_combo`` (StackedCombo, GroupedStackedCombo): the stacked
+  bars of all formulas but the last, and ``line``.
+* ``donut``: ``totals`` over the period and their ``shares``.
+* ``ranked`` (rankedList): ``order``, the formula ids by total,
+  highest first, and their ``totals``.
+* ``scorecard`` (Scorecard): the last ``value`` of every formula and its
+  ``change`` since the start of the period.
+
+Formulas missing from the table are left out and listed in
+``Chart.missing``.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+from typing import Sequence, Tuple, Union
+
+from lucid_ai_schemas.Schemas.dates import parse_date
+from lucid_ai_schemas.Schemas.schemas import GraphType, PlotCollectionResponse
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+Plot = PlotCollectionResponse.Plot
+
+LAYOUTS: Dict[GraphType, str] = {
+    GraphType.Area: "series",
+    GraphType.Bar: "series",
+    GraphType.Line: "series",
+    GraphType.BarCombo: "combo",
+    GraphType.Stacked: "stacked",
+    GraphType.StackedCombo: "stacked_combo",
+    GraphType.GroupedStackedCombo: "stacked_combo",
+    GraphType.donut: "donut",
+    GraphType.rankedList: "ranked",
+    GraphType.Scorecard: "scorecard",
+}
+
+
+def _numpy():
+    if np is None:  # pragma: no cover
+        raise ImportError(
+            "lucid_ai_schemas.plots needs NumPy: "
+            "pip install lucid_ai_schemas[numpy]"
+        )
+    return np
+
+
+class SeriesTable:
+    def __init__(self, ids: Sequence[int], dates, values):
+        """
+        ``values`` is a formulas x dates float matrix (NaN for no value),
+        ``ids`` the formula of every row and ``dates`` the sorted
+        calendar of the columns.
+        """
+        _numpy()
+        self.ids = list(ids)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.values = np.asarray(values, dtype=float)
+        self.rows = {formula_id: row for row, formula_id in enumerate(ids)}
+        if self.values.shape != (len(self.ids), len(self.dates)):
+            raise ValueError(
+                f"Invalid values: shape {self.values.shape}, expected "
+                f"{(len(self.ids), len(self.dates))}."
+            )
+        if len(self.rows) != len(self.ids):
+            raise ValueError("Invalid ids: duplicate formula ids.")
+        if np.any(self.dates[1:] <= self.dates[:-1]):
+            raise ValueError("Invalid dates: must be sorted and unique.")
+
+    @classmethod
+    def from_series(
+        cls, series: Mapping[int, Mapping[Any, float]]
+    ) -> "SeriesTable":
+        """
+        ``{formula id: {date: value}}`` on the union of their dates;
+        dates may be anything ``parse_date`` reads.
+        """
+        _numpy()
+        parsed = {
+            formula_id: {
+                parse_date(day): value for day, value in points.items()
+            }
+            for formula_id, points in series.items()
+        }
+        calendar = sorted(
+            {day for points in parsed.values() for day in points}
+        )
+        columns = {day: column for column, day in enumerate(calendar)}
+        values = np.full((len(parsed), len(calendar)), np.nan)
+        for row, points in enumerate(parsed.values()):
+            values[row, [columns[day] for day in points]] = list(
+                points.values()
+            )
+        return cls(list(parsed), calendar, values)
+
+
+class Chart(NamedTuple):
+    name: Optional[str]
+    type: GraphType
+    layout: str
+    formulas: List[int]
+    dates: Any
+    series: Any
+    data: Dict[str, Any]
+    missing: List[int]
+
+
+class PlotEngine:
+    def __init__(self, table: SeriesTable):
+        self.table = table
+        self._periods: Dict[Optional[str], Tuple[int, int]] = {}
+        # (formula id, start, stop) -> (series, total, first, last)
+        self._cache: Dict[Tuple[int, int, int], tuple] = {}
+
+    def period(self, time_period: Optional[str]) -> Tuple[int, int]:
+        """The calendar columns ``[start, stop)`` of ``time_period``."""
+        bounds = self._periods.get(time_period)
+        if bounds is None:
+            dates = self.table.dates
+            if time_period is None:
+                bounds = (0, len(dates))
+            else:
+                start, sep, end = time_period.partition(":")
+                try:
+                    first, last = parse_date(start), parse_date(end)
+                except ValueError:
+                    first = last = None
+                if not sep or first is None or first > last:
+                    raise ValueError(
+                        f"Invalid time_period: {time_period}. "
+                        "Must be YYYY-MM-DD:YYYY-MM-DD, start before end."
+                    )
+                bounds = (
+                    int(np.searchsorted(dates, np.datetime64(first, "D"))),
+                    int(
+                        np.searchsorted(
+                            dates, np.datetime64(last, "D"), side="right"
+                        )
+                    ),
+                )
+            self._periods[time_period] = bounds
+        return bounds
+
+    def clear(self):
+        self._periods.clear()
+        self._cache.clear()
+
+    def _load(self, wanted: Dict[Tuple[int, int], List[int]]):
+        """Cut and cache the series of ``{(start, stop): formula ids}``."""
+        rows, values = self.table.rows, self.table.values
+        for (start, stop), formula_ids in wanted.items():
+            block = values[[rows[f] for f in formula_ids], start:stop]
+            totals = np.nansum(block, axis=1)
+            if stop > start:
+                first, last = block[:, 0], block[:, -1]
+            else:
+                first = last = np.full(len(formula_ids), np.nan)
+            for i, formula_id in enumerate(formula_ids):
+                self._cache[formula_id, start, stop] = (
+                    block[i],
+                    totals[i],
+                    first[i],
+                    last[i],
+                )
+
+    def materialize(
+        self, plots: Union[PlotCollectionResponse, Iterable[Plot]]
+    ) -> List[Chart]:
+        """The ``Chart`` of every plot, in order."""
+        _numpy()
+        if isinstance(plots, PlotCollectionResponse):
+            plots = plots.plots or []
+        plots = list(plots)
+        rows, cache = self.table.rows, self._cache
+        bounds = [self.period(plot.time_period) for plot in plots]
+        wanted: Dict[Tuple[int, int], List[int]] = {}
+        for plot, (start, stop) in zip(plots, bounds):
+            for formula_id in plot.formulas or ():
+                key = (formula_id, start, stop)
+                if formula_id in rows and key not in cache:
+                    pending = wanted.setdefault((start, stop), [])
+                    if formula_id not in pending:
+                        pending.append(formula_id)
+        self._load(wanted)
+        return [
+            self._chart(plot, start, stop)
+            for plot, (start, stop) in zip(plots, bounds)
+        ]
+
+    def _chart(self, plot: Plot, start: int, stop: int) -> Chart:
+        graph = plot.type or GraphType.Bar
+        layout = LAYOUTS[graph]
+        formulas, missing, parts = [], [], []
+        for formula_id in plot.formulas or ():
+            part = self._cache.get((formula_id, start, stop))
+            if part is None:
+                missing.append(formula_id)
+            else:
+                formulas.append(formula_id)
+                parts.append(part)
+        if parts:
+            series = np.stack([part[0] for part in parts])
+        else:
+            series = np.empty((0, stop - start))
+        totals = np.array([part[1] for part in parts], dtype=float)
+        data: Dict[str, Any] = {}
+        if layout in ("stacked", "stacked_combo"):
+            bars = series[:-1] if layout == "stacked_combo" else series
+            top = np.cumsum(np.nan_to_num(bars), axis=0)
+            data["top"] = top
+            data["base"] = top - np.nan_to_num(bars)
+        if layout in ("combo", "stacked_combo"):
+            if layout == "combo":
+                data["bars"] = series[:-1]
+            data["line"] = series[-1] if parts else series[:0]
+        elif layout == "donut":
+            total = totals.sum()
+            data["totals"] = totals
+            data["shares"] = totals / total if total else totals * 0
+        elif layout == "ranked":
+            order = np.argsort(-totals, kind="stable")
+            data["order"] = [formulas[i] for i in order]
+            data["totals"] = totals[order]
+        elif layout == "scorecard":
+            first = np.array([part[2] for part in parts], dtype=float)
+            data["value"] = np.array([part[3] for part in parts], dtype=float)
+            data["change"] = data["value"] - first
+        return Chart(
+            plot.name,
+            graph,
+            layout,
+            formulas,
+            self.table.dates[start:stop],
+            series,
+            data,
+            missing,
+        )
+
+
+def python_chart(plot: Plot, series: Mapping[int, Mapping[str, float]]):
+    """
+    Dates, rows and totals of ``plot`` the per-plot way, from ISO dated
+    ``series`` (reference).
+    """
+    used = [series[f] for f in plot.formulas or () if f in series]
+    dates = sorted({day for points in used for day in points})
+    if plot.time_period:
+        start, _, end = plot.time_period.partition(":")
+        first = parse_date(start).isoformat()
+        last = parse_date(end).isoformat()
+        dates = [day for day in dates if first <= day <= last]
+    rows, totals = [], []
+    for formula_id in plot.formulas or ():
+        points = series.get(formula_id)
+        if points is None:
+            continue
+        row = [points.get(day, float("nan")) for day in dates]
+        rows.append(row)
+        totals.append(sum(value for value in row if value == value))
+    return dates, rows, totals
+
+
+def benchmark(size: Optional[int] = None, formulas: int = 500) -> dict:
+    """
+    Materialize a dashboard of ``size`` (default 500) plots, of every
+    ``GraphType``, over ``formulas`` formulas with two years of daily
+    values: the per-plot Python loop against the engine, cold (empty
+    cache) and warm (the same dashboard again).
+    """
+    import random
+    import time
+    from datetime import date, timedelta
+
+    _numpy()
+    size = size or 500
+    rng = random.Random(0)
+    days = [
+        (date(2024, 1, 1) + timedelta(days=d)).isoformat() for d in range(731)
+    ]
+    series = {
+        formula_id: {day: rng.uniform(0, 1000) for day in days}
+        for formula_id in range(formulas)
+    }
+    periods = [
+        f"{year}-{month:02d}-01:{year}-{month + 2:02d}-28"
+        for year in (2024, 2025)
+        for month in (1, 4, 7, 10)
+    ] + ["2024-01-01:2025-12-31"]
+    graph_types = list(GraphType)
+    response = PlotCollectionResponse(
+        plots=[
+            {
+                "name": f"Plot {i}",
+                "type": graph_types[i % len(graph_types)],
+                "time_period": rng.choice(periods),
+                "formulas": rng.sample(range(formulas), rng.randint(1, 6)),
+            }
+            for i in range(size)
+        ]
+    )
+
+    start = time.perf_counter()
+    reference = [python_chart(plot, series) for plot in response.plots]
+    python_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = SeriesTable.from_series(series)
+    load_s = time.perf_counter() - start
+    engine = PlotEngine(table)
+    start = time.perf_counter()
+    charts = engine.materialize(response)
+    cold_s = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.materialize(response)
+    warm_s = time.perf_counter() - start
+
+    mismatches = sum(
+        not (
+            len(chart.dates) == len(dates)
+            and np.allclose(chart.series, rows or np.empty(chart.series.shape))
+            and np.allclose(np.nansum(chart.series, axis=1), totals)
+        )
+        for chart, (dates, rows, totals) in zip(charts, reference)
+    )
+    return {
+        "config": {
+            "plots": size,
+            "formulas": formulas,
+            "days": len(days),
+            "periods": len(periods),
+        },
+        "python_loop_s": python_s,
+        "load_s": load_s,
+        "engine_cold_s": cold_s,
+        "engine_warm_s": warm_s,
+        "speedup_cold": round(python_s / cold_s, 1),
+        "speedup_warm": round(python_s / warm_s, 1),
+        "cached_series": len(engine._cache),
+        "mismatches": mismatches,
+    }
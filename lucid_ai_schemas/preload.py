@@ -0,0 +1,204 @@
+"""
+Copy-on-write friendly preloading for pre-forked workers.
+
+Call ``preload()`` in the master process, after importing the schemas
+and before forking:
+
+    from lucid_ai_schemas import preload
+    preload.preload()
+    # ... fork the workers (gunicorn --preload, multiprocessing fork...)
+
+It builds everything the workers would otherwise build lazily, each in
+its own private memory, for every model of the schema module's registry
+(``schemas.schema_models``): validators and serializers, the JSON
+schemas (served afterwards by ``json_schema``), the enum lookup tables
+and the trusted constructors. Sample payloads, when given, are run once
+through validation, serialization and trusted construction to warm
+their lazy paths too. It then moves every object to the permanent GC
+generation (``gc.freeze``), so collections in the workers no longer
+write to the headers of the shared objects and their pages stay shared.
+
+``measure_uss`` forks workers running a schema workload and reports
+their unique set size (memory private to each worker), with and without
+preloading. Linux only, it reads ``/proc/<pid>/smaps_rollup``.
+"""
+
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from lucid_ai_schemas.Schemas import schemas
+from lucid_ai_schemas.caches import Memo
+
+
+@Memo
+def _json_schema(model: type) -> Tuple[dict, str]:
+    schema = model.model_json_schema()
+    return schema, json.dumps(schema)
+
+
+def json_schema(model: type, copy: bool = True) -> dict:
+    """
+    ``model.model_json_schema()``, generated once per process.
+
+    Returns a fresh copy (parsed back from the cached JSON text, cheaper
+    than a deep copy), so callers can modify it. With ``copy=False``
+    returns the cached dict itself, which must not be modified.
+    """
+    schema, text = _json_schema(model)
+    return json.loads(text) if copy else schema
+
+
+def preload(
+    freeze: bool = True, samples: Optional[Dict[type, Any]] = None
+) -> dict:
+    """
+    Build every validator, serializer, JSON schema and lookup index of
+    the schemas, then ``gc.freeze()`` (unless ``freeze`` is False).
+    ``samples`` maps models to a payload each, validated, dumped and
+    trusted-constructed once. Returns what was built.
+    """
+    from lucid_ai_schemas.introspect import field_kinds
+    from lucid_ai_schemas.trusted import _builders, construct
+
+    start = time.perf_counter()
+    models = schemas.schema_models()
+    for model in models:
+        if not model.__pydantic_complete__:
+            model.model_rebuild(force=True)
+        field_kinds(model)
+        _builders[model]
+        if "." not in model.__qualname__:
+            _json_schema(model)
+    enums = 0
+    for value in vars(schemas).values():
+        if isinstance(value, type) and issubclass(value, schemas.Enum):
+            # Resolve every value once so lookups hit the built tables.
+            for member in value:
+                value(member.value)
+            enums += 1
+    for model, payload in (samples or {}).items():
+        instance = model.model_validate(payload)
+        instance.model_dump_json()
+        construct(model, instance.model_dump(mode="json"))
+    gc.collect()
+    if freeze:
+        gc.freeze()
+    return {
+        "models": len(models),
+        "json_schemas": len(_json_schema),
+        "samples": len(samples or ()),
+        "enums": enums,
+        "frozen_objects": gc.get_freeze_count(),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def uss(pid: Optional[int] = None) -> int:
+    """Unique set size of ``pid`` (default: this process), in bytes."""
+    path = f"/proc/{pid or 'self'}/smaps_rollup"
+    if not os.path.exists(path):
+        raise RuntimeError(f"Cannot measure USS: {path} does not exist.")
+    total = 0
+    with open(path) as fh:
+        for line in fh:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def _workload(rounds: int):
+    """What a worker does with the schemas: validate, dump, serve schemas."""
+    from lucid_ai_schemas.bench import SAMPLES, schema_classes
+
+    for _ in range(rounds):
+        for name, model in schema_classes().items():
+            model.model_validate(SAMPLES[name](10)).model_dump_json()
+            json_schema(model)
+    gc.collect()
+
+
+def _uss_probe(preloaded: bool, workers: int, rounds: int):  # pragma: no cover
+    """
+    Fork ``workers`` after an optional ``preload()``, run the workload in
+    each and print their USS as JSON. Runs in a fresh interpreter.
+    """
+    if preloaded:
+        from lucid_ai_schemas.bench import SAMPLES, schema_classes
+
+        preload(
+            samples={
+                model: SAMPLES[name](1)
+                for name, model in schema_classes().items()
+            }
+        )
+    pipes = []
+    for _ in range(workers):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            _workload(rounds)
+            os.write(write, str(uss()).encode())
+            os._exit(0)
+        os.close(write)
+        pipes.append((pid, read))
+    sizes = []
+    for pid, read in pipes:
+        with os.fdopen(read) as fh:
+            sizes.append(int(fh.read()))
+        os.waitpid(pid, 0)
+    print(json.dumps({"master_uss": uss(), "workers_uss": sizes}))
+
+
+_PROBE = """\
+from lucid_ai_schemas import preload
+preload._uss_probe({preloaded}, {workers}, {rounds})
+"""
+
+
+def measure_uss(workers: int = 4, rounds: int = 5) -> Dict[str, dict]:
+    """Per-worker USS without and with ``preload()``, in fresh processes."""
+    # Make the package importable from the probe wherever we run from.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": path}
+    results = {}
+    for preloaded in (False, True):
+        code = _PROBE.format(
+            preloaded=preloaded, workers=workers, rounds=rounds
+        )
+        probe = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if probe.returncode:
+            raise RuntimeError(f"USS probe failed:\n{probe.stderr}")
+        results["preload" if preloaded else "baseline"] = json.loads(
+            probe.stdout
+        )
+    return results
+
+
+def benchmark(size: Optional[int] = None) -> dict:
+    """Mean per-worker USS of ``size`` (default 4) forked workers."""
+    workers = size or 4
+    results = measure_uss(workers)
+    summary = {"config": {"workers": workers}}
+    for mode, result in results.items():
+        sizes = result["workers_uss"]
+        summary[mode] = {
+            "worker_uss_mb": sum(sizes) / len(sizes) / 2**20,
+            "master_uss_mb": result["master_uss"] / 2**20,
+        }
+    summary["saved_per_worker_mb"] = (
+        summary["baseline"]["worker_uss_mb"]
+        - summary["preload"]["worker_uss_mb"]
+    )
+    return summary
@@ -0,0 +1,296 @@
+"""
+Vectorized revenue and unit economics for ``ProductGeneratorOutput``.
+
+Needs NumPy (``pip install lucid_ai_schemas[numpy]``). The products of one
+output, or of a batch of outputs across companies, are loaded into
+columns once, then every metric is computed on whole arrays:
+
+    batch = ProductBatch.from_outputs(outputs)   # one output per company
+    metrics = product_metrics(batch)
+    metrics["mrr"], metrics["yoy_growth"], metrics["cac_payback_months"]
+    company_totals(batch, metrics)["arr"]        # one value per company
+
+Prices are normalized to a monthly price by subscription type
+(``MONTHLY_PRICE``): yearly subscriptions are billed ``price`` a year,
+monthly ones (and "Monthly & Yearly", quoted monthly) ``price`` a month.
+One time purchases have no recurring revenue.
+
+Per product:
+
+* ``monthly_price``: the price per month, 0 for one time purchases.
+* ``mrr``: ``monthly_price * amount_sold_last_m``; ``arr`` is ``12 * mrr``.
+* ``revenue_last_m``: ``mrr``, or ``price * amount_sold_last_m`` for one
+  time purchases.
+* ``yoy_growth``: ``amount_sold_last_m / amount_sold_y_ago - 1``, NaN
+  when nothing was sold a year ago.
+* ``cac_payback_months``: ``CAC / (monthly_price * margin)``, the months
+  of gross profit a customer takes to repay their acquisition; NaN for
+  one time purchases and free products.
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from lucid_ai_schemas.Schemas.schemas import (
+    ProductGeneratorOutput,
+    SubscriptionType,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Subscription types in code order, and their monthly price factor.
+SUBSCRIPTION_TYPES: List[SubscriptionType] = list(SubscriptionType)
+MONTHLY_PRICE: Dict[SubscriptionType, float] = {
+    SubscriptionType.monthly_and_yearly_subscription: 1.0,
+    SubscriptionType.one_time_purchase: 0.0,
+    SubscriptionType.monthly_subscription: 1.0,
+    SubscriptionType.yearly_subscription: 1 / 12,
+}
+# Members and plain values (unvalidated defaults) map to the same code.
+_CODES = {member: code for code, member in enumerate(SUBSCRIPTION_TYPES)}
+_ONE_TIME = _CODES[SubscriptionType.one_time_purchase]
+_COLUMNS = ("price", "amount_sold_last_m", "amount_sold_y_ago", "CAC")
+
+
+def _numpy():
+    if np is None:  # pragma: no cover
+        raise ImportError(
+            "lucid_ai_schemas.products needs NumPy: "
+            "pip install lucid_ai_schemas[numpy]"
+        )
+    return np
+
+
+def subscription_codes(values: Iterable[Any]) -> "np.ndarray":
+    """``SubscriptionType`` members or values -> int8 codes."""
+    codes = _CODES
+    try:
+        return _numpy().fromiter((codes[v] for v in values), np.int8)
+    except KeyError as error:
+        raise ValueError(
+            f"Invalid subscription_type: {error.args[0]}. "
+            f"Must be one of {[t.value for t in SUBSCRIPTION_TYPES]}."
+        ) from None
+
+
+class ProductBatch:
+    def __init__(
+        self,
+        price,
+        amount_sold_last_m,
+        amount_sold_y_ago,
+        CAC,
+        subscription,
+        company=None,
+        companies: int = 1,
+    ):
+        """
+        Columns of equal length: float prices, amounts and CACs (NaN for
+        None), int8 ``subscription`` codes (see ``subscription_codes``)
+        and the index of the ``company`` of every product.
+        """
+        _numpy()
+        self.price = np.asarray(price, dtype=float)
+        self.amount_sold_last_m = np.asarray(amount_sold_last_m, float)
+        self.amount_sold_y_ago = np.asarray(amount_sold_y_ago, float)
+        self.CAC = np.asarray(CAC, dtype=float)
+        self.subscription = np.asarray(subscription, dtype=np.int8)
+        if company is None:
+            company = np.zeros(len(self.price), dtype=np.int32)
+        self.company = np.asarray(company, dtype=np.int32)
+        self.companies = companies
+        lengths = {
+            len(column)
+            for column in (
+                self.price,
+                self.amount_sold_last_m,
+                self.amount_sold_y_ago,
+                self.CAC,
+                self.subscription,
+                self.company,
+            )
+        }
+        if len(lengths) > 1:
+            raise ValueError(f"Invalid columns: lengths {sorted(lengths)}.")
+
+    def __len__(self):
+        return len(self.price)
+
+    @classmethod
+    def from_outputs(
+        cls,
+        outputs: Iterable[Union[ProductGeneratorOutput, dict]],
+    ) -> "ProductBatch":
+        """
+        Load validated outputs (or payloads, validated here), one per
+        company, in order.
+        """
+        _numpy()
+        products, sizes = [], []
+        for output in outputs:
+            if not isinstance(output, ProductGeneratorOutput):
+                output = ProductGeneratorOutput.model_validate(output)
+            products.extend(output.products)
+            sizes.append(len(output.products))
+        # None (a price the LLM left out) becomes NaN.
+        columns = [
+            np.array(list(map(attrgetter(name), products)), dtype=float)
+            for name in _COLUMNS
+        ]
+        return cls(
+            *columns,
+            subscription_codes(p.subscription_type for p in products),
+            company=np.repeat(np.arange(len(sizes), dtype=np.int32), sizes),
+            companies=len(sizes),
+        )
+
+
+def product_metrics(
+    batch: ProductBatch, margin: float = 1.0
+) -> Dict[str, "np.ndarray"]:
+    """Per-product metrics of ``batch`` (see the module docstring)."""
+    _numpy()
+    factors = np.array(
+        [MONTHLY_PRICE[t] for t in SUBSCRIPTION_TYPES], dtype=float
+    )
+    monthly_price = batch.price * factors[batch.subscription]
+    mrr = monthly_price * batch.amount_sold_last_m
+    one_time = batch.subscription == _ONE_TIME
+    revenue = np.where(one_time, batch.price * batch.amount_sold_last_m, mrr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = batch.amount_sold_last_m / batch.amount_sold_y_ago - 1
+        payback = batch.CAC / (monthly_price * margin)
+    growth[~(batch.amount_sold_y_ago > 0)] = np.nan
+    payback[~(monthly_price > 0)] = np.nan
+    return {
+        "monthly_price": monthly_price,
+        "mrr": mrr,
+        "arr": 12 * mrr,
+        "revenue_last_m": revenue,
+        "yoy_growth": growth,
+        "cac_payback_months": payback,
+    }
+
+
+def company_totals(
+    batch: ProductBatch, metrics: Optional[Dict[str, Any]] = None
+) -> Dict[str, "np.ndarray"]:
+    """
+    Per-company sums of ``mrr``, ``arr`` and ``revenue_last_m``, and the
+    unit growth of all products sold a year ago, ``yoy_growth``.
+    """
+    _numpy()
+    metrics = metrics or product_metrics(batch)
+
+    def total(values):
+        values = np.nan_to_num(values)
+        return np.bincount(batch.company, values, batch.companies)
+
+    year_ago = total(batch.amount_sold_y_ago)
+    sold_then = np.where(batch.amount_sold_y_ago > 0, 1.0, 0.0)
+    last_month = total(batch.amount_sold_last_m * sold_then)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(year_ago > 0, last_month / year_ago - 1, np.nan)
+    return {
+        "products": np.bincount(batch.company, minlength=batch.companies),
+        "mrr": total(metrics["mrr"]),
+        "arr": total(metrics["arr"]),
+        "revenue_last_m": total(metrics["revenue_last_m"]),
+        "yoy_growth": growth,
+    }
+
+
+def python_metrics(product, margin: float = 1.0) -> dict:
+    """The same metrics for one product, in plain Python (reference)."""
+    kind = SUBSCRIPTION_TYPES[_CODES[product.subscription_type]]
+    monthly_price = product.price * MONTHLY_PRICE[kind]
+    mrr = monthly_price * product.amount_sold_last_m
+    if kind is SubscriptionType.one_time_purchase:
+        revenue = product.price * product.amount_sold_last_m
+    else:
+        revenue = mrr
+    nan = float("nan")
+    y_ago = product.amount_sold_y_ago
+    return {
+        "monthly_price": monthly_price,
+        "mrr": mrr,
+        "arr": 12 * mrr,
+        "revenue_last_m": revenue,
+        "yoy_growth": product.amount_sold_last_m / y_ago - 1 if y_ago else nan,
+        "cac_payback_months": (
+            product.CAC / (monthly_price * margin) if monthly_price else nan
+        ),
+    }
+
+
+def benchmark(size: Optional[int] = None, per_company: int = 20) -> dict:
+    """
+    ``size`` (default 1000000) products in outputs of ``per_company``:
+    time loading them into columns and computing every metric with
+    NumPy, against the per-product Python loop.
+    """
+    import random
+    import time
+
+    from lucid_ai_schemas.trusted import construct
+
+    _numpy()
+    size = size or 1_000_000
+    rng = random.Random(0)
+    kinds = [t.value for t in SUBSCRIPTION_TYPES]
+    outputs = []
+    for company in range(max(1, size // per_company)):
+        products = [
+            {
+                "name": f"Plan {i}",
+                "price": rng.choice([9.0, 29.0, 99.0, 990.0]),
+                "amount_sold_last_m": float(rng.randrange(0, 500)),
+                "amount_sold_y_ago": float(rng.randrange(0, 400)),
+                "subscription_type": rng.choice(kinds),
+                "CAC": rng.uniform(50, 900),
+            }
+            for i in range(per_company)
+        ]
+        outputs.append(
+            construct(ProductGeneratorOutput, {"products": products})
+        )
+    count = len(outputs) * per_company
+
+    start = time.perf_counter()
+    batch = ProductBatch.from_outputs(outputs)
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    metrics = product_metrics(batch)
+    totals = company_totals(batch, metrics)
+    vector_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [
+        python_metrics(product)
+        for output in outputs
+        for product in output.products
+    ]
+    python_s = time.perf_counter() - start
+    sample = rng.sample(range(count), min(count, 1000))
+    mismatches = sum(
+        not np.allclose(
+            [metrics[k][i] for k in reference[i]],
+            list(reference[i].values()),
+            equal_nan=True,
+        )
+        for i in sample
+    )
+    return {
+        "config": {"products": count, "companies": len(outputs)},
+        "load_s": load_s,
+        "vectorized_s": vector_s,
+        "python_loop_s": python_s,
+        "speedup_compute": round(python_s / vector_s, 1),
+        "speedup_with_load": round(python_s / (load_s + vector_s), 2),
+        "products_per_s": round(count / vector_s),
+        "mismatches_in_sample": mismatches,
+        "total_arr": float(totals["arr"].sum()),
+    }
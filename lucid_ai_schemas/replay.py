@@ -0,0 +1,382 @@
+"""
+Replay recorded LLM responses against two versions of the schemas.
+
+Before releasing a change to the schemas, replay what the models really
+answered (the ``LogAIResponseObject`` records written by
+``lucid_ai_schemas.logsink``) through the old and the new definitions:
+
+    report = replay_logs(
+        "/var/log/lucid",
+        old="old_schemas.py",  # e.g. git show v0.1.0:.../schemas.py
+        new="lucid_ai_schemas.Schemas.schemas",
+    )
+
+Every ``response`` is validated by both versions in a process pool and,
+per schema, the report counts:
+
+* ``newly_failing`` / ``newly_passing``: the validation outcome changed,
+* ``newly_coerced``: the new version rewrites a value the old one kept,
+* ``changed_values``: both pass but produce different values,
+
+with a few examples of each, plus the validation throughput and latency
+of both versions. Records are streamed in chunks with a bounded number
+of chunks in flight, so the input size is not limited by memory.
+
+A schema raising something else than a ValidationError (a bug of either
+version, e.g. a validator failing on unexpected input) only fails that
+record: it is counted in ``old_raised`` / ``new_raised`` and by type in
+``exceptions``, and the examples carry the error.
+
+The schema a record is validated with comes from its ``prompt_object``
+(``response_schema`` or ``schema`` key) unless ``schema_for`` is given:
+a schema name for every record, or a function of the record.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from pydantic import ValidationError
+
+from lucid_ai_schemas.metrics import LATENCY_BUCKETS, Histogram
+
+COUNTERS = (
+    "records",
+    "old_failed",
+    "new_failed",
+    "old_raised",
+    "new_raised",
+    "newly_failing",
+    "newly_passing",
+    "newly_coerced",
+    "changed_values",
+)
+# Counters that keep examples.
+DIFFS = ("newly_failing", "newly_passing", "newly_coerced", "changed_values")
+
+SchemaFor = Union[str, Callable[[dict], Optional[str]]]
+
+
+def load_schemas(source: str) -> ModuleType:
+    """
+    Import a schemas module from a dotted module name or from the path of
+    a ``schemas.py`` file (e.g. an older release checked out aside).
+    """
+    if not os.path.isfile(source):
+        return importlib.import_module(source)
+    path = os.path.abspath(source)
+    name = "_lucid_replay_" + hashlib.sha1(path.encode()).hexdigest()[:12]
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        # Registered first: forward references resolve through it.
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def default_schema(record: dict) -> Optional[str]:
+    """Read the schema name from ``prompt_object``."""
+    prompt_object = record.get("prompt_object") or {}
+    return prompt_object.get("response_schema") or prompt_object.get("schema")
+
+
+def _constant(name: str, record: dict) -> str:
+    return name
+
+
+class SchemaStats:
+    __slots__ = COUNTERS + (
+        "old_latency",
+        "new_latency",
+        "exceptions",
+        "examples",
+    )
+
+    def __init__(self):
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+        self.old_latency = Histogram(LATENCY_BUCKETS)
+        self.new_latency = Histogram(LATENCY_BUCKETS)
+        # version -> exception type -> count
+        self.exceptions: Dict[str, Dict[str, int]] = {"old": {}, "new": {}}
+        self.examples: Dict[str, list] = {diff: [] for diff in DIFFS}
+
+    def merge(self, other: "SchemaStats", examples: int):
+        for counter in COUNTERS:
+            setattr(
+                self, counter, getattr(self, counter) + getattr(other, counter)
+            )
+        self.old_latency.merge(other.old_latency)
+        self.new_latency.merge(other.new_latency)
+        for version, raised in other.exceptions.items():
+            counts = self.exceptions[version]
+            for kind, count in raised.items():
+                counts[kind] = counts.get(kind, 0) + count
+        for diff in DIFFS:
+            kept = self.examples[diff]
+            kept.extend(other.examples[diff][: examples - len(kept)])
+
+    def to_dict(self) -> dict:
+        result: Dict[str, Any] = {c: getattr(self, c) for c in COUNTERS}
+        for version in ("old", "new"):
+            latency = getattr(self, f"{version}_latency")
+            result[version] = {
+                "per_s": latency.count / latency.sum if latency.sum else None,
+                "mean_us": (
+                    latency.sum / latency.count * 1e6
+                    if latency.count
+                    else None
+                ),
+                "p50_us_le": _us(latency.quantile(0.5)),
+                "p99_us_le": _us(latency.quantile(0.99)),
+            }
+        result["exceptions"] = self.exceptions
+        result["examples"] = self.examples
+        return result
+
+
+def _us(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else seconds * 1e6
+
+
+# Per process state, set by ``_init``.
+_state: Dict[str, Any] = {}
+
+
+def _init(old: str, new: str, schema_for: Callable, examples: int):
+    _state.update(
+        old=load_schemas(old),
+        new=load_schemas(new),
+        schema_for=schema_for,
+        examples=examples,
+    )
+
+
+def _validate(module: ModuleType, name: str, response: Any):
+    """
+    ``(dumped values or None if invalid, seconds, exception)``, the
+    exception being ``"Type: message"`` when the schema raised something
+    else than a ValidationError.
+    """
+    model = getattr(module, name, None)
+    start = time.perf_counter()
+    error = None
+    try:
+        if model is None:
+            raise LookupError(name)
+        # Only the fields the response set: defaults are not coercions.
+        dumped = model.model_validate(response).model_dump(
+            mode="json", exclude_unset=True
+        )
+    except (ValidationError, LookupError):
+        dumped = None
+    except Exception as exc:
+        dumped, error = None, f"{type(exc).__name__}: {exc}"
+    return dumped, time.perf_counter() - start, error
+
+
+def _replay_chunk(offset: int, items: list) -> tuple:
+    """Replay one chunk; returns ``(records, skipped, {schema: stats})``."""
+    old, new = _state["old"], _state["new"]
+    schema_for, examples = _state["schema_for"], _state["examples"]
+    stats: Dict[str, SchemaStats] = {}
+    skipped = 0
+    for index, item in enumerate(items, offset):
+        record = json.loads(item) if isinstance(item, str) else item
+        response = record.get("response")
+        name = schema_for(record)
+        if not name or response is None:
+            skipped += 1
+            continue
+        entry = stats.get(name)
+        if entry is None:
+            entry = stats[name] = SchemaStats()
+        old_values, old_s, old_error = _validate(old, name, response)
+        new_values, new_s, new_error = _validate(new, name, response)
+        entry.records += 1
+        for version, error in (("old", old_error), ("new", new_error)):
+            if error is not None:
+                setattr(
+                    entry,
+                    f"{version}_raised",
+                    getattr(entry, f"{version}_raised") + 1,
+                )
+                kind = error.split(":", 1)[0]
+                raised = entry.exceptions[version]
+                raised[kind] = raised.get(kind, 0) + 1
+        entry.old_latency.observe(old_s)
+        entry.new_latency.observe(new_s)
+        if old_values is None:
+            entry.old_failed += 1
+        if new_values is None:
+            entry.new_failed += 1
+        if old_values is not None and new_values is None:
+            diff = "newly_failing"
+        elif old_values is None and new_values is not None:
+            diff = "newly_passing"
+        elif old_values is None or old_values == new_values:
+            continue
+        elif old_values == response:
+            diff = "newly_coerced"
+        else:
+            diff = "changed_values"
+        setattr(entry, diff, getattr(entry, diff) + 1)
+        if len(entry.examples[diff]) < examples:
+            example = {
+                "record": index,
+                "response": response,
+                "old": old_values,
+                "new": new_values,
+            }
+            if old_error:
+                example["old_error"] = old_error
+            if new_error:
+                example["new_error"] = new_error
+            entry.examples[diff].append(example)
+    return len(items), skipped, stats
+
+
+def _chunks(records: Iterable, chunk_size: int):
+    iterator = iter(records)
+    offset = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+
+def replay(
+    records: Iterable[Union[str, dict]],
+    old: str,
+    new: str = "lucid_ai_schemas.Schemas.schemas",
+    schema_for: Optional[SchemaFor] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    examples: int = 5,
+) -> dict:
+    """
+    Replay ``records`` (dicts or raw JSON lines) through the ``old`` and
+    ``new`` schemas (see ``load_schemas``). ``workers=0`` replays in this
+    process, otherwise in a pool of ``workers`` processes (default: one
+    per CPU).
+    """
+    if schema_for is None:
+        schema_for = default_schema
+    elif isinstance(schema_for, str):
+        schema_for = partial(_constant, schema_for)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    totals: Dict[str, SchemaStats] = {}
+    counts = {"records": 0, "skipped": 0}
+
+    def collect(result):
+        records, skipped, stats = result
+        counts["records"] += records
+        counts["skipped"] += skipped
+        for name, entry in stats.items():
+            totals.setdefault(name, SchemaStats()).merge(entry, examples)
+
+    start = time.perf_counter()
+    chunks = _chunks(records, chunk_size)
+    if workers == 0:
+        _init(old, new, schema_for, examples)
+        for offset, chunk in chunks:
+            collect(_replay_chunk(offset, chunk))
+    else:
+        with ProcessPoolExecutor(
+            workers,
+            initializer=_init,
+            initargs=(old, new, schema_for, examples),
+        ) as pool:
+            pending = set()
+            for offset, chunk in chunks:
+                # Bounded read-ahead: never more than two chunks per worker.
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                pending.add(pool.submit(_replay_chunk, offset, chunk))
+            for future in pending:
+                collect(future.result())
+    seconds = time.perf_counter() - start
+    return {
+        "config": {
+            "old": old,
+            "new": new,
+            "workers": workers,
+            "chunk_size": chunk_size,
+        },
+        **counts,
+        "seconds": seconds,
+        "records_per_s": counts["records"] / seconds if seconds else None,
+        "schemas": {name: totals[name].to_dict() for name in sorted(totals)},
+    }
+
+
+def replay_logs(
+    directory: str, old: str, prefix: str = "ai_responses", **options
+) -> dict:
+    """``replay`` every record a ``LogSink`` wrote to ``directory``."""
+    from lucid_ai_schemas.logsink import iter_lines
+
+    return replay(iter_lines(directory, prefix), old, **options)
+
+
+def benchmark(size: Optional[int] = None, workers: Optional[int] = None):
+    """
+    Replay ``size`` (default 200k) recorded responses through the current
+    schemas and a variant whose department normalizer no longer knows
+    "rnd", from gzip logs written by a ``LogSink``.
+    """
+    import random
+    import tempfile
+
+    from lucid_ai_schemas.bench import SAMPLES
+    from lucid_ai_schemas.logsink import LogSink
+    from lucid_ai_schemas.Schemas import schemas
+
+    size = size or 200_000
+    rng = random.Random(0)
+    with open(schemas.__file__) as fh:
+        source = fh.read()
+    changed = source.replace('"rnd": "R&D",', "")
+    assert changed != source, "The benchmark change no longer applies."
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old = os.path.join(tmp, "old_schemas.py")
+        new = os.path.join(tmp, "new_schemas.py")
+        for path, text in ((old, source), (new, changed)):
+            with open(path, "w") as fh:
+                fh.write(text)
+        names = ("PositionSchema", "ProductGeneratorOutput", "StringResponse")
+        with LogSink(tmp, capacity=size) as sink:
+            for i in range(size):
+                name = names[i % len(names)]
+                response = SAMPLES[name](rng.randint(1, 5))
+                if name == "PositionSchema" and i % 2:
+                    for position in response["positions"]:
+                        position["department"] = "R&D"
+                sink.emit(
+                    {
+                        "prompt_object": {"response_schema": name},
+                        "response": response,
+                        "response_time": 1.0,
+                    }
+                )
+        report = replay_logs(tmp, old, new=new, workers=workers)
+    for entry in report["schemas"].values():
+        entry.pop("examples")
+    report["config"]["records"] = size
+    return report
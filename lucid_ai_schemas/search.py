@@ -0,0 +1,313 @@
+"""
+Local candidate search, to send a shortlist instead of a whole catalog.
+
+The formula selector (``Ai_utilsUpdate``, which returns one ``id``) and
+the plot generator get every formula of the customer in
+``PlotORFormulaSchema.formulas``. ``FormulaIndex`` ranks the catalog for
+the ``freetext`` of the request in process, so the prompt only carries
+the ``k`` best candidates:
+
+    index = FormulaIndex(formulas)        # once per catalog
+    schema = index.narrow(PlotORFormulaSchema(formulas=formulas,
+                                              freetext="monthly churn"))
+    index.formula(response.id)            # None if not in the catalog
+
+Ranking is BM25 over the words of the names. Names are split on case
+changes, digits and punctuation ("grossMargin_EU" is gross, margin, eu),
+lower cased, and plural "s" is dropped. Query words missing from the
+names are matched to the closest name words through a character trigram
+index of the vocabulary, weighted by their similarity, so typos ("revnue")
+and prefixes ("rev") still find candidates. When no query word matches
+at all, ``narrow`` keeps the whole catalog rather than guess.
+
+``TextIndex`` is the generic index (texts in, positions out).
+"""
+
+import heapq
+import re
+from collections import Counter
+from math import log
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from lucid_ai_schemas.Schemas.schemas import PlotORFormulaSchema
+
+Formula = PlotORFormulaSchema.Formula
+
+_WORD = re.compile(r"[A-Z]{2,}(?![a-z])|[A-Z]?[a-z]+|[A-Z]|\d+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it me my of on or our show "
+    "the to us we what which with".split()
+)
+# Query words matched to a vocabulary word at least this similar.
+MIN_SIMILARITY = 0.4
+_EXPANSIONS = 3
+_PREFIX_SIMILARITY = 0.5
+
+
+def _stem(word: str) -> str:
+    if len(word) > 3 and word[-1] == "s" and word[-2] not in "siu":
+        return word[:-1]
+    return word
+
+
+def terms(text: Optional[str]) -> List[str]:
+    """The index terms of ``text``, in order."""
+    if not text:
+        return []
+    words = (word.lower() for word in _WORD.findall(text))
+    return [_stem(word) for word in words if word not in STOP_WORDS]
+
+
+def _grams(word: str) -> set:
+    padded = f"^{word}$"
+    return {a + b + c for a, b, c in zip(padded, padded[1:], padded[2:])}
+
+
+class TextIndex:
+    def __init__(self, texts: Iterable[str], k1: float = 1.2, b: float = 0.75):
+        """BM25 index of ``texts``; results are positions in ``texts``."""
+        frequencies: Dict[str, Dict[int, int]] = {}
+        lengths = []
+        for position, text in enumerate(texts):
+            words = terms(text)
+            lengths.append(len(words))
+            for word in words:
+                docs = frequencies.setdefault(word, {})
+                docs[position] = docs.get(position, 0) + 1
+        self.size = len(lengths)
+        average = sum(lengths) / self.size if self.size else 0.0
+        norms = [
+            k1 * (1 - b + b * length / average) if average else k1
+            for length in lengths
+        ]
+        # Every posting holds its whole BM25 contribution.
+        self.postings: Dict[str, Tuple[Tuple[int, ...], Tuple[float, ...]]]
+        self.postings = {}
+        for word, docs in frequencies.items():
+            idf = log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[word] = (
+                tuple(docs),
+                tuple(
+                    idf * tf * (k1 + 1) / (tf + norms[doc])
+                    for doc, tf in docs.items()
+                ),
+            )
+        self._grams: Dict[str, List[str]] = {}
+        for word in self.postings:
+            for gram in _grams(word):
+                self._grams.setdefault(gram, []).append(word)
+
+    def expand(self, word: str) -> List[Tuple[str, float]]:
+        """Vocabulary words standing for ``word``, with their weight."""
+        if word in self.postings:
+            return [(word, 1.0)]
+        grams = _grams(word)
+        shared = Counter(
+            match for gram in grams for match in self._grams.get(gram, ())
+        )
+        matches = []
+        for match, count in shared.items():
+            similarity = count / (len(grams) + len(_grams(match)) - count)
+            if len(word) >= 3 and match.startswith(word):
+                similarity = max(similarity, _PREFIX_SIMILARITY)
+            if similarity >= MIN_SIMILARITY:
+                matches.append((match, similarity))
+        return heapq.nlargest(_EXPANSIONS, matches, key=lambda m: m[1])
+
+    def search(self, query: str, k: int = 20) -> List[Tuple[int, float]]:
+        """The ``k`` best positions for ``query`` and their scores."""
+        weights: Dict[str, float] = {}
+        for word in set(terms(query)):
+            for match, weight in self.expand(word):
+                weights[match] = max(weights.get(match, 0.0), weight)
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for word, weight in weights.items():
+            docs, contributions = self.postings[word]
+            for doc, contribution in zip(docs, contributions):
+                scores[doc] = get(doc, 0.0) + weight * contribution
+        # Ties go to the earlier text.
+        return heapq.nlargest(
+            k, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+
+
+FormulaLike = Union[Formula, dict, Tuple[int, str]]
+
+
+def _formula(value: FormulaLike) -> Formula:
+    if isinstance(value, Formula):
+        return value
+    if isinstance(value, dict):
+        return Formula.model_validate(value)
+    formula_id, name = value
+    return Formula(id=formula_id, name=name)
+
+
+class FormulaIndex:
+    def __init__(self, formulas: Iterable[FormulaLike], **bm25):
+        """
+        Index a formula catalog: ``Formula`` objects, their dicts or
+        ``(id, name)`` pairs. ``bm25`` are the ``k1``/``b`` parameters.
+        """
+        self.formulas: List[Formula] = [_formula(f) for f in formulas]
+        self._by_id = {f.id: f for f in self.formulas}
+        self.index = TextIndex((f.name for f in self.formulas), **bm25)
+
+    @classmethod
+    def from_schema(cls, schema: PlotORFormulaSchema, **bm25):
+        return cls(schema.formulas or (), **bm25)
+
+    def __len__(self):
+        return len(self.formulas)
+
+    def formula(self, formula_id: int) -> Optional[Formula]:
+        """The formula of an id the model returned, if in the catalog."""
+        return self._by_id.get(formula_id)
+
+    def search(
+        self, query: Optional[str], k: int = 20
+    ) -> List[Tuple[Formula, float]]:
+        """The ``k`` formulas that best match ``query``, best first."""
+        if not query:
+            return []
+        formulas = self.formulas
+        return [
+            (formulas[position], score)
+            for position, score in self.index.search(query, k)
+        ]
+
+    def shortlist(self, query: Optional[str], k: int = 20) -> List[Formula]:
+        return [formula for formula, _ in self.search(query, k)]
+
+    def narrow(
+        self, schema: PlotORFormulaSchema, k: int = 20
+    ) -> PlotORFormulaSchema:
+        """
+        A copy of ``schema`` with the ``k`` best formulas for its
+        ``freetext`` (``schema.formulas`` is ignored: the catalog of the
+        index is searched). Without any match the whole catalog is kept.
+        """
+        formulas = self.shortlist(schema.freetext, k) or self.formulas
+        return schema.model_copy(update={"formulas": list(formulas)})
+
+
+def benchmark(
+    size: Optional[int] = None, k: int = 20, queries: int = 200
+) -> dict:
+    """
+    Build a ``FormulaIndex`` over ``size`` (default 50000) formulas and
+    run ``queries`` requests naming a formula (some with a typo or a
+    prefix): build time, query latency, how often the formula is in the
+    shortlist, and the prompt size with the whole catalog and with the
+    top ``k``.
+    """
+    import random
+    import time
+
+    from lucid_ai_schemas.tokens import count_tokens
+
+    size = size or 50000
+    rng = random.Random(0)
+    segments = [
+        "EMEA",
+        "APAC",
+        "US",
+        "Enterprise",
+        "SMB",
+        "Retail",
+        "Online",
+        "Wholesale",
+        "Partner",
+        "Direct",
+        "Mobile",
+        "Web",
+    ]
+    metrics = [
+        "Revenue",
+        "Gross Margin",
+        "COGS",
+        "Payroll",
+        "Headcount",
+        "CAC",
+        "LTV",
+        "Churn Rate",
+        "MRR",
+        "ARR",
+        "Marketing Spend",
+        "Net Income",
+        "Operating Expenses",
+        "Cash Balance",
+        "Burn Rate",
+        "Bookings",
+        "Deferred Revenue",
+        "Customer Count",
+        "Conversion Rate",
+        "EBITDA",
+    ]
+    qualifiers = [
+        "Monthly",
+        "Quarterly",
+        "Forecast",
+        "Actual",
+        "Budget",
+        "YoY",
+        "Cumulative",
+        "Per Customer",
+        "Adjusted",
+        "Plan",
+    ]
+    catalog = [
+        (
+            i,
+            f"{rng.choice(segments)} {rng.choice(metrics)} "
+            f"{rng.choice(qualifiers)} {i % 97}",
+        )
+        for i in range(size)
+    ]
+
+    def phrase(name):
+        words = name.split()
+        word = rng.randrange(len(words) - 1)
+        if rng.random() < 0.3 and len(words[word]) > 4:
+            text = words[word]
+            cut = rng.randrange(1, len(text) - 1)
+            # a typo
+            words[word] = "".join(c for j, c in enumerate(text) if j != cut)
+        elif rng.random() < 0.2 and len(words[word]) > 4:
+            words[word] = words[word][:3]  # a prefix
+        return "show me the " + " ".join(words).lower()
+
+    targets = [rng.choice(catalog) for _ in range(queries)]
+    requests = [phrase(name) for _, name in targets]
+
+    start = time.perf_counter()
+    index = FormulaIndex(catalog)
+    build_s = time.perf_counter() - start
+
+    latencies, found = [], 0
+    for (formula_id, _), text in zip(targets, requests):
+        start = time.perf_counter()
+        shortlist = index.shortlist(text, k)
+        latencies.append(time.perf_counter() - start)
+        found += any(f.id == formula_id for f in shortlist)
+    latencies.sort()
+
+    full = PlotORFormulaSchema(formulas=index.formulas, freetext=requests[0])
+    full_tokens = count_tokens(full)
+    narrowed = [
+        count_tokens(index.narrow(full.model_copy(update={"freetext": t}), k))
+        for t in requests[:20]
+    ]
+    narrowed_tokens = sum(narrowed) / len(narrowed)
+    return {
+        "config": {"formulas": size, "k": k, "queries": queries},
+        "build_s": build_s,
+        "vocabulary": len(index.index.postings),
+        "query_ms_p50": latencies[len(latencies) // 2] * 1e3,
+        "query_ms_p95": latencies[int(len(latencies) * 0.95)] * 1e3,
+        "target_in_shortlist": found / queries,
+        "prompt_tokens_full": full_tokens,
+        "prompt_tokens_shortlist": narrowed_tokens,
+        "prompt_reduction": round(full_tokens / narrowed_tokens, 1),
+    }
@@ -0,0 +1,252 @@
+"""
+Single-flight coalescing of identical concurrent LLM calls.
+
+When a dashboard fans out, the same ``OrchestratorSchema`` or
+``CompanyDetailsSchema`` input is often requested several times at once.
+``SingleFlight`` makes concurrent callers with the same input share one
+upstream call:
+
+    flights = SingleFlight(timeout=30)
+
+    async def orchestrate(schema: OrchestratorSchema):
+        return await flights.do(schema, lambda: call_llm(schema))
+
+Inputs are keyed on their canonical form (``canonical_key``): the schema
+name plus a hash of the validated, key-sorted JSON dump, so a field left
+unset and the same field set to its default are the same request. The
+amount fields (``amount_fields`` of ``CompanyDetailsSchema`` and
+``AssumptionsInputSchema``) are keyed by their parsed amount and
+currency: "$2M" and "2,000,000 dollars" are the same request, and so are
+2000000 and "2,000,000", but not "$2M" and 2000000, which has no
+currency. Text that is not an amount is keyed as written.
+
+Nothing is cached: once a call finishes, the next caller starts a new
+one.
+
+Timeouts and cancellation:
+
+* ``timeout`` (per ``do`` call, or the default given to ``SingleFlight``)
+  bounds how long one caller waits. It raises ``asyncio.TimeoutError``
+  for that caller only; the shared call goes on for the others.
+* ``call_timeout`` bounds the upstream call itself; when it expires every
+  waiter gets ``asyncio.TimeoutError``.
+* A cancelled caller never cancels the call other callers wait for. When
+  the last waiter is gone (cancelled or timed out) the orphaned call is
+  cancelled, unless ``cancel_orphans=False``.
+* Exceptions of the shared call are raised to every waiter.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from pydantic import BaseModel
+
+_encode = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), default=str
+).encode
+
+
+def canonical_key(instance: BaseModel) -> str:
+    """``"<Schema>:<sha256 of the canonical JSON dump>"``."""
+    data = instance.model_dump(mode="json")
+    for name in getattr(instance, "amount_fields", ()):
+        money = instance.money(name)
+        if money is not None:
+            data[name] = [float(money.amount), money.currency]
+    dump = _encode(data)
+    digest = hashlib.sha256(dump.encode("utf-8")).hexdigest()
+    return f"{type(instance).__qualname__}:{digest}"
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        call_timeout: Optional[float] = None,
+        cancel_orphans: bool = True,
+    ):
+        self.timeout = timeout
+        self.call_timeout = call_timeout
+        self.cancel_orphans = cancel_orphans
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.flights = 0
+        self.orphans_cancelled = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "flights": self.flights,
+            "shared": self.calls - self.flights,
+            "in_flight": len(self._flights),
+            "orphans_cancelled": self.orphans_cancelled,
+        }
+
+    def in_flight(self, key: Any) -> bool:
+        return self._key(key) in self._flights
+
+    @staticmethod
+    def _key(key: Any) -> Hashable:
+        return canonical_key(key) if isinstance(key, BaseModel) else key
+
+    async def _call(self, func: Callable[[], Awaitable[Any]]):
+        if self.call_timeout is None:
+            return await func()
+        return await asyncio.wait_for(func(), self.call_timeout)
+
+    def _start(self, key: Hashable, func) -> _Flight:
+        task = asyncio.ensure_future(self._call(func))
+        flight = self._flights[key] = _Flight(task)
+        self.flights += 1
+
+        def done(task: asyncio.Task):
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if not task.cancelled():
+                # Mark the exception retrieved, waiters may all be gone.
+                task.exception()
+
+        task.add_done_callback(done)
+        return flight
+
+    async def do(
+        self,
+        key: Any,
+        func: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Await ``func()``, or the identical call already in flight. ``key``
+        is a schema instance (keyed with ``canonical_key``) or any
+        hashable.
+        """
+        key = self._key(key)
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._start(key, func)
+        flight.waiters += 1
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.task), timeout)
+        finally:
+            flight.waiters -= 1
+            if (
+                not flight.waiters
+                and not flight.task.done()
+                and self.cancel_orphans
+            ):
+                # Nobody waits for it any more; new callers start afresh.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+                self.orphans_cancelled += 1
+
+    def wrap(self, func: Callable[..., Awaitable[Any]]):
+        """
+        Decorate ``async def func(schema, ...)`` so concurrent calls with
+        the same schema input share one call.
+        """
+
+        async def wrapper(instance: BaseModel, *args, **kwargs):
+            return await self.do(
+                instance, lambda: func(instance, *args, **kwargs)
+            )
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+
+def benchmark(
+    size: Optional[int] = None,
+    distinct: int = 50,
+    upstream_concurrency: int = 20,
+    latency: float = 0.02,
+) -> dict:
+    """
+    Load-test with a local fake LLM: ``size`` (default 5000) dashboard
+    requests for ``distinct`` inputs, arriving in bursts, against an
+    upstream that serves ``upstream_concurrency`` calls at a time with
+    ~``latency`` seconds each. Compares upstream calls and caller
+    latencies with and without coalescing.
+    """
+    import random
+    import statistics
+    import time
+    from itertools import islice
+
+    from lucid_ai_schemas.Schemas.schemas import OrchestratorSchema
+
+    size = size or 5000
+    rng = random.Random(0)
+    # Skewed popularity: a few branches are on most dashboards.
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    inputs = [
+        OrchestratorSchema(branch_id=i, freetext=f"Plan for branch {i}")
+        for i in rng.choices(range(distinct), weights, k=size)
+    ]
+
+    async def run(coalesce: bool) -> dict:
+        upstream = asyncio.Semaphore(upstream_concurrency)
+        calls = 0
+
+        async def fake_llm(schema):
+            nonlocal calls
+            async with upstream:
+                calls += 1
+                await asyncio.sleep(latency * rng.uniform(0.5, 1.5))
+                return {"branch_id": schema.branch_id, "answer": "ok"}
+
+        flights = SingleFlight()
+        timings = []
+
+        async def request(schema):
+            start = time.perf_counter()
+            if coalesce:
+                await flights.do(schema, lambda: fake_llm(schema))
+            else:
+                await fake_llm(schema)
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        burst = 100
+        for offset in range(0, size, burst):
+            batch = islice(inputs, offset, offset + burst)
+            await asyncio.gather(*(request(s) for s in batch))
+        elapsed = time.perf_counter() - start
+        timings.sort()
+        return {
+            "upstream_calls": calls,
+            "seconds": elapsed,
+            "p50_ms": statistics.median(timings) * 1e3,
+            "p99_ms": timings[int(len(timings) * 0.99)] * 1e3,
+        }
+
+    results = {
+        "config": {
+            "requests": size,
+            "distinct": distinct,
+            "upstream_concurrency": upstream_concurrency,
+            "latency_s": latency,
+        },
+        "direct": asyncio.run(run(False)),
+        "single_flight": asyncio.run(run(True)),
+    }
+    results["upstream_call_reduction"] = round(
+        results["direct"]["upstream_calls"]
+        / results["single_flight"]["upstream_calls"],
+        2,
+    )
+    return results
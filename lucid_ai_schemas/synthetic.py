@@ -0,0 +1,850 @@
+"""
+Synthetic responses for load tests, and a fake LLM server serving them.
+
+``Generator`` compiles a response schema once into a payload builder
+following its field types (nested models, lists, enums, money and date
+fields, ``Field(ge=...)`` bounds), then emits payloads quickly:
+
+    generator = Generator(PositionSchema, items=(5, 20), seed=1)
+    generator.payload()                  # valid
+    generator.invalid("enum")            # (payload, "enum")
+    generator = Generator(PlotCollectionResponse, invalid_rate=0.2)
+    payload, error = generator.sample()  # error is None or the kind
+    text, error = generator.sample_json()
+
+The kinds of errors, and their default weights, are in ``ERRORS``:
+
+* ``type``: a value of the wrong type ("not a number" in an int field).
+* ``missing``: a required field left out.
+* ``enum``: a value outside an enum. Schemas with a lenient validator
+  (``Countries`` fields fall back to the USA) log it and accept it, as
+  they would a real response.
+* ``range``: a number below its ``ge`` bound or a string above its
+  ``max_length``.
+* ``extra``: an unknown field, rejected by ``extra="forbid"`` schemas.
+* ``truncate``: JSON text cut short, only for ``sample_json``.
+
+Some fields reject every value of their declared type, e.g. a validator
+comparing a whole list with enum values. The generator finds them when
+it compiles the schema and leaves them to their defaults; they are listed
+in ``Generator.skipped``.
+
+``FakeLLMServer`` serves generated responses over HTTP, with a latency
+before the first byte and optional streaming (server-sent events in
+``chunk_size`` pieces, ``chunk_delay`` apart):
+
+    async with FakeLLMServer(latency=0.2, jitter=0.05) as server:
+        client = FakeLLMClient(server.port, stream=True)
+        reply = await client.get("PositionSchema", items=10)
+        await client.close()
+
+    GET /v1/<Schema>?stream=1&items=10&invalid_rate=0.1&error=type
+
+The ``X-Error-Kind`` header of a reply names the error injected, or
+``none``. Requests for more than ``FakeLLMServer.max_items`` items are
+answered with a 400. ``FakeLLMClient`` is also an ``LLM`` for
+``dag.DAG.run``. From the command line:
+``lucid_ai_schemas fake-llm --port 8080``.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from enum import Enum
+from typing import Annotated, Any, Callable, Dict, List, NamedTuple
+from typing import Optional, Tuple, Union, get_args, get_origin
+from types import UnionType
+from urllib.parse import parse_qsl, urlsplit
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import FieldInfo
+
+from lucid_ai_schemas.introspect import resolve
+
+ERRORS: Dict[str, float] = {
+    "type": 3,
+    "missing": 2,
+    "enum": 2,
+    "range": 1,
+    "extra": 1,
+    "truncate": 1,
+}
+
+_WORDS = (
+    "revenue growth hiring plan budget forecast engineers customers "
+    "subscription churn runway marketing sales product launch market "
+    "payroll expansion quarter pipeline margin retention pricing cash"
+).split()
+_ROLES = [
+    "Software Engineer",
+    "Product Manager",
+    "Account Executive",
+    "Data Scientist",
+    "Designer",
+    "Customer Success Manager",
+    "Controller",
+    "Marketing Lead",
+]
+_NAMES = ["Alex", "Sam", "Maria", "Jonas", "Aiko", "Noah", "Lea", "Omar"]
+_KEYS = ["churn", "growth", "cac", "price", "conversion", "headcount"]
+_VALUES = ["2%", "15%", "1200", "0.35", "49.99", "12"]
+_BOUNDS = ("ge", "gt", "le", "lt", "max_length")
+_NOT_A_MEMBER = "Not a member"
+
+
+def _bounds(metadata: Any, bounds: dict) -> dict:
+    """Merge the ``ge``/``le``/``max_length``... of ``metadata``."""
+    if isinstance(metadata, FieldInfo):
+        for item in metadata.metadata:
+            bounds = _bounds(item, bounds)
+        return bounds
+    found = {
+        key: getattr(metadata, key)
+        for key in _BOUNDS
+        if getattr(metadata, key, None) is not None
+    }
+    return {**bounds, **found} if found else bounds
+
+
+def _picker(rng: random.Random, pool: list) -> Callable[[], Any]:
+    # Faster than rng.choice, which is the hot path of generation.
+    random_, size = rng.random, len(pool)
+    return lambda: pool[int(random_() * size)]
+
+
+def _integers(rng: random.Random, low: int, high: int) -> Callable[[], int]:
+    """Like ``rng.randint(low, high)``, several times faster."""
+    random_, span = rng.random, high - low + 1
+    return lambda: low + int(random_() * span)
+
+
+def _failing_fields(model: type, payload: dict) -> set:
+    """Fields of ``payload`` that ``model`` rejects."""
+    try:
+        model.model_validate(payload)
+        return set()
+    except ValidationError as error:
+        return {e["loc"][0] for e in error.errors() if e["loc"]}
+    except Exception:
+        # A validator crashed; find the field on its own.
+        failing = set()
+        for name, value in payload.items():
+            try:
+                model.model_validate({name: value})
+            except ValidationError:
+                pass
+            except Exception:
+                failing.add(name)
+        return failing
+
+
+class _Plan:
+    """How to build and break the payload of one model."""
+
+    def __init__(self):
+        self.fields: List[Tuple[str, Callable[[], Any]]] = []
+        self.required: List[str] = []
+        # kind -> [(field, invalid value)]
+        self.slots: Dict[str, List[Tuple[str, Any]]] = {}
+        # (field, model, is a list)
+        self.nested: List[Tuple[str, type, bool]] = []
+        self.build: Callable[[], dict] = dict
+
+    def compile(self):
+        fields = tuple(self.fields)
+        self.build = lambda: {name: make() for name, make in fields}
+
+
+class Generator:
+    def __init__(
+        self,
+        model: type,
+        items: Union[int, Tuple[int, int]] = 3,
+        words: int = 6,
+        invalid_rate: float = 0.0,
+        errors: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        ``items`` is the length of every list (or a ``(min, max)``
+        range), ``words`` the length of free-text strings.
+        ``invalid_rate`` of ``sample()`` payloads get one error, drawn
+        from ``errors`` (kind -> weight, default ``ERRORS``).
+        """
+        errors = ERRORS if errors is None else errors
+        unknown = set(errors) - set(ERRORS)
+        if unknown:
+            raise ValueError(
+                f"Invalid error kinds: {sorted(unknown)}. "
+                f"Must be some of {sorted(ERRORS)}."
+            )
+        if not 0 <= invalid_rate <= 1:
+            raise ValueError(
+                f"Invalid invalid_rate: {invalid_rate}. "
+                "Must be between 0 and 1."
+            )
+        self.model = model
+        self.items = (items, items) if isinstance(items, int) else items
+        self.invalid_rate = invalid_rate
+        self.errors = dict(errors)
+        self.rng = random.Random(seed)
+        choices = self.rng.choices
+        self._sentences = [
+            " ".join(choices(_WORDS, k=words)).capitalize() + "."
+            for _ in range(256)
+        ]
+        self._dates = [
+            f"{year}-{month:02d}-01"
+            for year in range(2027, 2031)
+            for month in range(1, 13)
+        ]
+        self.skipped: Dict[str, List[str]] = {}
+        self._plans: Dict[type, _Plan] = {}
+        self._build = self._plan(model).build
+
+    # -- compiling ---------------------------------------------------
+
+    def _plan(self, model: type) -> _Plan:
+        plan = self._plans.get(model)
+        if plan is not None:
+            return plan
+        plan = self._plans[model] = _Plan()
+        for name, field in model.model_fields.items():
+            make, kind = self._factory(
+                model, name, field.annotation, _bounds(field, {})
+            )
+            plan.fields.append((name, make))
+            if field.is_required():
+                plan.required.append(name)
+            self._add_slots(plan, name, kind)
+        plan.compile()
+        self._calibrate(model, plan)
+        return plan
+
+    def _calibrate(self, model: type, plan: _Plan):
+        """Leave out the optional fields the model never accepts."""
+        disabled = logging.root.manager.disable
+        logging.disable(logging.CRITICAL)
+        try:
+            for _ in range(len(plan.fields)):
+                failing = _failing_fields(model, plan.build())
+                failing -= set(plan.required)
+                if not failing:
+                    break
+                plan.fields = [f for f in plan.fields if f[0] not in failing]
+                for kind, slots in plan.slots.items():
+                    plan.slots[kind] = [
+                        s for s in slots if s[0] not in failing
+                    ]
+                plan.nested = [n for n in plan.nested if n[0] not in failing]
+                self.skipped.setdefault(model.__qualname__, []).extend(
+                    sorted(failing)
+                )
+                plan.compile()
+        finally:
+            logging.disable(disabled)
+
+    def _add_slots(self, plan: _Plan, name: str, kind: tuple):
+        slots = plan.slots
+        what = kind[0]
+        if what in ("number", "bool", "model", "list"):
+            slots.setdefault("type", []).append((name, _NOT_A_MEMBER))
+        elif what == "str":
+            slots.setdefault("type", []).append((name, {"not": "a string"}))
+        if what == "enum" or (what == "list" and kind[1][0] == "enum"):
+            bad = [_NOT_A_MEMBER] if what == "list" else _NOT_A_MEMBER
+            slots.setdefault("enum", []).append((name, bad))
+        bounds = kind[-1] if isinstance(kind[-1], dict) else {}
+        if what == "number" and ("ge" in bounds or "gt" in bounds):
+            low = bounds.get("ge", bounds.get("gt"))
+            slots.setdefault("range", []).append((name, low - 1))
+        if what == "str" and "max_length" in bounds:
+            long = "x" * (bounds["max_length"] + 1)
+            slots.setdefault("range", []).append((name, long))
+        if name in plan.required:
+            slots.setdefault("missing", []).append((name, None))
+        if what == "model":
+            plan.nested.append((name, kind[1], False))
+        elif what == "list" and kind[1][0] == "model":
+            plan.nested.append((name, kind[1][1], True))
+
+    def _factory(
+        self, model: type, name: str, annotation: Any, bounds: dict
+    ) -> Tuple[Callable[[], Any], tuple]:
+        """A function making values of ``annotation``, and its kind."""
+        rng = self.rng
+        annotation = resolve(model, annotation)
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            base, *metadata = get_args(annotation)
+            for item in metadata:
+                bounds = _bounds(item, bounds)
+            return self._factory(model, name, base, bounds)
+        if origin in (Union, UnionType):
+            # The first type of a union (str for amounts, the enum for
+            # ``Sectors | str``).
+            args = [a for a in get_args(annotation) if a is not type(None)]
+            return self._factory(model, name, args[0], bounds)
+        if origin in (list, List):
+            args = get_args(annotation)
+            make, kind = self._factory(
+                model, name, args[0] if args else str, {}
+            )
+            low, high = self.items
+            if low == high:
+                return lambda: [make() for _ in range(low)], ("list", kind)
+            length = _integers(rng, low, high)
+            return (
+                lambda: [make() for _ in range(length())],
+                ("list", kind),
+            )
+        if annotation in (dict, Any) or origin is dict:
+            key = _picker(rng, _KEYS)
+            return lambda: {"key": key()}, ("any",)
+        if not isinstance(annotation, type):
+            return lambda: None, ("any",)
+        if issubclass(annotation, BaseModel):
+            plan = self._plan(annotation)
+            return lambda: plan.build(), ("model", annotation)
+        if issubclass(annotation, Enum):
+            values = [m.value for m in annotation if m.value is not None]
+            return _picker(rng, values), ("enum", annotation)
+        if annotation is bool:
+            return (lambda: rng.random() < 0.5), ("bool",)
+        if issubclass(annotation, (int, float)):
+            return self._number(annotation, name, bounds), ("number", bounds)
+        if issubclass(annotation, str):
+            return self._text(name, bounds), ("str", bounds)
+        return lambda: None, ("any",)
+
+    def _number(self, annotation: type, name: str, bounds: dict):
+        low = bounds.get("ge", bounds.get("gt", 0))
+        high = bounds.get("le", bounds.get("lt", low + 1_000_000))
+        if annotation is float:
+            random_, span = self.rng.random, high - low
+            return lambda: round(low + random_() * span, 2)
+        if name.lower() == "id":
+            return _integers(self.rng, 1, 1_000_000)
+        return _integers(self.rng, int(low), int(high))
+
+    def _text(self, name: str, bounds: dict):
+        lowered = name.lower()
+        if "date" in lowered or lowered == "when":
+            pool = self._dates
+        elif lowered == "time_period":
+            pool = [f"{y}-01-01:{y}-12-31" for y in range(2024, 2031)]
+        elif lowered == "role":
+            pool = _ROLES
+        elif lowered in ("name", "full_name"):
+            pool = [f"{n} {w.capitalize()}" for n in _NAMES for w in _WORDS]
+        elif lowered == "key":
+            pool = _KEYS
+        elif lowered == "value":
+            pool = _VALUES
+        else:
+            pool = self._sentences
+        if "max_length" in bounds:
+            pool = [text[: bounds["max_length"]] for text in pool]
+        return _picker(self.rng, pool)
+
+    # -- generating --------------------------------------------------
+
+    def payload(self) -> dict:
+        """A valid payload."""
+        return self._build()
+
+    def invalid(self, kind: Optional[str] = None) -> Tuple[dict, str]:
+        """
+        A payload with one error of ``kind`` (drawn from ``errors`` by
+        default). Falls back to ``type``, then ``extra``, when the schema
+        has no place for that kind of error. Returns the payload and the
+        kind of error it has.
+        """
+        if kind is None:
+            kind = self._draw(json=False)
+        elif kind not in ERRORS or kind == "truncate":
+            raise ValueError(
+                f"Invalid error kind: {kind}. "
+                f"Must be one of {sorted(set(ERRORS) - {'truncate'})}."
+            )
+        payload = self._build()
+        for attempt in (kind, "type", "extra"):
+            if self._mutate(self.model, payload, attempt):
+                return payload, attempt
+        raise AssertionError("extra always applies")  # pragma: no cover
+
+    def sample(self) -> Tuple[dict, Optional[str]]:
+        """A payload, invalid with probability ``invalid_rate``."""
+        if self.invalid_rate and self.rng.random() < self.invalid_rate:
+            return self.invalid()
+        return self._build(), None
+
+    def sample_json(self) -> Tuple[str, Optional[str]]:
+        """Like ``sample`` as JSON text, which may also be truncated."""
+        if not self.invalid_rate or self.rng.random() >= self.invalid_rate:
+            return json.dumps(self._build()), None
+        kind = self._draw(json=True)
+        if kind == "truncate":
+            text = json.dumps(self._build())
+            return text[: self.rng.randrange(1, len(text))], kind
+        payload, kind = self.invalid(kind)
+        return json.dumps(payload), kind
+
+    def batch(self, count: int) -> List[Tuple[dict, Optional[str]]]:
+        return [self.sample() for _ in range(count)]
+
+    def _draw(self, json: bool) -> str:
+        kinds = [k for k in self.errors if json or k != "truncate"]
+        if not kinds:
+            return "type"
+        weights = [self.errors[k] for k in kinds]
+        return self.rng.choices(kinds, weights)[0]
+
+    def _mutate(self, model: type, data: dict, kind: str) -> bool:
+        """Put one error of ``kind`` in ``data`` or a nested payload."""
+        plan = self._plans[model]
+        rng = self.rng
+        if kind == "extra":
+            here = [("unexpected_field", True)]
+        else:
+            here = [s for s in plan.slots.get(kind, ()) if s[0] in data]
+        children = []
+        for name, nested, many in plan.nested:
+            value = data.get(name)
+            if many and isinstance(value, list):
+                children.extend((nested, item) for item in value)
+            elif isinstance(value, dict):
+                children.append((nested, value))
+        if here and (not children or rng.random() < 0.5):
+            return self._mutate_here(data, kind, here)
+        rng.shuffle(children)
+        for nested, child in children:
+            if self._mutate(nested, child, kind):
+                return True
+        if here:
+            return self._mutate_here(data, kind, here)
+        return False
+
+    def _mutate_here(self, data: dict, kind: str, here: list) -> bool:
+        name, bad = self.rng.choice(here)
+        if kind == "missing":
+            del data[name]
+        else:
+            data[name] = bad
+        return True
+
+
+def response_schemas() -> Dict[str, type]:
+    """The schemas a fake LLM can answer with, by name."""
+    from lucid_ai_schemas.bench import schema_classes
+
+    return schema_classes()
+
+
+# -- HTTP ------------------------------------------------------------
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found"}
+
+
+async def _read_head(reader: asyncio.StreamReader):
+    """The start line and headers of an HTTP message, or None at EOF."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = header.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    return line.decode("latin-1").split(None, 2), headers
+
+
+class FakeLLMServer:
+    # Generators kept, one per schema and query; the oldest is dropped.
+    max_generators = 64
+    # Longest list a request may ask for; more is answered with a 400.
+    max_items = 1000
+
+    def __init__(
+        self,
+        schemas: Optional[Dict[str, type]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        chunk_size: int = 64,
+        chunk_delay: float = 0.0,
+        items: int = 3,
+        invalid_rate: float = 0.0,
+        errors: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Answer ``GET /v1/<Schema>`` for the ``schemas`` (default: every
+        schema) after ``latency`` ± ``jitter`` seconds. ``items``,
+        ``invalid_rate`` and ``errors`` are ``Generator`` defaults that a
+        request can override with its query string.
+        """
+        self.schemas = schemas or response_schemas()
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.items = items
+        self.invalid_rate = invalid_rate
+        self.errors = errors
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.port: Optional[int] = None
+        self._generators: Dict[tuple, Generator] = {}
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """Listen on ``port`` (0 for any free port, see ``self.port``)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Close idle keep-alive connections so their handlers end now
+        # rather than being cancelled with the event loop.
+        handlers = dict(self._handlers)
+        for writer in handlers.values():
+            writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def generator(self, name: str, items: int, invalid_rate: float):
+        key = (name, items, invalid_rate)
+        generator = self._generators.get(key)
+        if generator is None:
+            if len(self._generators) >= self.max_generators:
+                del self._generators[next(iter(self._generators))]
+            generator = self._generators[key] = Generator(
+                self.schemas[name],
+                items=items,
+                invalid_rate=invalid_rate,
+                errors=self.errors,
+                seed=self.rng.random(),
+            )
+        return generator
+
+    async def _handle(self, reader, writer):
+        handler = asyncio.current_task()
+        self._handlers[handler] = writer
+        try:
+            while True:
+                head = await _read_head(reader)
+                if head is None:
+                    break
+                try:
+                    (method, target, *_), headers = head
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(f"Content-Length {length}")
+                except ValueError as error:
+                    # The connection cannot be read further: answer and
+                    # close it.
+                    body = json.dumps({"error": f"Invalid request: {error}"})
+                    await self._send(writer, 400, body, "none")
+                    break
+                if length:
+                    await reader.readexactly(length)
+                await self._respond(writer, target)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.pop(handler, None)
+            writer.close()
+
+    async def _respond(self, writer, target: str):
+        self.requests += 1
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        name = url.path.rsplit("/", 1)[-1]
+        if not url.path.startswith("/v1/") or name not in self.schemas:
+            body = json.dumps({"error": f"Unknown schema: {name}."})
+            return await self._send(writer, 404, body, "none")
+        try:
+            items = int(query.get("items", self.items))
+            if not 0 <= items <= self.max_items:
+                raise ValueError(
+                    f"items must be between 0 and {self.max_items}"
+                )
+            generator = self.generator(
+                name,
+                items,
+                float(query.get("invalid_rate", self.invalid_rate)),
+            )
+            if "error" in query:
+                kind = query["error"]
+                if kind == "truncate":
+                    text = json.dumps(generator.payload())
+                    text = text[: len(text) // 2]
+                else:
+                    payload, kind = generator.invalid(kind)
+                    text = json.dumps(payload)
+            else:
+                text, kind = generator.sample_json()
+        except (KeyError, ValueError) as error:
+            body = json.dumps({"error": f"Invalid request: {error}"})
+            return await self._send(writer, 400, body, "none")
+
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if query.get("stream") in ("1", "true"):
+            await self._stream(writer, text, kind or "none")
+        else:
+            await self._send(writer, 200, text, kind or "none")
+
+    @staticmethod
+    async def _send(writer, status: int, body: str, kind: str):
+        data = body.encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"X-Error-Kind: {kind}\r\n\r\n"
+            ).encode("latin-1")
+            + data
+        )
+        await writer.drain()
+
+    async def _stream(self, writer, text: str, kind: str):
+        writer.write(
+            (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/event-stream\r\n"
+                "Transfer-Encoding: chunked\r\n"
+                f"X-Error-Kind: {kind}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        offsets = list(range(0, len(text), self.chunk_size)) + [len(text)]
+        events = [
+            "data: " + json.dumps({"delta": text[start:stop]}) + "\n\n"
+            for start, stop in zip(offsets, offsets[1:])
+        ]
+        events.append("data: [DONE]\n\n")
+        for event in events:
+            data = event.encode("utf-8")
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+class Reply(NamedTuple):
+    status: int
+    text: str
+    error: Optional[str]
+    first_byte_s: float
+    total_s: float
+
+
+class FakeLLMClient:
+    def __init__(
+        self,
+        port: int,
+        host: str = "127.0.0.1",
+        stream: bool = False,
+        **params,
+    ):
+        """
+        A keep-alive client for ``FakeLLMServer``. ``params`` (items,
+        invalid_rate, error) are sent with every request.
+        """
+        self.host = host
+        self.port = port
+        self.stream = stream
+        self.params = params
+        self._idle: List[tuple] = []
+
+    async def get(self, schema: str, **params) -> Reply:
+        params = {**self.params, **params}
+        if self.stream:
+            params["stream"] = 1
+        query = "&".join(f"{k}={v}" for k, v in params.items())
+        target = f"/v1/{schema}" + (f"?{query}" if query else "")
+        if self._idle:
+            reader, writer = self._idle.pop()
+        else:
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        try:
+            start = time.perf_counter()
+            writer.write(
+                f"GET {target} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode(
+                    "latin-1"
+                )
+            )
+            await writer.drain()
+            head = await _read_head(reader)
+            if head is None:
+                raise ConnectionError("Connection closed by the server.")
+            first_byte = time.perf_counter()
+            (_, status, *_), headers = head
+            if headers.get("transfer-encoding") == "chunked":
+                text = await self._read_events(reader)
+            else:
+                length = int(headers["content-length"])
+                text = (await reader.readexactly(length)).decode("utf-8")
+        except BaseException:
+            writer.close()
+            raise
+        self._idle.append((reader, writer))
+        error = headers.get("x-error-kind", "none")
+        return Reply(
+            int(status),
+            text,
+            None if error == "none" else error,
+            first_byte - start,
+            time.perf_counter() - start,
+        )
+
+    @staticmethod
+    async def _read_events(reader) -> str:
+        pieces = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if not size:
+                await reader.readline()
+                return "".join(pieces)
+            event = await reader.readexactly(size + 2)
+            data = event.decode("utf-8").strip().removeprefix("data: ")
+            if data != "[DONE]":
+                pieces.append(json.loads(data)["delta"])
+
+    async def __call__(self, node, instance, response_schema):
+        """``dag.LLM``: answer with the raw text of a generated reply."""
+        return (await self.get(response_schema.__qualname__)).text
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, **options):
+    """Run a ``FakeLLMServer`` until cancelled."""
+    server = FakeLLMServer(**options)
+    await server.start(host, port)
+    logging.warning(f"Fake LLM listening on http://{host}:{server.port}/v1/")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def benchmark(
+    size: Optional[int] = None,
+    items: int = 5,
+    invalid_rate: float = 0.2,
+    concurrency: int = 20,
+) -> dict:
+    """
+    Generate ``size`` (default 20000) payloads per schema, valid and with
+    ``invalid_rate`` errors, check them against the schema, then time
+    ``size // 10`` requests to a local ``FakeLLMServer`` with
+    ``concurrency`` clients, with and without streaming.
+    """
+    from lucid_ai_schemas.Schemas import schemas
+
+    size = size or 20000
+    results: Dict[str, Any] = {
+        "config": {
+            "payloads": size,
+            "items": items,
+            "invalid_rate": invalid_rate,
+            "concurrency": concurrency,
+        },
+        "generation": {},
+    }
+    for model in (
+        schemas.PositionSchema,
+        schemas.PlotCollectionResponse,
+        schemas.CompanyFieldExtractorResponse,
+        schemas.ExplainerSchema,
+        schemas.SalaryGeneratorResponse,
+    ):
+        generator = Generator(model, items=items, seed=0)
+        start = time.perf_counter()
+        valid = [generator.payload() for _ in range(size)]
+        valid_s = time.perf_counter() - start
+
+        generator.invalid_rate = invalid_rate
+        start = time.perf_counter()
+        mixed = generator.batch(size)
+        mixed_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(size):
+            generator.sample_json()
+        json_s = time.perf_counter() - start
+
+        disabled = logging.root.manager.disable
+        logging.disable(logging.CRITICAL)
+        try:
+            checked = valid[:1000]
+            accepted = len(checked) - sum(
+                bool(_failing_fields(model, p)) for p in checked
+            )
+            invalid = [p for p, kind in mixed[:5000] if kind]
+            rejected = sum(bool(_failing_fields(model, p)) for p in invalid)
+        finally:
+            logging.disable(disabled)
+        results["generation"][model.__qualname__] = {
+            "valid_per_s": round(size / valid_s),
+            "mixed_per_s": round(size / mixed_s),
+            "json_per_s": round(size / json_s),
+            "valid_accepted": accepted / len(checked),
+            "invalid_rejected": rejected / max(1, len(invalid)),
+            "skipped_fields": generator.skipped,
+        }
+
+    requests = max(concurrency, size // 10)
+
+    async def load(stream: bool) -> dict:
+        async with FakeLLMServer(items=items, seed=0) as server:
+            clients = [
+                FakeLLMClient(server.port, stream=stream)
+                for _ in range(concurrency)
+            ]
+
+            async def worker(client, count):
+                for _ in range(count):
+                    await client.get("PositionSchema")
+
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(worker(c, requests // concurrency) for c in clients)
+            )
+            elapsed = time.perf_counter() - start
+            for client in clients:
+                await client.close()
+        return {
+            "requests": server.requests,
+            "requests_per_s": round(server.requests / elapsed),
+        }
+
+    results["server"] = {
+        "plain": asyncio.run(load(False)),
+        "streaming": asyncio.run(load(True)),
+    }
+    return results
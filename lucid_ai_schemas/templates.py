@@ -0,0 +1,295 @@
+"""
+Template catalog, to render only the relevant templates for a company.
+
+``TemplateAssignerSchema.template_list`` is one string pasted into the
+prompt next to the company details. With a large catalog most of it is
+irrelevant to the company at hand; ``TemplateCatalog`` indexes the
+templates once and renders the best ones under a token budget:
+
+    catalog = TemplateCatalog([
+        Template("SaaS metrics", "MRR, churn and CAC payback",
+                 sectors={Sectors.SAAS_SOFTWARE_AS_A_SERVICE}),
+        Template("Seed fundraising", stages={Stages.SEED_STAGE}),
+        ...
+    ])
+    schema = catalog.assign(TemplateAssignerSchema(**details), budget=800)
+    schema.template_list  # "SaaS metrics: MRR, churn and CAC payback\n..."
+
+A template targets sets of ``Sectors``, ``Stages`` and ``Countries``; an
+empty set means any. For each of the company's sectors, stage and
+location that is known, a template scores ``SPECIFIC`` points when it
+targets it, ``GENERIC`` when it targets any, nothing otherwise. The
+``freetext`` (and sectors outside the enum) adds up to ``TEXT`` points,
+the BM25 score of the template name and description
+(``search.TextIndex``) relative to the best one. Templates are rendered
+best first, ties in catalog order; those that do not fit the budget are
+skipped.
+"""
+
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+from typing import Tuple, Union
+
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyDetailsSchema,
+    Countries,
+    Sectors,
+    Stages,
+    TemplateAssignerSchema,
+)
+from lucid_ai_schemas.search import TextIndex
+from lucid_ai_schemas.tokens import count_tokens, estimate_tokens
+
+SPECIFIC = 2.0
+GENERIC = 1.0
+TEXT = 2.0
+
+
+def _key(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _lookup(enum) -> dict:
+    """Values and member names, whitespace and case insensitive."""
+    table = {}
+    for member in enum:
+        table[_key(member.value)] = member
+        table[_key(member.name.replace("_", " "))] = member
+    return table
+
+
+_SECTORS = _lookup(Sectors)
+_STAGES = _lookup(Stages)
+_COUNTRIES = _lookup(Countries)
+
+
+def _members(values, table, dimension: str) -> FrozenSet:
+    members = set()
+    for value in values or ():
+        member = table.get(_key(getattr(value, "value", value)))
+        if member is None:
+            raise ValueError(
+                f"Invalid {dimension}: {value}. "
+                f"Must be one of {[m.value for m in table.values()]}."
+            )
+        members.add(member)
+    return frozenset(members)
+
+
+class Template(NamedTuple):
+    name: str
+    description: str = ""
+    sectors: FrozenSet[Sectors] = frozenset()
+    stages: FrozenSet[Stages] = frozenset()
+    locations: FrozenSet[Countries] = frozenset()
+
+    def render(self) -> str:
+        if self.description:
+            return f"{self.name}: {self.description}"
+        return self.name
+
+
+def _template(value: Union[Template, dict]) -> Template:
+    fields = value._asdict() if isinstance(value, Template) else value
+    return Template(
+        fields["name"],
+        fields.get("description") or "",
+        _members(fields.get("sectors"), _SECTORS, "sector"),
+        _members(fields.get("stages"), _STAGES, "stage"),
+        _members(fields.get("locations"), _COUNTRIES, "location"),
+    )
+
+
+class TemplateCatalog:
+    def __init__(self, templates: Iterable[Union[Template, dict]]):
+        """
+        Index ``templates`` (``Template`` objects or dicts of the same
+        fields; enum values or members are both accepted).
+        """
+        self.templates: List[Template] = [_template(t) for t in templates]
+        self.lines = [t.render() for t in self.templates]
+        # Tokens of a line and its newline in the rendered list.
+        self.tokens = [estimate_tokens(line) + 1 for line in self.lines]
+        self.index = TextIndex(self.lines)
+        # dimension -> (positions targeting any, member -> positions)
+        self.dimensions: Dict[str, Tuple[list, Dict]] = {}
+        for dimension in ("sectors", "stages", "locations"):
+            generic, specific = [], {}
+            for position, template in enumerate(self.templates):
+                members = getattr(template, dimension)
+                if not members:
+                    generic.append(position)
+                for member in members:
+                    specific.setdefault(member, []).append(position)
+            self.dimensions[dimension] = (generic, specific)
+
+    def __len__(self):
+        return len(self.templates)
+
+    def scores(self, company: CompanyDetailsSchema) -> List[float]:
+        """The score of every template for ``company``."""
+        sectors = company.sectors
+        if isinstance(sectors, str):
+            sectors = [sectors]
+        known, other = set(), []
+        for sector in sectors or ():
+            member = _SECTORS.get(_key(sector))
+            if member is None:
+                other.append(sector)
+            else:
+                known.add(member)
+        wanted = {"sectors": known}
+        if company.company_stage:
+            stage = _STAGES.get(_key(company.company_stage))
+            wanted["stages"] = {stage} if stage else set()
+        if company.location:
+            location = _COUNTRIES.get(_key(company.location))
+            wanted["locations"] = {location} if location else set()
+
+        scores = [0.0] * len(self.templates)
+        for dimension, members in wanted.items():
+            if not members:
+                continue
+            generic, specific = self.dimensions[dimension]
+            for position in generic:
+                scores[position] += GENERIC
+            matched = set()
+            for member in members:
+                matched.update(specific.get(member, ()))
+            for position in matched:
+                scores[position] += SPECIFIC
+        query = " ".join(filter(None, [company.freetext, *other]))
+        if query:
+            found = self.index.search(query, len(self.templates))
+            if found:
+                best = found[0][1]
+                for position, score in found:
+                    scores[position] += TEXT * score / best
+        return scores
+
+    def select(
+        self,
+        company: CompanyDetailsSchema,
+        budget: Optional[int] = None,
+        k: Optional[int] = None,
+    ) -> List[Template]:
+        """
+        The best templates for ``company``: at most ``k``, rendering to
+        at most ``budget`` tokens.
+        """
+        scores = self.scores(company)
+        ranked = heapq.nlargest(
+            k or len(scores), range(len(scores)), key=lambda p: scores[p]
+        )
+        if budget is None:
+            return [self.templates[p] for p in ranked]
+        selected, used = [], 0
+        for position in ranked:
+            if used + self.tokens[position] <= budget:
+                selected.append(self.templates[position])
+                used += self.tokens[position]
+        return selected
+
+    @staticmethod
+    def render(templates: Iterable[Template]) -> str:
+        return "\n".join(template.render() for template in templates)
+
+    def assign(
+        self,
+        company: CompanyDetailsSchema,
+        budget: int = 1000,
+        k: Optional[int] = None,
+    ) -> TemplateAssignerSchema:
+        """
+        The ``TemplateAssignerSchema`` for ``company`` with the selected
+        templates in ``template_list`` (at most ``budget`` tokens).
+        """
+        details = company.model_dump(exclude={"template_list"})
+        return TemplateAssignerSchema.model_construct(
+            **details,
+            template_list=self.render(self.select(company, budget, k)),
+        )
+
+
+def benchmark(size: Optional[int] = None, companies: int = 500) -> dict:
+    """
+    Build a catalog of ``size`` (default 2000) templates and select the
+    templates of ``companies`` companies under an 800 token budget:
+    build time, selection latency and the prompt size with the whole
+    catalog and with the selection.
+    """
+    import random
+    import time
+
+    size = size or 2000
+    rng = random.Random(0)
+    sectors, stages = list(Sectors), list(Stages)
+    countries = list(Countries)[:40]
+    topics = [
+        "revenue model",
+        "hiring plan",
+        "fundraising",
+        "pricing",
+        "unit economics",
+        "cash runway",
+        "marketing funnel",
+        "churn",
+        "inventory",
+        "subscriptions",
+        "marketplace take rate",
+        "payroll",
+    ]
+    templates = []
+    for i in range(size):
+        topic = rng.choice(topics)
+        templates.append(
+            Template(
+                f"Template {i} {topic}",
+                f"Plan the {topic} with {rng.choice(topics)} drivers",
+                frozenset(rng.sample(sectors, rng.choice([0, 1, 1, 2]))),
+                frozenset(rng.sample(stages, rng.choice([0, 1, 2]))),
+                frozenset(rng.sample(countries, rng.choice([0, 0, 0, 1]))),
+            )
+        )
+    details = [
+        CompanyDetailsSchema(
+            sectors=[s.value for s in rng.sample(sectors, 2)],
+            company_stage=rng.choice(stages).value,
+            location=rng.choice(countries).value,
+            freetext=f"We need help with our {rng.choice(topics)} "
+            f"and {rng.choice(topics)}",
+        )
+        for _ in range(companies)
+    ]
+
+    start = time.perf_counter()
+    catalog = TemplateCatalog(templates)
+    build_s = time.perf_counter() - start
+
+    latencies, assigned = [], []
+    for company in details:
+        start = time.perf_counter()
+        assigned.append(catalog.assign(company, budget=800))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    full = [
+        TemplateAssignerSchema(
+            **company.model_dump(), template_list="\n".join(catalog.lines)
+        )
+        for company in details[:20]
+    ]
+    full_tokens = sum(map(count_tokens, full)) / len(full)
+    selected_tokens = sum(map(count_tokens, assigned)) / len(assigned)
+    return {
+        "config": {"templates": size, "companies": companies, "budget": 800},
+        "build_s": build_s,
+        "select_ms_p50": latencies[len(latencies) // 2] * 1e3,
+        "select_ms_p95": latencies[int(len(latencies) * 0.95)] * 1e3,
+        "templates_selected": sum(
+            s.template_list.count("\n") + 1 for s in assigned
+        )
+        / len(assigned),
+        "prompt_tokens_full": full_tokens,
+        "prompt_tokens_selected": selected_tokens,
+        "prompt_reduction": round(full_tokens / selected_tokens, 1),
+    }
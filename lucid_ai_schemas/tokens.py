@@ -0,0 +1,322 @@
+"""
+Token estimation and budget planning for prompt inputs.
+
+``estimate_tokens`` approximates what a BPE tokenizer (cl100k-like)
+produces for a text without any model files: the text is split the way
+those tokenizers pre-split it (words with their leading space, numbers
+in groups of three digits, punctuation runs, whitespace runs), long
+words counting one token per 8 letters. Expect roughly +-15% on English
+text and JSON, which is what ``plan_budget``'s safety margin is for.
+Counts of short texts (names, descriptions, field values) are memoized,
+so unchanged fields cost a dict lookup; long texts are rare repeats and
+would keep whole prompts alive in the cache, so they are counted anew.
+
+``plan_budget`` trims an input schema until its rendered form fits a
+budget. Only fields listed in the priorities are touched, lowest
+priority first and, within a priority, largest first. Strings are
+summarized (when a ``summarize`` callable is given) or truncated, lists
+and dicts keep their leading items, and anything else is dropped. The
+first list item that does not fit is trimmed rather than dropped when it
+is a model or dict, e.g. an ``ExplainerSchema`` formula keeps its leading
+transactions:
+
+    plan = plan_budget(AssumptionsInputSchema(**payload), budget=8000)
+    plan.instance, plan.tokens, plan.actions
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from pydantic import BaseModel
+
+# One match per estimated token, in a single regex pass.
+_PIECE = re.compile(r" ?[^\W\d_]{1,8}| ?\d{1,3}| ?[^\s\w]{1,2}|_+|\s+")
+
+TRUNCATED = " [truncated]"
+
+# Fields that may be trimmed per schema, lowest priority trimmed first.
+# Unlisted fields are never touched.
+PRIORITIES: Dict[str, Dict[str, int]] = {
+    "AssumptionsInputSchema": {"formulas": 0, "products": 1, "freetext": 2},
+    "ExplainerSchema": {"input": 0},
+    "CompanySummaryRefinerSchema": {
+        "scraped_website_data": 0,
+        "company_object": 1,
+        "seo_description": 2,
+        "short_description": 3,
+    },
+}
+
+
+def _default(value: Any) -> Any:
+    # Models nested in lists and dicts render as their JSON, as in
+    # ``to_dict()``.
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+_dumps = json.JSONEncoder(ensure_ascii=False, default=_default).encode
+
+
+# Longest text whose count is memoized.
+CACHED_CHARS = 1024
+
+
+@lru_cache(maxsize=16384)
+def _cached_tokens(text: str) -> int:
+    return len(_PIECE.findall(text))
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count of ``text``."""
+    if len(text) <= CACHED_CHARS:
+        return _cached_tokens(text)
+    return len(_PIECE.findall(text))
+
+
+def value_tokens(value: Any) -> int:
+    """Tokens of ``value`` as it appears in the JSON rendered input."""
+    if value is None:
+        return 0
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    return estimate_tokens(value if isinstance(value, str) else _dumps(value))
+
+
+def render_input(instance: BaseModel) -> str:
+    """The input as sent to the model: ``to_dict()`` as JSON."""
+    if hasattr(instance, "to_dict"):
+        return _dumps(instance.to_dict())
+    return _dumps(instance.model_dump(mode="json"))
+
+
+def count_tokens(instance: BaseModel) -> int:
+    return estimate_tokens(render_input(instance))
+
+
+def field_tokens(instance: BaseModel) -> Dict[str, int]:
+    """Estimated tokens of every field of ``instance``."""
+    return {
+        name: value_tokens(getattr(instance, name))
+        for name in type(instance).model_fields
+    }
+
+
+class Action(NamedTuple):
+    field: str
+    action: str  # "summarized", "truncated", "kept N of M" or "dropped"
+    tokens_before: int
+    tokens_after: int
+
+
+class BudgetPlan(NamedTuple):
+    instance: BaseModel
+    tokens: int
+    budget: int
+    fits: bool
+    actions: List[Action]
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Cut ``text`` so it (plus the truncation marker) fits."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    target = max_tokens - estimate_tokens(TRUNCATED)
+    if target <= 0:
+        return ""
+    # Most pieces are one token: cut there, then shave off the long words
+    # the cut undercounted.
+    pieces = _PIECE.findall(text)[:target]
+    while pieces and estimate_tokens("".join(pieces)) > target:
+        pieces = pieces[: len(pieces) * 19 // 20]
+    return "".join(pieces) + TRUNCATED
+
+
+def _trim_item(item: Any, max_tokens: int, summarize) -> Any:
+    """
+    ``item`` (a model or dict) with its largest text, list or dict
+    shrunk so that it fits ``max_tokens``; None if it cannot.
+    """
+    if isinstance(item, BaseModel):
+        fields = {
+            name: getattr(item, name) for name in type(item).model_fields
+        }
+    elif isinstance(item, dict):
+        fields = item
+    else:
+        return None
+    sizes = {
+        name: value_tokens(value)
+        for name, value in fields.items()
+        if isinstance(value, (str, list, dict))
+    }
+    if not sizes:
+        return None
+    name = max(sizes, key=sizes.get)
+    over = value_tokens(item) - max_tokens
+    shrunk, _ = _shrink(fields[name], sizes[name] - over, summarize)
+    if shrunk is None:
+        return None
+    if isinstance(item, BaseModel):
+        trimmed = item.model_copy(update={name: shrunk})
+    else:
+        trimmed = {**item, name: shrunk}
+    return trimmed if value_tokens(trimmed) <= max_tokens else None
+
+
+def _shrink(value: Any, max_tokens: int, summarize) -> tuple:
+    """Return ``(new value, action)`` fitting ``max_tokens``, if possible."""
+    if max_tokens <= 0:
+        return None, "dropped"
+    if isinstance(value, str):
+        if summarize is not None:
+            return summarize(value, max_tokens), "summarized"
+        return truncate_text(value, max_tokens), "truncated"
+    if isinstance(value, (list, dict)):
+        items = list(value.items() if isinstance(value, dict) else value)
+        kept, used, trimmed = [], 1, None
+        for item in items:
+            # One separator token per item on top of its own tokens.
+            cost = value_tokens(item) + 1
+            if used + cost > max_tokens:
+                if not isinstance(value, dict):
+                    trimmed = _trim_item(
+                        item, max_tokens - used - 1, summarize
+                    )
+                break
+            used += cost
+            kept.append(item)
+        if trimmed is not None:
+            kept.append(trimmed)
+        if not kept:
+            return None, "dropped"
+        shrunk = dict(kept) if isinstance(value, dict) else kept
+        action = f"kept {len(kept)} of {len(items)}"
+        if trimmed is not None:
+            action += ", last trimmed"
+        return shrunk, action
+    return None, "dropped"
+
+
+def plan_budget(
+    instance: BaseModel,
+    budget: int,
+    priorities: Optional[Dict[str, int]] = None,
+    summarize: Optional[Callable[[str, int], str]] = None,
+    margin: float = 0.1,
+) -> BudgetPlan:
+    """
+    Trim ``instance`` until its rendered input is estimated to fit in
+    ``budget`` tokens minus a ``margin`` share kept for estimation error.
+    ``priorities`` defaults to ``PRIORITIES`` for the schema.
+    """
+    if priorities is None:
+        priorities = PRIORITIES.get(type(instance).__qualname__, {})
+    target = int(budget * (1 - margin))
+    total = count_tokens(instance)
+    actions: List[Action] = []
+    candidates = sorted(
+        (name for name in priorities if name in type(instance).model_fields),
+        key=lambda name: (
+            priorities[name],
+            -value_tokens(getattr(instance, name)),
+        ),
+    )
+    for name in candidates:
+        if total <= target:
+            break
+        value = getattr(instance, name)
+        before = value_tokens(value)
+        if not before:
+            continue
+        shrunk, action = _shrink(value, before - (total - target), summarize)
+        instance = instance.model_copy(update={name: shrunk})
+        after = value_tokens(shrunk)
+        actions.append(Action(name, action, before, after))
+        total = count_tokens(instance)
+    return BudgetPlan(instance, total, budget, total <= target, actions)
+
+
+def cache_info():
+    return _cached_tokens.cache_info()
+
+
+def clear_cache():
+    _cached_tokens.cache_clear()
+
+
+def benchmark(size: Optional[int] = None, budget: int = 8000) -> dict:
+    """
+    Estimate and plan ``size`` (default 1000) oversized
+    ``CompanySummaryRefinerSchema``/``AssumptionsInputSchema`` inputs
+    down to ``budget`` tokens: cold (every text new), and warm, where the
+    unchanged fields hit the count cache.
+    """
+    import random
+    import time
+
+    from lucid_ai_schemas.Schemas.schemas import (
+        AssumptionsInputSchema,
+        CompanySummaryRefinerSchema,
+    )
+
+    size = size or 1000
+    rng = random.Random(0)
+    words = (
+        "revenue growth customers platform subscription pricing enterprise "
+        "onboarding marketing budget hiring payroll churn retention "
+        "international expansion 2025 12.5% $40,000 analytics"
+    ).split()
+
+    def text(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    inputs = []
+    for i in range(size):
+        if i % 2:
+            inputs.append(
+                CompanySummaryRefinerSchema(
+                    seo_description=text(40),
+                    short_description=text(20),
+                    scraped_website_data=text(12_000),
+                )
+            )
+        else:
+            inputs.append(
+                AssumptionsInputSchema(
+                    freetext=text(80),
+                    formulas=[
+                        {"id": f, "name": text(4), "value": text(12)}
+                        for f in range(800)
+                    ],
+                )
+            )
+    rendered_bytes = sum(len(render_input(x)) for x in inputs)
+
+    def run():
+        start = time.perf_counter()
+        plans = [plan_budget(x, budget) for x in inputs]
+        return time.perf_counter() - start, plans
+
+    clear_cache()
+    cold_s, plans = run()
+    warm_s, _ = run()
+    clear_cache()
+    start = time.perf_counter()
+    for x in inputs:
+        count_tokens(x)
+    estimate_s = time.perf_counter() - start
+    return {
+        "config": {"inputs": size, "budget": budget},
+        "input_mb": rendered_bytes / 1e6,
+        "estimate_s": estimate_s,
+        "estimate_mb_per_s": rendered_bytes / 1e6 / estimate_s,
+        "plan_cold_ms_per_input": cold_s / size * 1e3,
+        "plan_warm_ms_per_input": warm_s / size * 1e3,
+        "fit": sum(plan.fits for plan in plans) / size,
+        "mean_tokens_before": sum(count_tokens(x) for x in inputs) / size,
+        "mean_tokens_after": sum(plan.tokens for plan in plans) / size,
+    }
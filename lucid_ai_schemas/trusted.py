@@ -0,0 +1,284 @@
+"""
+Trusted construction for payloads we wrote ourselves.
+
+Rehydrating ``PositionSchema``, ``ProductGeneratorOutput`` or
+``ExplainerSchema`` rows from our own database does not need the full
+validation (Countries/department lookups, constraints...). ``construct``
+builds the models without validating, recursing into the nested
+``Positions``/``Product``/``Formula``/``Transaction`` classes and turning
+enum values back into enum members so the result looks like a validated
+instance.
+
+``TrustedLoader`` adds sampled verification: a configurable share of the
+rows is fully validated and compared with the trusted result, so drift
+between stored data and the current schema is noticed:
+
+    loader = TrustedLoader(PositionSchema, sample_rate=0.01)
+    plans = loader.load_many(rows)
+    loader.stats  # {"loaded": ..., "verified": ..., "drifted": ...}
+"""
+
+import logging
+import random
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from lucid_ai_schemas.caches import Memo
+from lucid_ai_schemas.introspect import field_kinds
+
+ON_DRIFT = ("log", "raise", "ignore")
+
+
+class DriftError(ValueError):
+    """A trusted payload does not match what validation produces."""
+
+
+def _enum(enum: type) -> Callable[[Any], Any]:
+    get = enum._value2member_map_.get
+
+    def convert(value):
+        # Members map to themselves (str enums hash like their value,
+        # other members miss and fall back to themselves); unknown values
+        # are kept as they are and reported by verification.
+        return get(value, value)
+
+    return convert
+
+
+def _converters(model: type) -> Dict[str, Callable[[Any], Any]]:
+    converters: Dict[str, Callable[[Any], Any]] = {}
+    for name, kind in field_kinds(model).items():
+        if kind is None:
+            continue
+        category, target = kind
+        if category == "model":
+
+            def convert(value, target=target):
+                if isinstance(value, dict):
+                    return construct(target, value)
+                return value
+
+        elif category == "models":
+
+            def convert(value, target=target):
+                if isinstance(value, list):
+                    return [
+                        construct(target, v) if isinstance(v, dict) else v
+                        for v in value
+                    ]
+                return value
+
+        elif category == "enum":
+            convert = _enum(target)
+        else:
+
+            def convert(value, item=_enum(target)):
+                if isinstance(value, list):
+                    return [item(v) for v in value]
+                return value
+
+        converters[name] = convert
+    return converters
+
+
+_IMMUTABLE = (type(None), bool, int, float, str, bytes, tuple, Enum)
+_UNSET = object()
+
+
+def _builder(model: type) -> Callable[[dict], BaseModel]:
+    """
+    Compile a trusted constructor for ``model``: what ``model_construct``
+    does, minus the per call field introspection.
+    """
+    if model.__pydantic_post_init__ or model.__private_attributes__:
+        return lambda data: model.model_construct(**data)
+
+    fields = model.model_fields
+    field_names = frozenset(fields)
+    allow_extra = model.model_config.get("extra") == "allow"
+    # Every field in order, so instances dump their fields in the same
+    # order as validated ones; unset placeholders are filled or removed.
+    defaults: Dict[str, Any] = {}
+    factories: Dict[str, Callable[[], Any]] = {}
+    required = set()
+    for name, field in fields.items():
+        defaults[name] = _UNSET
+        if field.is_required():
+            required.add(name)
+        elif field.default_factory is None and isinstance(
+            field.default, _IMMUTABLE
+        ):
+            defaults[name] = field.default
+        else:
+            factories[name] = partial(
+                field.get_default, call_default_factory=True
+            )
+    converters = list(_converters(model).items())
+    new = model.__new__
+    set_attribute = object.__setattr__
+
+    def build(data: dict) -> BaseModel:
+        keys = data.keys()
+        extra = None
+        if keys <= field_names:
+            values = {**defaults, **data}
+            fields_set = set(keys)
+        else:
+            values = dict(defaults)
+            extra = {}
+            for key, value in data.items():
+                if key in field_names:
+                    values[key] = value
+                else:
+                    extra[key] = value
+            fields_set = keys & field_names
+            if not allow_extra:
+                extra = None
+        for name, factory in factories.items():
+            if name not in fields_set:
+                values[name] = factory()
+        if not required <= fields_set:
+            for name in required - fields_set:
+                del values[name]
+        for name, convert in converters:
+            if name in values:
+                values[name] = convert(values[name])
+        instance = new(model)
+        set_attribute(instance, "__dict__", values)
+        set_attribute(instance, "__pydantic_fields_set__", fields_set)
+        set_attribute(instance, "__pydantic_extra__", extra)
+        set_attribute(instance, "__pydantic_private__", None)
+        return instance
+
+    return build
+
+
+_builders = Memo(_builder)
+
+
+def construct(model: type, data: dict) -> BaseModel:
+    """
+    Build ``model`` from ``data`` without validation, recursively.
+    Only use it for data that was produced by validating ``model``.
+    """
+    return _builders[model](data)
+
+
+class TrustedLoader:
+    def __init__(
+        self,
+        model: type,
+        sample_rate: float = 0.01,
+        on_drift: str = "log",
+        seed: Optional[int] = None,
+    ):
+        if on_drift not in ON_DRIFT:
+            raise ValueError(
+                f"Invalid on_drift: {on_drift}. Must be one of {ON_DRIFT}."
+            )
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1.")
+        self.model = model
+        self.sample_rate = sample_rate
+        self.on_drift = on_drift
+        self._random = random.Random(seed).random
+        self.loaded = 0
+        self.verified = 0
+        self.drifted = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "verified": self.verified,
+            "drifted": self.drifted,
+        }
+
+    def load(self, data: dict) -> BaseModel:
+        """Trusted construct; a ``sample_rate`` share is also validated."""
+        self.loaded += 1
+        instance = construct(self.model, data)
+        if self.sample_rate and self._random() < self.sample_rate:
+            return self.verify(data, instance)
+        return instance
+
+    def load_many(self, rows: Iterable[dict]) -> List[BaseModel]:
+        return [self.load(row) for row in rows]
+
+    def verify(self, data: dict, instance: BaseModel) -> BaseModel:
+        """
+        Fully validate ``data`` and compare with the trusted ``instance``.
+        Returns the validated instance.
+        """
+        self.verified += 1
+        try:
+            validated = self.model.model_validate(data)
+        except ValidationError as error:
+            self._drift(
+                f"{self.model.__qualname__} failed validation: " f"{error}"
+            )
+            return instance
+        if validated.model_dump() != instance.model_dump():
+            self._drift(
+                f"{self.model.__qualname__} changed on validation: "
+                f"stored {data!r}"
+            )
+        return validated
+
+    def _drift(self, message: str):
+        self.drifted += 1
+        if self.on_drift == "raise":
+            raise DriftError(message)
+        if self.on_drift == "log":
+            logging.warning(f"Trusted payload drift. {message}")
+
+
+def benchmark(size: Optional[int] = None, repeat: int = 3) -> dict:
+    """
+    Rehydrate large nested payloads (``size`` items per list, default
+    10k) with ``model_validate``, ``construct`` and a ``TrustedLoader``
+    verifying 1% of the rows.
+    """
+    import time
+
+    from lucid_ai_schemas.bench import SAMPLES
+    from lucid_ai_schemas.Schemas import schemas
+
+    size = size or 10_000
+    results = {}
+    for name in (
+        "PositionSchema",
+        "ProductGeneratorOutput",
+        "ExplainerSchema",
+    ):
+        model = getattr(schemas, name)
+        # ExplainerSchema samples hold size // 100 formulas of ``n``
+        # transactions each, so n = size // 10 gives 10 * size items.
+        n = size // 10 if name == "ExplainerSchema" else size
+        # What we would have stored: the dump of a validated instance.
+        stored = model.model_validate(SAMPLES[name](n)).model_dump(mode="json")
+        rows = [stored] * 100
+
+        def best(func):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        validate_s = best(lambda: model.model_validate(stored))
+        construct_s = best(lambda: construct(model, stored))
+        loader = TrustedLoader(model, sample_rate=0.01, seed=0)
+        sampled_s = best(lambda: loader.load_many(rows)) / len(rows)
+        results[name] = {
+            "model_validate_s": validate_s,
+            "construct_s": construct_s,
+            "loader_1pct_s": sampled_s,
+            "speedup": round(validate_s / construct_s, 2),
+            "drifted": loader.drifted,
+        }
+    return {"config": {"items": size}, "schemas": results}
@@ -0,0 +1,309 @@
+"""
+Schema versions and migrations for stored payloads.
+
+Stored payloads are wrapped in a version tag:
+
+    {"schema": "PositionSchema", "version": 2, "data": {...}}
+
+Every change of a stored schema registers the steps that upgrade a
+payload from the previous version. The steps of a whole upgrade path
+(e.g. 1 -> 3) are compiled once into a single function, so upgrading a
+record runs a flat list of small in-place dict operations:
+
+    MIGRATIONS.register(
+        "PositionSchema", 2,
+        each("positions", rename("salary", "yearly_salary")),
+    )
+
+Records are upgraded lazily when read (``upgrade``/``load``) or in bulk,
+streaming, with ``migrate_stream``/``migrate_file``. Payloads without a
+tag are taken as version 1 of the schema they are read as.
+
+Steps mutate the payload in place: they are meant for freshly parsed
+records.
+"""
+
+import gzip
+import json
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from typing import Tuple
+
+from pydantic import BaseModel
+
+from lucid_ai_schemas.Schemas.dates import coerce_date
+from lucid_ai_schemas.caches import Memo
+
+Step = Callable[[dict], None]
+
+
+def rename(old: str, new: str) -> Step:
+    def step(data: dict):
+        if old in data:
+            data[new] = data.pop(old)
+
+    return step
+
+
+def drop(field: str) -> Step:
+    def step(data: dict):
+        data.pop(field, None)
+
+    return step
+
+
+def default(field: str, value: Any) -> Step:
+    """Set ``field`` to ``value`` when it is missing."""
+
+    def step(data: dict):
+        data.setdefault(field, value)
+
+    return step
+
+
+def convert(field: str, func: Callable[[Any], Any]) -> Step:
+    """Replace the value of ``field`` (when present) with ``func(value)``."""
+
+    def step(data: dict):
+        if field in data:
+            data[field] = func(data[field])
+
+    return step
+
+
+def each(field: str, *steps: Step) -> Step:
+    """Apply ``steps`` to every item of the list in ``field``."""
+    run = _chain(steps)
+
+    def step(data: dict):
+        items = data.get(field)
+        if items:
+            for item in items:
+                run(item)
+
+    return step
+
+
+def _chain(steps) -> Step:
+    steps = tuple(steps)
+    if len(steps) == 1:
+        return steps[0]
+
+    def run(data: dict):
+        for step in steps:
+            step(data)
+
+    return run
+
+
+class Migrations:
+    def __init__(self):
+        self._steps: Dict[str, Dict[int, tuple]] = {}
+        self._lock = threading.Lock()
+        self._upgraders = Memo(self._upgrader)
+
+    def register(self, schema: str, version: int, *steps: Step):
+        """Register the steps upgrading ``schema`` to ``version``."""
+        if version < 2:
+            raise ValueError(f"Invalid version: {version}. Must be >= 2.")
+        with self._lock:
+            self._steps.setdefault(schema, {})[version] = steps
+            # A new table rather than clear(): an upgrader still being
+            # built from the old steps lands in the old one.
+            self._upgraders = Memo(self._upgrader)
+
+    def upgrader(self, schema: str, version: int) -> Optional[Step]:
+        """
+        The compiled upgrade of ``schema`` from ``version`` to the current
+        one, None when there is nothing to do.
+        """
+        return self._upgraders((schema, version))
+
+    def current(self, schema: str) -> int:
+        """Latest version of ``schema``; 1 until a migration is added."""
+        return max(self._steps.get(schema, {1: ()}), default=1)
+
+    def _upgrader(self, key: Tuple[str, int]) -> Optional[Step]:
+        schema, version = key
+        current = self.current(schema)
+        if version > current:
+            raise ValueError(
+                f"Invalid version: {version} for {schema}. "
+                f"Must be at most {current}."
+            )
+        versions = self._steps.get(schema, {})
+        steps = []
+        for target in range(version + 1, current + 1):
+            if target not in versions:
+                raise ValueError(
+                    f"No migration of {schema} to version {target}."
+                )
+            steps.extend(versions[target])
+        return _chain(steps) if steps else None
+
+
+MIGRATIONS = Migrations()
+
+# Dates are normalized to YYYY-MM-DD since version 2.
+MIGRATIONS.register(
+    "PositionSchema",
+    2,
+    each("positions", convert("start_date", coerce_date)),
+)
+# Dates are normalized since version 2; amounts are kept as given, as
+# validation does.
+for _schema in ("CompanyDetailsSchema", "AssumptionsInputSchema"):
+    MIGRATIONS.register(
+        _schema, 2, convert("raise_next_round_date", coerce_date)
+    )
+# ProductGeneratorOutput and AssumptionsGeneratorResponse: version 1.
+
+
+def _name(schema) -> str:
+    return schema if isinstance(schema, str) else schema.__qualname__
+
+
+def tag(
+    schema, data: Any, registry: Migrations = MIGRATIONS
+) -> Dict[str, Any]:
+    """Wrap a payload (or model instance) of the current version."""
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    name = _name(schema)
+    return {"schema": name, "version": registry.current(name), "data": data}
+
+
+def upgrade(
+    record: dict, schema=None, registry: Migrations = MIGRATIONS
+) -> Dict[str, Any]:
+    """
+    Bring a tagged record (or an untagged payload of ``schema``, taken as
+    version 1) to the current version.
+    """
+    if "version" not in record or "data" not in record:
+        if schema is None:
+            raise ValueError("Untagged payloads need their schema.")
+        record = {"schema": _name(schema), "version": 1, "data": record}
+    name = record.get("schema") or _name(schema)
+    upgrader = registry.upgrader(name, record["version"])
+    if upgrader is None:
+        return record
+    upgrader(record["data"])
+    return {
+        "schema": name,
+        "version": registry.current(name),
+        "data": record["data"],
+    }
+
+
+def load(
+    record: dict,
+    model: type,
+    trusted: bool = False,
+    registry: Migrations = MIGRATIONS,
+) -> BaseModel:
+    """
+    Upgrade ``record`` and build ``model`` from it, validating it unless
+    ``trusted`` (see ``lucid_ai_schemas.trusted``).
+    """
+    data = upgrade(record, model, registry)["data"]
+    if trusted:
+        from lucid_ai_schemas.trusted import construct
+
+        return construct(model, data)
+    return model.model_validate(data)
+
+
+def migrate_stream(
+    records: Iterable[dict],
+    schema=None,
+    batch_size: int = 10_000,
+    registry: Migrations = MIGRATIONS,
+) -> Iterator[List[dict]]:
+    """Upgrade ``records`` lazily, yielding batches of ``batch_size``."""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield [upgrade(record, schema, registry) for record in batch]
+
+
+def migrate_file(
+    source: str,
+    destination: str,
+    schema=None,
+    batch_size: int = 10_000,
+    registry: Migrations = MIGRATIONS,
+) -> int:
+    """
+    Rewrite a JSON lines file (gzip if it ends with ``.gz``) with every
+    record upgraded. Returns the number of records written.
+    """
+
+    def opener(path, mode):
+        if path.endswith(".gz"):
+            return gzip.open(path, mode + "t", compresslevel=6)
+        return open(path, mode)
+
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    count = 0
+    with opener(source, "r") as src, opener(destination, "w") as dst:
+        records = (json.loads(line) for line in src if line.strip())
+        for batch in migrate_stream(records, schema, batch_size, registry):
+            dst.write("".join(encode(record) + "\n" for record in batch))
+            count += len(batch)
+    return count
+
+
+def benchmark(size: Optional[int] = None, positions: int = 3) -> dict:
+    """
+    Upgrade ``size`` (default 1M) version 1 ``PositionSchema`` records of
+    ``positions`` positions with the compiled migrations, and compare
+    with rewriting them through the model (validate + dump).
+    """
+    import time
+
+    from lucid_ai_schemas.bench import SAMPLES
+    from lucid_ai_schemas.Schemas.schemas import PositionSchema
+
+    size = size or 1_000_000
+    sample = SAMPLES["PositionSchema"](positions)
+    dates = ["March 2025", "2025-03-01", "Q3 2025", "Jan 5, 2026"]
+    encoded = []
+    for i in range(size):
+        for position in sample["positions"]:
+            position["start_date"] = dates[i % len(dates)]
+        encoded.append(
+            json.dumps(
+                {"schema": "PositionSchema", "version": 1, "data": sample}
+            )
+        )
+
+    def timed(rewrite) -> float:
+        records = [json.loads(line) for line in encoded]
+        start = time.perf_counter()
+        rewrite(records)
+        return time.perf_counter() - start
+
+    def compiled(records):
+        for _ in migrate_stream(records):
+            pass
+
+    def through_model(records):
+        for record in records:
+            PositionSchema.model_validate(record["data"]).model_dump(
+                mode="json"
+            )
+
+    compiled_s = timed(compiled)
+    model_s = timed(through_model)
+    return {
+        "config": {"records": size, "positions": positions},
+        "compiled_s": compiled_s,
+        "compiled_per_s": size / compiled_s,
+        "through_model_s": model_s,
+        "through_model_per_s": size / model_s,
+        "speedup": round(model_s / compiled_s, 2),
+    }
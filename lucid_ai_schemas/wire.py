@@ -0,0 +1,387 @@
+"""
+Compact binary transport of schema instances between our services.
+
+``Ai_utilsBase`` schemas (``PositionSchema``, ``ExplainerSchema``,
+``LogAIResponseObject``...) get ``to_bytes`` and ``from_bytes``; ``encode``
+and ``decode`` do the same for any model:
+
+    data = plan.to_bytes()
+    PositionSchema.from_bytes(data)                  # validated
+    PositionSchema.from_bytes(data, validate=False)  # trusted, faster
+
+The layout is schema aware. A model is written as the list of its field
+values in field order, without the keys; a list of models is written by
+columns, one list per field. ``Countries``, ``Sectors``, ``Departments``
+and every other enum field hold the position of the member in its enum.
+Everything else is the JSON form of the value (``model_dump(mode=
+"json")``), so decoding gives back exactly what parsing the JSON would:
+``from_bytes(x.to_bytes()).model_dump_json() == x.model_dump_json()``.
+
+The values are packed with msgpack, which the default format needs
+(``pip install lucid_ai_schemas[wire]``). ``format="marshal"`` is an
+opt-in for tests and benchmarks without msgpack only: marshal data
+depends on the Python version, and ``marshal`` is not safe to read
+untrusted data with, so ``decode`` refuses it unless ``allow_marshal``.
+The header records the packer and a fingerprint of the layout: reading
+bytes written for another version of a schema (fields or enum members
+added, removed or reordered) raises ValueError rather than shifting
+values into the wrong fields, and so do malformed bytes and a wrong
+number of values. Enum values that are not members (in an instance built
+without validation) are written as they are.
+"""
+
+import marshal
+import zlib
+from typing import Any, Callable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from lucid_ai_schemas.caches import Memo
+from lucid_ai_schemas.introspect import field_kinds
+from lucid_ai_schemas.trusted import construct
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+MAGIC = b"LW"
+FORMATS = ("marshal", "msgpack")
+DEFAULT_FORMAT = "msgpack"
+_HEADER = len(MAGIC) + 1 + 4
+_FINGERPRINT = slice(len(MAGIC) + 1, _HEADER)
+
+
+def _pack(format: str) -> Callable[[Any], bytes]:
+    if format == "marshal":
+        return marshal.dumps
+    if format not in FORMATS:
+        raise ValueError(
+            f"Invalid format: {format}. Must be one of {FORMATS}."
+        )
+    if msgpack is None:
+        raise ImportError("the msgpack format needs: pip install msgpack")
+    return msgpack.Packer(use_bin_type=True).pack
+
+
+def _unpack(format: str) -> Callable[[bytes], Any]:
+    if format == "marshal":
+        return marshal.loads
+    if msgpack is None:
+        raise ImportError("the msgpack format needs: pip install msgpack")
+    return lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _plain(value):
+    return value
+
+
+class _Layout:
+    """How a model is written: encoders and decoders per field."""
+
+    def __init__(self, model: type):
+        self.model = model
+        self.names = tuple(model.model_fields)
+        self.fields = frozenset(self.names)
+        self.extra = model.model_config.get("extra") == "allow"
+        # Values written per instance: the fields, then the extras.
+        self.width = len(self.names) + self.extra
+        self.encoders = []  # per value
+        self.column_encoders = []  # per column of a list of models
+        self.decoders = []
+        self.column_decoders = []
+        signature = [model.__name__, self.extra]
+        for name, kind in field_kinds(model).items():
+            encode, decode, part = self._field(kind)
+            self.encoders.append(encode)
+            self.decoders.append(decode)
+            self.column_encoders.append(_column(encode))
+            self.column_decoders.append(_column(decode))
+            signature.append((name, part))
+        self.signature = tuple(signature)
+        self.fingerprint = zlib.crc32(repr(self.signature).encode())
+
+    @staticmethod
+    def _field(kind) -> Tuple[Callable, Callable, Any]:
+        if kind is None:
+            return _plain, _plain, None
+        category, target = kind
+        if category in ("enum", "enums"):
+            values = [member.value for member in target]
+            encode, decode = _enum(values)
+            if category == "enums":
+                encode, decode = _items(encode), _items(decode)
+            return encode, decode, (category, tuple(values))
+        layout = _layout[target]
+        if category == "model":
+            encode, decode = layout.encode, layout.decode
+        else:
+            encode, decode = layout.encode_rows, layout.decode_rows
+        return encode, decode, (category, layout.signature)
+
+    def encode(self, data: Optional[dict]):
+        if data is None:
+            return None
+        values = [
+            encode(data[name])
+            for name, encode in zip(self.names, self.encoders)
+        ]
+        if self.extra:
+            values.append(self._extra(data))
+        return values
+
+    def decode(self, values):
+        if values is None:
+            return None
+        if len(values) != self.width:
+            raise ValueError(
+                f"{len(values)} values for the {self.width} of "
+                f"{self.model.__name__}"
+            )
+        data = {
+            name: decode(value)
+            for name, decode, value in zip(self.names, self.decoders, values)
+        }
+        if self.extra and values[-1]:
+            data.update(values[-1])
+        return data
+
+    def _extra(self, data: dict) -> Optional[dict]:
+        if len(data) == len(self.names):
+            return None
+        fields = self.fields
+        return {k: v for k, v in data.items() if k not in fields} or None
+
+    def encode_rows(self, rows: Optional[list]):
+        if rows is None:
+            return None
+        columns = [len(rows)]
+        for name, encode in zip(self.names, self.column_encoders):
+            columns.append(encode([row[name] for row in rows]))
+        if self.extra:
+            # One None when no row has extra fields.
+            extras = [self._extra(row) for row in rows]
+            columns.append(extras if any(extras) else None)
+        return columns
+
+    def decode_rows(self, columns):
+        if columns is None:
+            return None
+        size, columns = columns[0], columns[1:]
+        if len(columns) != self.width:
+            raise ValueError(
+                f"{len(columns)} columns for the {self.width} of "
+                f"{self.model.__name__}"
+            )
+        if not size:
+            return []
+        if any(len(column) != size for column in columns[: len(self.names)]):
+            raise ValueError(
+                f"columns of {self.model.__name__} not {size} long"
+            )
+        decoded = [
+            decode(column)
+            for decode, column in zip(self.column_decoders, columns)
+        ]
+        names = self.names
+        rows = [dict(zip(names, values)) for values in zip(*decoded)]
+        if not names:
+            rows = [{} for _ in range(size)]
+        if self.extra and columns[-1]:
+            for row, extra in zip(rows, columns[-1]):
+                if extra:
+                    row.update(extra)
+        return rows
+
+
+def _enum(values: list) -> Tuple[Callable, Callable]:
+    """
+    Member value <-> its position. A value that is not a member (in an
+    instance built without validation) is written as is, in a list.
+    """
+    codes = {value: code for code, value in enumerate(values)}
+    codes[None] = None
+    members = dict(enumerate(values))
+    members[None] = None
+
+    def encode(value):
+        try:
+            return codes[value]
+        except (KeyError, TypeError):
+            return [value]
+
+    def decode(code):
+        try:
+            return members[code]
+        except (KeyError, TypeError):
+            if type(code) is list and len(code) == 1:
+                return code[0]
+            raise ValueError(f"unknown enum code {code!r}") from None
+
+    # Columns map the dicts directly, and fall back on the first miss.
+    encode.fast, decode.fast = codes.__getitem__, members.__getitem__
+    return encode, decode
+
+
+def _items(convert: Callable) -> Callable:
+    def items(value):
+        if value is None:
+            return None
+        return [convert(item) for item in value]
+
+    return items
+
+
+def _column(convert: Callable) -> Callable:
+    if convert is _plain:
+        return _plain
+    fast = getattr(convert, "fast", None)
+    if fast is not None:
+
+        def column(values):
+            try:
+                return list(map(fast, values))
+            except (KeyError, TypeError):
+                return [convert(value) for value in values]
+
+        return column
+
+    def column(values):
+        return [convert(value) for value in values]
+
+    return column
+
+
+_layout = Memo(_Layout)
+
+
+def encode(instance: BaseModel, format: Optional[str] = None) -> bytes:
+    """``instance`` in the binary layout (see the module docstring)."""
+    format = format or DEFAULT_FORMAT
+    pack = _pack(format)
+    layout = _layout[type(instance)]
+    body = pack(layout.encode(instance.model_dump(mode="json")))
+    header = MAGIC + bytes([FORMATS.index(format)])
+    return header + layout.fingerprint.to_bytes(4, "big") + body
+
+
+def decode(
+    model: type,
+    data: bytes,
+    validate: bool = True,
+    allow_marshal: bool = False,
+) -> BaseModel:
+    """
+    The ``model`` instance ``data`` was encoded from. With ``validate``
+    false the instance is built without validation (``trusted``), only
+    for bytes one of our services wrote. Bytes in the marshal format are
+    rejected unless ``allow_marshal`` (see the module docstring).
+    """
+    layout = _layout[model]
+    if len(data) < _HEADER or not data.startswith(MAGIC):
+        raise ValueError("Invalid data: not an encoded schema instance.")
+    code = data[len(MAGIC)]
+    if code >= len(FORMATS):
+        raise ValueError(f"Invalid data: unknown format {code}.")
+    if FORMATS[code] == "marshal" and not allow_marshal:
+        raise ValueError("Invalid data: marshal format not allowed.")
+    fingerprint = int.from_bytes(data[_FINGERPRINT], "big")
+    if fingerprint != layout.fingerprint:
+        raise ValueError(
+            f"Invalid data: written for another layout of {model.__name__}."
+        )
+    unpack = _unpack(FORMATS[code])
+    try:
+        payload = layout.decode(unpack(data[_HEADER:]))
+    except (ValueError, TypeError, KeyError, IndexError, EOFError) as error:
+        raise ValueError(f"Invalid data: {error}.") from error
+    if validate:
+        return model.model_validate(payload)
+    return construct(model, payload)
+
+
+def benchmark(size: Optional[int] = None, repeat: int = 3) -> dict:
+    """
+    ``PositionSchema`` with ``size`` (default 10000) positions, an
+    ``ExplainerSchema`` with ``size`` transactions and a
+    ``LogAIResponseObject`` logging the position plan: bytes, encode
+    and decode time (best of ``repeat``) as JSON and in every
+    available binary format.
+    """
+    import time
+
+    from lucid_ai_schemas.bench import SAMPLES
+    from lucid_ai_schemas.Schemas.schemas import (
+        ExplainerSchema,
+        LogAIResponseObject,
+        PositionSchema,
+    )
+
+    size = size or 10000
+    positions = SAMPLES["PositionSchema"](size)
+    explainer = {
+        "input": [
+            {
+                "name": f"Formula {f}",
+                "date": "2025-12-31",
+                "total_value": 1000.0 * f,
+                "transactions": [
+                    {
+                        "date": f"2025-{1 + t % 12:02d}-{1 + t % 28:02d}",
+                        "name": f"Vendor {t % 300}",
+                        "amount": t * 1.25,
+                    }
+                    for t in range(size // 10)
+                ],
+            }
+            for f in range(10)
+        ]
+    }
+    log = {
+        "prompt_object": {"prompt": "hiring plan", "engine": "gpt"},
+        "response": positions,
+        "response_time": 1.5,
+        "payload": {"freetext": "We build shoes"},
+        "parsed_input": "hiring plan",
+    }
+    cases = {
+        "PositionSchema": PositionSchema.model_validate(positions),
+        "ExplainerSchema": ExplainerSchema.model_validate(explainer),
+        "LogAIResponseObject": LogAIResponseObject.model_validate(log),
+    }
+    formats = [f for f in FORMATS if f == "marshal" or msgpack is not None]
+
+    def best(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    results: dict = {"config": {"size": size, "formats": formats}}
+    for name, instance in cases.items():
+        model = type(instance)
+        encode_s, text = best(instance.model_dump_json)
+        decode_s, _ = best(lambda: model.model_validate_json(text))
+        row = {
+            "json": {
+                "bytes": len(text),
+                "encode_s": encode_s,
+                "decode_s": decode_s,
+            }
+        }
+        for format in formats:
+            encode_s, data = best(lambda: encode(instance, format))
+            decode_s, back = best(lambda: decode(model, data, True, True))
+            trusted_s, _ = best(lambda: decode(model, data, False, True))
+            row[format] = {
+                "bytes": len(data),
+                "encode_s": encode_s,
+                "decode_s": decode_s,
+                "decode_trusted_s": trusted_s,
+                "size_ratio": round(len(data) / len(text), 3),
+                "round_trip": back.model_dump_json() == text,
+            }
+        results[name] = row
+    return results
@@ -44,5 +44,9 @@ setup(
             "lucid_ai_schemas = lucid_ai_schemas.__main__:main"
             ]
     },
-    extras_require={"test": read_requirements("requirements-test.txt")},
+    extras_require={
+        "test": read_requirements("requirements-test.txt"),
+        "numpy": ["numpy"],
+        "wire": ["msgpack"],
+    },
 )
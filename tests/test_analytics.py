@@ -0,0 +1,58 @@
+import pytest
+
+from lucid_ai_schemas.analytics import CallLogStore
+from lucid_ai_schemas.logsink import LogSink
+from lucid_ai_schemas.Schemas.schemas import LogAIResponseObject
+
+
+@pytest.fixture
+def store():
+    records = [
+        {
+            "logged_at": 1000 + i,
+            "prompt_object": {"type": "hiring"},
+            "response": {"ok": True} if i % 4 else None,
+            "response_time": float(i + 1),
+            "payload": {"freetext": "abc"},
+        }
+        for i in range(20)
+    ]
+    records.append(
+        LogAIResponseObject(
+            prompt_object={"prompt_type": "plots"},
+            response={"error": "timeout"},
+            response_time=9.0,
+        ).model_dump()
+        | {"logged_at": 5000}
+    )
+    with CallLogStore() as store:
+        assert store.ingest(records, batch_size=7) == 21
+        yield store
+
+
+def test_latency_percentiles(store):
+    assert store.latency_percentiles() == {
+        "hiring": {"count": 20, "p50": 10.0, "p95": 19.0, "p99": 20.0},
+        "plots": {"count": 1, "p50": 9.0, "p95": 9.0, "p99": 9.0},
+    }
+    assert store.latency_percentiles((0.5,), since=1010, until=1020) == {
+        "hiring": {"count": 10, "p50": 15.0}
+    }
+
+
+def test_failure_rates_and_sizes(store):
+    assert store.failure_rates() == {
+        "hiring": {"calls": 20, "failures": 5, "rate": 0.25},
+        "plots": {"calls": 1, "failures": 1, "rate": 1.0},
+    }
+    sizes = store.payload_sizes(prompt_type="hiring")
+    assert sizes["hiring"]["max_payload_bytes"] == len('{"freetext":"abc"}')
+
+
+def test_ingest_logs():
+    with LogSink("logs") as sink:
+        for i in range(3):
+            sink.emit(LogAIResponseObject(response={"i": i}, response_time=i))
+    with CallLogStore("calls.db") as store:
+        assert store.ingest_logs("logs") == 3
+        assert store.failure_rates()["unknown"]["calls"] == 3
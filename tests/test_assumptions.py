@@ -0,0 +1,123 @@
+import pytest
+
+from lucid_ai_schemas.assumptions import (
+    MAX_VALUE_LENGTH,
+    SAMPLE,
+    AssumptionSet,
+    compile_value,
+    identifier,
+)
+from lucid_ai_schemas.Schemas.schemas import AssumptionsGeneratorResponse
+
+
+@pytest.mark.parametrize(
+    "text, constant",
+    [
+        ("1200", 1200),
+        ("1,200", 1200),
+        ("$2.5M", 2500000),
+        ("2.5%", 0.025),
+        ("12 months", 12),
+        ("0.35", 0.35),
+    ],
+)
+def test_constants(text, constant):
+    compiled = compile_value(text)
+    assert compiled.code is None
+    assert compiled.constant == pytest.approx(constant)
+
+
+def test_expressions_are_cached_and_checked():
+    compiled = compile_value("MRR * (1 + 5%) - $1.5k")
+    assert compiled.names == ("mrr",)
+    assert compile_value("MRR * (1 + 5%) - $1.5k") is compiled
+    for text in ("x.__class__", "__import__('os')", "2 ** 1000", "[1]"):
+        with pytest.raises(ValueError, match="Invalid calculation value"):
+            compile_value(text)
+    assert identifier("Monthly Price ($)") == "monthly_price"
+
+
+def test_evaluate_in_dependency_order():
+    response = AssumptionsGeneratorResponse(
+        calculations=[
+            {"key": "ARR", "value": "mrr * 12"},
+            {"key": "MRR", "value": "price * customers"},
+            {"key": "Price", "value": "$50"},
+            {"key": "Customers", "value": "100"},
+            {"key": "Notes", "value": None},
+        ]
+    )
+    assumptions = AssumptionSet.from_response(response)
+    assert assumptions.order.index("mrr") < assumptions.order.index("arr")
+    assert assumptions.evaluate() == {
+        "MRR": 5000.0,
+        "Price": 50.0,
+        "Customers": 100.0,
+        "ARR": 60000.0,
+    }
+    assert assumptions.evaluate({"Price": 10})["ARR"] == 12000
+
+
+def test_inputs_and_errors():
+    assumptions = AssumptionSet([{"key": "Revenue", "value": "seats * 9"}])
+    assert assumptions.inputs == ["seats"]
+    assert assumptions.evaluate({"seats": 2}) == {"Revenue": 18}
+    with pytest.raises(ValueError, match="missing inputs"):
+        assumptions.evaluate()
+    with pytest.raises(ValueError, match="cycle a -> b -> a"):
+        AssumptionSet([{"key": "a", "value": "b"}, {"key": "b", "value": "a"}])
+    with pytest.raises(ValueError, match="duplicate key"):
+        AssumptionSet([{"key": "A", "value": "1"}, {"key": "a", "value": "2"}])
+    with pytest.raises(ValueError, match="Growth: Invalid"):
+        AssumptionSet([{"key": "Growth", "value": "a lot"}])
+    with pytest.raises(ValueError, match="division by zero"):
+        AssumptionSet([{"key": "x", "value": "1 / (2 - 2)"}]).evaluate()
+
+
+@pytest.mark.parametrize(
+    "text", ['2 ** "a"', "min(5)", "max()", "abs(1, 2)", "round(1, 2.5)"]
+)
+def test_invalid_constants_and_calls_are_rejected(text):
+    with pytest.raises(ValueError, match="Invalid calculation value"):
+        compile_value(text)
+
+
+def test_long_values_are_rejected_before_parsing():
+    text = "1" + " + 1" * MAX_VALUE_LENGTH
+    with pytest.raises(ValueError, match="Invalid calculation value"):
+        compile_value(text)
+    with pytest.raises(ValueError, match="longer than"):
+        AssumptionSet([{"key": "x", "value": "$" + "1," * 300}])
+
+
+@pytest.mark.parametrize(
+    "values, error",
+    [
+        (["(((9**100)**100)**100)**10"], "overflow"),
+        (["(10.0**100)**100"], "overflow"),
+        (["9 ** 100", "a ** 100", "b ** 100"], "overflow"),
+        (["(-8) ** 0.5"], "complex"),
+    ],
+)
+def test_evaluation_errors_are_value_errors(values, error):
+    keys = "abc"
+    assumptions = AssumptionSet(
+        [{"key": k, "value": v} for k, v in zip(keys, values)]
+    )
+    with pytest.raises(ValueError, match=f"Invalid calculation .*{error}"):
+        assumptions.evaluate()
+    assert AssumptionSet([{"key": "r", "value": "round(2.345, 1)"}]).evaluate(
+        {}
+    ) == {"r": 2.3}
+
+
+def test_vectorized_scenarios_match_scalar_runs():
+    np = pytest.importorskip("numpy")
+    assumptions = AssumptionSet(SAMPLE)
+    churn = [0.01, 0.03, 0.05]
+    vectors = assumptions.evaluate({"churn": churn})
+    assert vectors["Price"] == 49
+    for i, value in enumerate(churn):
+        scalar = assumptions.evaluate({"churn": value})
+        for key in ("Lifetime", "LTV to CAC", "ARR"):
+            assert np.isclose(vectors[key][i], scalar[key])
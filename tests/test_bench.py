@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from lucid_ai_schemas import bench
+from lucid_ai_schemas.cli import main
+
+
+def test_every_schema_has_a_valid_sample():
+    classes = bench.schema_classes()
+    assert "PositionSchema" in classes
+    assert set(classes) == set(bench.SAMPLES)
+    for name, model in classes.items():
+        model.model_validate(bench.SAMPLES[name](3))
+
+
+def test_schemas_suite_report_shape():
+    result = bench.run_suite(
+        "schemas",
+        size=5,
+        number=2,
+        repeat=1,
+        cold_runs=0,
+        only=["PositionSchema"],
+    )
+    position = result["schemas"]["PositionSchema"]
+    assert set(position) == {"micro", "macro"}
+    assert position["macro"]["validate"]["median_ns"] > 0
+    assert position["macro"]["memory_bytes"] > 0
+
+
+def test_unknown_suite_and_schema():
+    with pytest.raises(ValueError):
+        bench.run_suite("nope")
+    with pytest.raises(ValueError):
+        bench.run_schemas_suite(cold_runs=0, only=["Nope"])
+
+
+def test_compare_reports():
+    old = {"suites": {"s": {"config": {"size": 1}, "validate_ns": 100}}}
+    new = {"suites": {"s": {"config": {"size": 2}, "validate_ns": 150}}}
+    assert bench.compare(old, new) == {
+        "s.validate_ns": {"old": 100, "new": 150, "ratio": 1.5}
+    }
+
+
+def test_cli_bench_writes_report():
+    main(
+        [
+            "bench",
+            "--size=2",
+            "--number=1",
+            "--repeat=1",
+            "--cold-runs=0",
+            "--schema=OrchestratorSchema",
+            "--output=report.json",
+        ]
+    )
+    with open("report.json") as fh:
+        report = json.load(fh)
+    assert report["report_version"] == bench.REPORT_VERSION
+    assert "OrchestratorSchema" in report["suites"]["schemas"]["schemas"]
+
+
+def test_memory_per_instance_keeps_the_callers_tracing():
+    import tracemalloc
+
+    from lucid_ai_schemas.Schemas.schemas import PositionSchema
+
+    tracemalloc.start()
+    try:
+        kept = bytearray(100_000)
+        before = tracemalloc.get_traced_memory()[0]
+        size = bench._memory_per_instance(
+            PositionSchema, bench.SAMPLES["PositionSchema"](3), 10
+        )
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[0] >= before
+    finally:
+        tracemalloc.stop()
+    assert size > 0
+    del kept
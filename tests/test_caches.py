@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lucid_ai_schemas.caches import Memo, benchmark
+from lucid_ai_schemas.Schemas.schemas import (
+    Countries,
+    PositionSchema,
+    SalaryGeneratorSchema,
+)
+
+
+def test_memo_computes_once_per_key():
+    calls = []
+
+    @Memo
+    def square(value):
+        """Square of value."""
+        calls.append(value)
+        return value * value
+
+    assert square(3) == 9 and square(3) == 9 and square[4] == 16
+    assert calls == [3, 4]
+    assert len(square) == 2 and square.__doc__ == "Square of value."
+    square.cache_clear()
+    assert square(3) == 9 and calls == [3, 4, 3]
+
+
+def test_memo_publishes_one_value_per_key_across_threads():
+    start = threading.Barrier(8)
+
+    @Memo
+    def build(key):
+        return object()
+
+    def get(_):
+        start.wait()
+        return build("model")
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(get, range(8)))
+    assert all(result is results[0] for result in results)
+    assert build("model") is results[0]
+
+
+def test_enum_validators_fall_back_on_unhashable_input():
+    positions = PositionSchema.model_validate(
+        {"positions": [{"geo_location": ["France"]}, {"geo_location": "Peru"}]}
+    )
+    default = Countries.UNITED_STATES_OF_AMERICA_USA
+    assert positions.positions[0].geo_location == default
+    assert positions.positions[1].geo_location == Countries.PERU
+    schema = SalaryGeneratorSchema.model_validate(
+        {
+            "positions": [
+                {
+                    "id": 1,
+                    "role": "CTO",
+                    "department": "R&D",
+                    "geo_location": {"name": "France"},
+                }
+            ]
+        }
+    )
+    assert schema.positions[0].geo_location == default
+
+
+def test_benchmark_reports_thread_and_process_curves():
+    result = benchmark(size=1, workers=2, rounds=1)
+    assert result["config"]["workers"] == [1, 2]
+    for curve in ("threads", "processes"):
+        assert set(result[curve]) == {1, 2}
+        assert result[curve][1]["speedup"] == 1.0
+        assert result[curve][2]["payloads_per_s"] > 0
+    assert result["memo_hit"]["min_ns"] > 0
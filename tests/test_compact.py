@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from lucid_ai_schemas import compact
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyFieldExtractorResponse,
+    PositionSchema,
+    Sectors,
+)
+
+TEXT = json.dumps(
+    {
+        "positions": [
+            {
+                "id": i,
+                "role": "Software Engineer",
+                "full_name": "x" * 100,
+                "department": "rnd",
+                "start_date": "March 2027",
+                "geo_location": "Germany",
+                "team": "Platform",
+            }
+            for i in range(3)
+        ]
+    }
+)
+
+
+def test_compacted_instances_share_repeated_strings():
+    default = PositionSchema.model_validate(json.loads(TEXT))
+    first, second = default.positions[:2]
+    assert first.role == second.role and first.role is not second.role
+
+    with compact.compacted():
+        assert compact.enabled()
+        plans = [
+            PositionSchema.model_validate(json.loads(TEXT)),
+            PositionSchema.model_validate_json(TEXT),
+            PositionSchema(**json.loads(TEXT)),
+        ]
+    assert not compact.enabled()
+    assert "model_validate" not in vars(PositionSchema)
+
+    for plan in plans:
+        first, second = plan.positions[:2]
+        assert first.role is second.role
+        assert first.start_date is second.start_date
+        assert first.team is second.team
+        # Free text is left alone.
+        assert first.full_name is not second.full_name
+        assert plan == default
+        assert plan.model_dump_json() == default.model_dump_json()
+        assert plan.model_fields_set == default.model_fields_set
+
+
+def test_sector_strings_share_the_enum_values():
+    payload = {"SECTORS": ["Fintech", "Fintech", "Quantum Gardening"]}
+    default = CompanyFieldExtractorResponse.model_validate(payload)
+    assert type(default.SECTORS[0]) is str
+
+    instance = compact.compact(
+        CompanyFieldExtractorResponse.model_validate(payload)
+    )
+    assert type(instance.SECTORS[0]) is str
+    assert instance.SECTORS[0] is Sectors("Fintech").value
+    assert instance.SECTORS[1] is instance.SECTORS[0]
+    assert instance.SECTORS[2] == "Quantum Gardening"
+    assert instance.model_dump_json() == default.model_dump_json()
+
+
+def test_public_output_is_unchanged():
+    payload = {"SECTORS": ["Fintech", "Quantum Gardening"]}
+    default = CompanyFieldExtractorResponse.model_validate(payload)
+    compact.enable()
+    try:
+        compacted = CompanyFieldExtractorResponse.model_validate(payload)
+    finally:
+        compact.disable()
+    assert [str(s) for s in compacted.SECTORS] == [
+        str(s) for s in default.SECTORS
+    ]
+    assert f"{compacted.SECTORS[0]}" == "Fintech"
+    assert compacted.model_dump() == default.model_dump()
+    assert [type(s) for s in compacted.model_dump()["SECTORS"]] == [
+        str,
+        str,
+    ]
+
+
+@pytest.mark.parametrize("first, second", [(0, 1), (1, 0)])
+@pytest.mark.parametrize("disable_first", [0, 1])
+def test_stacks_with_metrics_in_any_order(first, second, disable_first):
+    from pydantic import BaseModel
+
+    from lucid_ai_schemas import metrics
+
+    modules = [compact, metrics]
+    metrics.reset()
+    modules[first].enable()
+    modules[second].enable()
+    try:
+        positions = PositionSchema.model_validate(json.loads(TEXT))
+        assert positions.positions[0].team == "Platform"
+        assert "PositionSchema.validate" in metrics.snapshot()["operations"]
+        modules[disable_first].disable()
+        # The other module keeps working alone.
+        assert modules[1 - disable_first].enabled()
+        again = PositionSchema.model_validate(json.loads(TEXT)).positions
+        operations = metrics.snapshot()["operations"]
+        count = operations["PositionSchema.validate"]["latency_seconds"]
+        if disable_first:
+            assert again[0].role is again[1].role
+            assert count["count"] == 1
+        else:
+            assert count["count"] == 2
+    finally:
+        compact.disable()
+        metrics.disable()
+        metrics.reset()
+    for model in (PositionSchema, CompanyFieldExtractorResponse):
+        for attribute in ("model_validate", "__init__", "model_dump"):
+            assert attribute not in vars(model)
+    assert PositionSchema.__init__ is BaseModel.__init__
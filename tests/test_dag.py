@@ -0,0 +1,118 @@
+import asyncio
+import gc
+
+import pytest
+
+from lucid_ai_schemas.dag import (
+    DAG,
+    ONBOARDING,
+    Node,
+    NodeFailed,
+    StubLLM,
+    onboarding_stub,
+)
+from lucid_ai_schemas.Schemas.schemas import (
+    Countries,
+    PromptTypeSchema,
+    SalaryGeneratorResponse,
+    StringResponse,
+)
+
+
+def test_onboarding_feeds_validated_responses_forward():
+    llm = onboarding_stub(positions=2)
+    context = {"freetext": "Budgeting software", "template_list": "all"}
+    result = asyncio.run(ONBOARDING.run(llm, context))
+
+    assert set(result.responses) == set(ONBOARDING.nodes)
+    salaries = result.responses["salaries"]
+    assert isinstance(salaries, SalaryGeneratorResponse)
+    assert [p.id for p in salaries.positions] == [0, 1]
+
+    templates = llm.calls["templates"]
+    assert templates.location == "Germany"
+    assert templates.sectors == ["Fintech"]
+    assert templates.funding_raise == 500000
+    assert templates.target_round_funding == 3000000
+    assert templates.raise_next_round_date == "2030-07-01"
+    assert templates.template_list == "all"
+    assert llm.calls["assumptions"].formulas == "SaaS Starter"
+    assert llm.calls["hiring"].balance == 500000
+    position = llm.calls["salaries"].positions[0]
+    assert position.geo_location == Countries.GERMANY
+    assert position.department.value == "R&D"
+
+
+def test_independent_nodes_run_concurrently():
+    llm = onboarding_stub(latency=0.02)
+    result = asyncio.run(ONBOARDING.run(llm, {"freetext": "x"}, 4))
+    timings = result.timings
+    # fields and goals overlap; hiring does not wait for templates.
+    assert timings["goals"]["start_s"] < timings["fields"]["end_s"]
+    assert timings["hiring"]["start_s"] < timings["templates"]["end_s"]
+    # 4 levels deep instead of 7 nodes in a row.
+    assert result.wall_s < 0.75 * result.sequential_s
+
+    serial = asyncio.run(ONBOARDING.run(llm, {"freetext": "x"}, 1))
+    assert serial.wall_s >= 0.95 * serial.sequential_s
+    assert max(t["wait_s"] for t in serial.timings.values()) > 0.01
+
+
+def test_failures_name_the_node():
+    llm = onboarding_stub()
+    llm.responses["goals"] = {"WHEN": "not a date"}
+    with pytest.raises(NodeFailed, match="'goals'") as error:
+        asyncio.run(ONBOARDING.run(llm, {"freetext": "x"}))
+    assert error.value.node == "goals"
+
+
+def echo(name):
+    return Node(
+        name,
+        PromptTypeSchema,
+        StringResponse,
+        lambda responses, context: {"input": name},
+        after=[],
+    )
+
+
+def test_invalid_dags():
+    with pytest.raises(ValueError, match="duplicate"):
+        DAG([echo("a"), echo("a")])
+    node = echo("a")
+    node.after = ("missing",)
+    with pytest.raises(ValueError, match="unknown node missing"):
+        DAG([node])
+    first, second = echo("a"), echo("b")
+    first.after, second.after = ("b",), ("a",)
+    with pytest.raises(ValueError, match="cycle a -> b -> a"):
+        DAG([first, second])
+
+
+def test_json_string_responses():
+    llm = StubLLM({"a": '{"response": "ok"}'})
+    result = asyncio.run(DAG([echo("a")]).run(llm))
+    assert result.responses["a"].response == "ok"
+
+
+def test_failures_leave_no_task_behind():
+    failures = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: failures.append(1))
+        llm = StubLLM(
+            {"a": "not json", "b": "not json", "c": "x"},
+            latencies={"c": 1},
+        )
+        try:
+            await DAG([echo("a"), echo("b"), echo("c")]).run(llm)
+        except NodeFailed as error:
+            failed = error.node
+        # Nothing still running, and no exception left unretrieved.
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        gc.collect()
+        return failed
+
+    assert asyncio.run(main()) == "a"
+    assert failures == []
@@ -0,0 +1,96 @@
+import datetime
+
+import pytest
+
+from lucid_ai_schemas.Schemas.dates import (
+    MAX_CHARS,
+    cache_info,
+    clear_cache,
+    normalize_date,
+    parse_date,
+)
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyDetailsSchema,
+    CompanyGoalsExtractorResponse,
+    ExplainerSchema,
+    PositionSchema,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2025-03-01", "2025-03-01"),
+        ("2025-03-01T10:00:00Z", "2025-03-01"),
+        ("2025-03-01 10:00", "2025-03-01"),
+        ("2025/3/1", "2025-03-01"),
+        ("03/04/2026", "2026-03-04"),
+        ("25/04/2026", "2026-04-25"),
+        ("Q3 2025", "2025-07-01"),
+        ("2025-q4", "2025-10-01"),
+        ("H2 2026", "2026-07-01"),
+        ("2026-05", "2026-05-01"),
+        ("March 2026", "2026-03-01"),
+        ("Sept. 2026", "2026-09-01"),
+        ("Mar 3, 2026", "2026-03-03"),
+        ("3rd of March 2026", "2026-03-03"),
+        ("2027", "2027-01-01"),
+        (datetime.datetime(2025, 1, 2, 3, 4), "2025-01-02"),
+    ],
+)
+def test_normalize_date(value, expected):
+    assert normalize_date(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "soon",
+        "2025-13-01",
+        "Smarch 2026",
+        5,
+        "2025-03-01 or later if funding slips",
+        "2025-03-01Tentative",
+    ],
+)
+def test_invalid_dates(value):
+    with pytest.raises(ValueError):
+        parse_date(value)
+
+
+def test_long_text_is_rejected_without_caching():
+    clear_cache()
+    with pytest.raises(ValueError, match="Invalid date"):
+        parse_date("2025-03-01" + " " * MAX_CHARS)
+    assert cache_info().currsize == 0
+
+
+def test_today_is_computed_per_call():
+    today = datetime.date(2030, 1, 1)
+    assert parse_date("today", today=today) == today
+    assert parse_date("now") == datetime.date.today()
+
+
+def test_goals_when_is_normalized_and_clamped_to_today():
+    today = datetime.date.today().isoformat()
+    assert CompanyGoalsExtractorResponse().WHEN == today
+    assert CompanyGoalsExtractorResponse(WHEN="2020-01-01").WHEN == today
+    assert CompanyGoalsExtractorResponse(WHEN="Q3 2999").WHEN == "2999-07-01"
+    with pytest.raises(ValueError):
+        CompanyGoalsExtractorResponse(WHEN="whenever")
+
+
+def test_date_fields_are_normalized_leniently():
+    details = CompanyDetailsSchema(raise_next_round_date="March 2026")
+    assert details.raise_next_round_date == "2026-03-01"
+    details = CompanyDetailsSchema(raise_next_round_date="after the launch")
+    assert details.raise_next_round_date == "after the launch"
+
+    positions = PositionSchema(positions=[{"start_date": "Q2 2026"}])
+    assert positions.positions[0].start_date == "2026-04-01"
+
+    explainer = ExplainerSchema(
+        input=[{"date": "Jan 2025", "transactions": [{"date": "2025/1/5"}]}]
+    )
+    assert explainer.input[0].date == "2025-01-01"
+    assert explainer.input[0].transactions[0].date == "2025-01-05"
@@ -0,0 +1,105 @@
+import pytest
+
+from lucid_ai_schemas.explainer import (
+    TransactionReducer,
+    downsample,
+)
+from lucid_ai_schemas.Schemas.schemas import ExplainerSchema
+from lucid_ai_schemas.tokens import count_tokens
+
+
+def rows(amounts, day="2025-01-10"):
+    return [
+        {"date": day, "name": f"T{i}", "amount": amount}
+        for i, amount in enumerate(amounts)
+    ]
+
+
+def test_keeps_largest_by_absolute_amount_in_input_order():
+    reducer = TransactionReducer(top=2, period="month")
+    reducer.feed("Costs", iter(rows([5, -50, 1, 30, 2])))
+    (formula,) = reducer.result().input
+    assert [(t.name, t.amount) for t in formula.transactions] == [
+        ("T1", -50),
+        ("T3", 30),
+        ("Other (3 transactions)", 8),
+    ]
+    assert formula.transactions[-1].date == "2025-01-01"
+    assert reducer.seen == 5
+
+
+def test_groups_by_period_and_keeps_formula_fields():
+    explainer = ExplainerSchema(
+        input=[
+            {
+                "name": "Revenue",
+                "date": "2025-12-31",
+                "total_value": 181.0,
+                "transactions": rows([100, 1, 2], "2025-02-03")
+                + rows([70, 3], "March 5, 2025")
+                + rows([4, 1], "sometime"),
+            }
+        ]
+    )
+    reduced = downsample(explainer, top=1, period="quarter")
+    (formula,) = reduced.input
+    assert (formula.name, formula.total_value) == ("Revenue", 181.0)
+    assert [(t.date, t.amount) for t in formula.transactions] == [
+        ("2025-02-03", 100),
+        ("2025-01-01", 76),
+        ("sometime", 4),
+        (None, 1),
+    ]
+    total = sum(t.amount for t in explainer.input[0].transactions)
+    assert sum(t.amount for t in formula.transactions) == total
+    monthly = downsample(explainer, top=1).input[0].transactions
+    assert [t.date for t in monthly][:4] == [
+        "2025-02-03",
+        "2025-02-01",
+        "2025-03-05",
+        "2025-03-01",
+    ]
+
+
+def test_ties_missing_amounts_and_no_rows():
+    reducer = TransactionReducer(top=1, period=None)
+    reducer.feed({"name": "Tie"}, rows([5, -5, None]))
+    reducer.feed(ExplainerSchema.Formula(name="Empty"))
+    tie, empty = reducer.result().input
+    assert [t.name for t in tie.transactions] == [
+        "T0",
+        "Other (2 transactions)",
+    ]
+    assert tie.transactions[-1].amount == -5
+    assert empty.transactions == []
+    with pytest.raises(ValueError, match="Invalid period: week"):
+        TransactionReducer(period="week")
+
+
+def test_downsampling_saves_tokens():
+    explainer = ExplainerSchema(
+        input=[{"name": "Costs", "transactions": rows(range(2000))}]
+    )
+    reduced = downsample(explainer, top=10)
+    assert len(reduced.input[0].transactions) == 11
+    assert count_tokens(reduced) * 50 < count_tokens(explainer)
+
+
+def test_benchmark_keeps_the_callers_tracing():
+    import tracemalloc
+
+    from lucid_ai_schemas.explainer import benchmark
+
+    tracemalloc.start()
+    try:
+        kept = bytearray(100_000)
+        before = tracemalloc.get_traced_memory()[0]
+        result = benchmark(size=2000, formulas=2)
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[0] >= before
+    finally:
+        tracemalloc.stop()
+    assert result["materialized_peak_kb"] is None or (
+        result["materialized_peak_kb"] > 0
+    )
+    del kept
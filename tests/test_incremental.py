@@ -0,0 +1,92 @@
+import pytest
+from pydantic import ValidationError
+
+from lucid_ai_schemas.incremental import EditSession, full_rebuild
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyDetailsSchema,
+    TemplateAssignerSchema,
+)
+
+DATA = {
+    "sectors": "Fintech",
+    "freetext": "Budgeting software",
+    "location": "Germany",
+    "funding_raise": "$2M",
+    "template_list": "a, b, c",
+}
+
+
+def render(instance):
+    return f"{instance.freetext} in {instance.location}"
+
+
+def test_session_matches_full_rebuild_after_edits():
+    session = EditSession(TemplateAssignerSchema, DATA, render)
+    session.update("funding_raise", "€500k")
+    session.update("raise_next_round_date", "March 2030")
+    session.update("location", "France")
+    data = {
+        **DATA,
+        "funding_raise": "€500k",
+        "raise_next_round_date": "March 2030",
+        "location": "France",
+    }
+    instance, serialized, fingerprint, prompt = full_rebuild(
+        TemplateAssignerSchema, data, render
+    )
+    assert session.instance == instance
+    assert session.data == instance.to_dict()
+    assert session.json == serialized
+    assert session.fingerprint == fingerprint
+    assert session.prompt == prompt == "Budgeting software in France"
+    assert session.dirty == {
+        "funding_raise",
+        "raise_next_round_date",
+        "location",
+    }
+
+
+def test_unchanged_values_and_unrelated_fields_keep_caches():
+    calls = []
+
+    def counting_render(instance):
+        calls.append(instance.location)
+        return instance.location
+
+    session = EditSession(
+        CompanyDetailsSchema,
+        DATA,
+        counting_render,
+        prompt_fields=["location"],
+    )
+    session.prompt
+    fingerprint = session.fingerprint
+    # "$2M" validates to the value already stored: nothing is dirty.
+    assert session.update("funding_raise", "$2M") is False
+    assert session.fingerprint == fingerprint
+    assert session.update("funding_raise", "$3M") is True
+    assert session.fingerprint != fingerprint
+    session.prompt
+    assert calls == ["Germany"]
+    session.update("location", "Israel")
+    assert session.prompt == "Israel"
+    assert session.mark_clean() == {"funding_raise", "location"}
+    assert session.dirty == set()
+
+
+def test_invalid_edits_leave_the_session_untouched():
+    session = EditSession(CompanyDetailsSchema, DATA)
+    json = session.json
+    with pytest.raises(ValidationError):
+        session.update("funding_raise", ["not", "money"])
+    with pytest.raises(ValueError, match="Invalid field"):
+        session.update("nope", 1)
+    assert session.json == json
+    assert session.dirty == set()
+
+
+def test_clearing_a_field_drops_it_from_the_serialized_forms():
+    session = EditSession(CompanyDetailsSchema, DATA)
+    session.update("location", None)
+    assert "location" not in session.data
+    assert '"location"' not in session.json
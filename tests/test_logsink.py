@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from lucid_ai_schemas.logsink import LogSink, iter_records
+from lucid_ai_schemas.Schemas.schemas import LogAIResponseObject
+
+
+def test_records_are_written_in_order_on_close():
+    with LogSink("logs", batch_size=3) as sink:
+        for i in range(10):
+            sink.emit(LogAIResponseObject(response={"i": i}))
+        sink.emit({"response": {"i": 10}, "response_time": 0.5})
+    records = list(iter_records("logs"))
+    assert [r["response"]["i"] for r in records] == list(range(11))
+    assert all("logged_at" in r for r in records)
+    assert LogAIResponseObject.model_validate(records[0]).response == {"i": 0}
+    assert sink.written == 11
+
+
+@pytest.mark.parametrize(
+    "policy, kept", [("drop", [0, 1]), ("drop_oldest", [3, 4])]
+)
+def test_drop_policies_when_full(policy, kept):
+    sink = LogSink("logs", capacity=2, flush_interval=60, policy=policy)
+    with sink._write_lock:  # keep the writer from draining the buffer
+        results = [sink.emit({"i": i}) for i in range(5)]
+    sink.close()
+    assert sink.dropped == 3
+    assert results == (
+        [True] * 2 + [False] * 3 if policy == "drop" else [True] * 5
+    )
+    assert [r["i"] for r in iter_records("logs")] == kept
+
+
+def test_block_policy_times_out():
+    sink = LogSink(
+        "logs",
+        capacity=1,
+        flush_interval=60,
+        policy="block",
+        block_timeout=0.01,
+    )
+    with sink._write_lock:
+        assert sink.emit({"i": 0})
+        assert not sink.emit({"i": 1})
+    sink.close()
+    assert sink.dropped == 1
+    assert [r["i"] for r in iter_records("logs")] == [0]
+
+
+def test_rotation_keeps_backups():
+    sink = LogSink(
+        "logs", batch_size=1, compress=False, max_bytes=1, backup_count=2
+    )
+    for i in range(5):
+        sink.emit({"i": i})
+        sink.flush()
+    sink.close()
+    assert sorted(os.listdir("logs")) == [
+        "ai_responses.1.jsonl",
+        "ai_responses.2.jsonl",
+        "ai_responses.jsonl",
+    ]
+    assert [r["i"] for r in iter_records("logs")] == [2, 3, 4]
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        LogSink("logs", policy="explode")
+
+
+def test_write_errors_do_not_stop_the_writer(monkeypatch):
+    circular = {}
+    circular["self"] = circular
+    sink = LogSink("logs", batch_size=1, compress=False, policy="block")
+    sink.emit({"i": 0})
+    sink.emit(circular)
+    sink.emit({"i": 1})
+    sink.flush()
+
+    def full(*args):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(sink, "_rotate", full)
+    sink.max_bytes = 1
+    sink.emit({"i": 2})
+    sink.flush()
+    assert sink._thread.is_alive()
+    monkeypatch.undo()
+    sink.max_bytes = 64 * 1024 * 1024
+    assert sink.emit({"i": 3})
+    sink.close()
+    assert sink.failed == 2
+    assert [r["i"] for r in iter_records("logs")] == [0, 1, 3]
@@ -0,0 +1,95 @@
+import sys
+
+from lucid_ai_schemas.memory import (
+    by_schema,
+    footprint,
+    live_instances,
+    profile_allocations,
+)
+from lucid_ai_schemas.Schemas.schemas import (
+    Countries,
+    LogAIResponseObject,
+    PositionSchema,
+)
+
+
+def plan(count):
+    return {
+        "positions": [
+            {
+                "id": 1000 + i,
+                # Equal strings, but distinct objects, as after json.loads.
+                "role": "".join(["Engin", "eer"]),
+                "department": "R&D",
+                "geo_location": "Germany",
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def test_footprint_by_field():
+    instance = PositionSchema.model_validate(plan(10))
+    fp = footprint(instance)
+    assert fp.total == sum(fp.fields.values())
+    role = sys.getsizeof("Engineer")
+    assert fp.fields["positions[].role"] == 10 * role
+    assert fp.duplicate_strings == 9 * role
+    # Enum members and None are shared with the rest of the process.
+    assert instance.positions[0].geo_location is Countries.GERMANY
+    assert "positions[].geo_location" not in fp.fields
+    assert fp.shared >= 10 * 6
+    assert set(fp.fields) >= {"(self)", "positions", "positions[]"}
+
+
+def test_dict_fields_and_counting_objects_once():
+    text = "x" * 1000
+    log = LogAIResponseObject(response={"a": text, "b": text})
+    fp = footprint(log)
+    assert fp.fields["response{}"] < 2 * sys.getsizeof(text)
+    assert fp.duplicate_strings == 0
+
+
+def test_by_schema_counts_nested_models_under_their_type():
+    instances = [PositionSchema.model_validate(plan(5)) for _ in range(3)]
+    report = by_schema(instances)
+    assert report["PositionSchema"]["count"] == 3
+    assert report["PositionSchema.Positions"]["count"] == 15
+    nested = footprint(instances[0].positions[0]).total
+    assert report["PositionSchema.Positions"]["total"] >= 15 * (
+        nested - 2 * sys.getsizeof("Engineer")
+    )
+
+    live = list(live_instances())
+    assert all(any(i is x for x in live) for i in instances)
+    assert by_schema()["PositionSchema"]["count"] >= 3
+
+
+def test_profile_allocations_splits_phases():
+    profile = profile_allocations(PositionSchema, plan(200))
+    validation = profile["validation"]
+    assert validation["retained"] > 0.5 * profile["footprint"]
+    assert validation["retained_by"]["pydantic"] > 0
+    json_ = profile["serialization"]["json"]
+    assert json_["retained"] >= profile["json_chars"]
+
+
+def test_profile_allocations_keeps_the_callers_traces():
+    import tracemalloc
+
+    def traced_here():
+        snapshot = tracemalloc.take_snapshot()
+        mine = snapshot.filter_traces([tracemalloc.Filter(True, __file__)])
+        return sum(stat.size for stat in mine.statistics("filename"))
+
+    tracemalloc.start()
+    try:
+        kept = [bytearray(1000) for _ in range(100)]
+        before = traced_here()
+        profile = profile_allocations(PositionSchema, plan(50))
+        assert tracemalloc.is_tracing()
+        assert traced_here() >= before >= 100_000
+    finally:
+        tracemalloc.stop()
+    assert profile["validation"]["retained"] > 0
+    del kept
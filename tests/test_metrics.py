@@ -0,0 +1,134 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from lucid_ai_schemas import metrics
+from lucid_ai_schemas.Schemas.schemas import (
+    PositionSchema,
+    SalaryGeneratorResponse,
+)
+
+
+@pytest.fixture
+def registry():
+    metrics.reset()
+    with metrics.instrumented() as registry:
+        yield registry
+    metrics.reset()
+
+
+def test_disabled_by_default_and_restored():
+    assert not metrics.enabled()
+    assert "model_validate" not in vars(PositionSchema)
+    with metrics.instrumented():
+        assert metrics.enabled()
+        assert "model_validate" in vars(PositionSchema)
+    assert "model_validate" not in vars(PositionSchema)
+    assert PositionSchema.model_validate is not None
+    assert PositionSchema.__init__ is BaseModel.__init__
+
+
+def test_operations_and_validators_are_recorded(registry):
+    positions = PositionSchema.model_validate(
+        {
+            "positions": [
+                {"department": "rnd", "geo_location": "France"},
+                {"department": "R&D", "geo_location": "Atlantis"},
+            ]
+        }
+    )
+    payload = positions.model_dump_json()
+    PositionSchema.model_validate_json(payload)
+    with pytest.raises(ValidationError):
+        SalaryGeneratorResponse.model_validate({})
+
+    snapshot = metrics.snapshot()
+    operations = snapshot["operations"]
+    assert (
+        operations["PositionSchema.validate"]["latency_seconds"]["count"] == 1
+    )
+    assert operations["PositionSchema.dump_json"]["payload_bytes"][
+        "sum"
+    ] == len(payload)
+    assert operations["SalaryGeneratorResponse.validate"]["errors"] == 1
+
+    department = snapshot["validators"][
+        "PositionSchema.Positions.normalize_department"
+    ]
+    location = snapshot["validators"][
+        "PositionSchema.Positions.validate_location"
+    ]
+    assert department["latency_seconds"]["count"] == 4
+    assert department["coercions"] == 1
+    assert location["fallbacks"] == 1
+    assert location["coercions"] == 1
+
+
+def test_observations_from_every_thread_are_added_up(registry):
+    from concurrent.futures import ThreadPoolExecutor
+
+    payload = {"positions": [{"geo_location": "Atlantis"}]}
+
+    def validate(_):
+        for _ in range(25):
+            PositionSchema.model_validate(payload)
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(validate, range(4)))
+    snapshot = metrics.snapshot()
+    validate_ = snapshot["operations"]["PositionSchema.validate"]
+    location = snapshot["validators"][
+        "PositionSchema.Positions.validate_location"
+    ]
+    assert validate_["latency_seconds"]["count"] == 100
+    assert location["fallbacks"] == 100
+    assert 'operation="validate"} 100' in metrics.render_prometheus()
+    metrics.reset()
+    assert metrics.snapshot() == {"operations": {}, "validators": {}}
+
+
+def test_prometheus_format(registry):
+    PositionSchema(positions=[])
+    text = metrics.render_prometheus()
+    assert "# TYPE lucid_schema_operation_seconds histogram" in text
+    assert (
+        'lucid_schema_operation_seconds_count{schema="PositionSchema",'
+        'operation="init"} 1'
+    ) in text
+    assert 'le="+Inf"' in text
+
+
+def test_pydantic_state_is_left_alone():
+    from lucid_ai_schemas.metrics import schema_models
+
+    models = schema_models()
+    before = {m: (m.__pydantic_validator__, m.__dict__.copy()) for m in models}
+    with metrics.instrumented():
+        PositionSchema.model_validate({"positions": [{"id": 1}]})
+        for model in models:
+            assert model.__pydantic_validator__ is before[model][0]
+    for model in models:
+        assert model.__pydantic_validator__ is before[model][0]
+        assert model.__dict__ == before[model][1]
+
+
+def test_other_profilers_are_left_alone():
+    import sys
+
+    calls = []
+
+    def profiler(frame, event, arg):
+        calls.append(event)
+
+    metrics.reset()
+    with metrics.instrumented():
+        sys.setprofile(profiler)
+        try:
+            PositionSchema.model_validate({"positions": [{"id": 1}]})
+            assert sys.getprofile() is profiler
+        finally:
+            sys.setprofile(None)
+        snapshot = metrics.snapshot()
+    metrics.reset()
+    assert calls
+    assert "PositionSchema.validate" in snapshot["operations"]
+    assert snapshot["validators"] == {}
@@ -0,0 +1,88 @@
+import time
+
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from lucid_ai_schemas.Schemas.money import (
+    _AMOUNT,
+    Money,
+    MoneyAmount,
+    parse_money,
+)
+from lucid_ai_schemas.Schemas.schemas import (
+    AssumptionsInputSchema,
+    CompanyDetailsSchema,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("$2.5M", Money(2500000, "USD")),
+        ("1,200,000", Money(1200000)),
+        ("€500k", Money(500000, "EUR")),
+        ("EUR 1.5 million", Money(1500000, "EUR")),
+        ("2.000.000,50 €", Money(2000000.5, "EUR")),
+        ("1 200 000 dollars", Money(1200000, "USD")),
+        ("about 3bn", Money(3000000000)),
+        ("£750", Money(750, "GBP")),
+        ("$1.250M", Money(1250000, "USD")),
+        ("1.500 million", Money(1500000)),
+        ("500000 EUR", Money(500000, "EUR")),
+        ("12.75", Money(12.75)),
+        (1500, Money(1500)),
+    ],
+)
+def test_parse_money(value, expected):
+    assert parse_money(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value", ["not sure yet", "$5 EUR", "Series A", None, True]
+)
+def test_not_an_amount(value):
+    assert parse_money(value) is None
+
+
+def test_schemas_keep_amounts_as_given():
+    details = CompanyDetailsSchema(
+        funding_raise="€500k",
+        target_revenue_in_one_year=2000000,
+        target_round_funding="not decided",
+    )
+    assert details.to_dict() == {
+        "funding_raise": "€500k",
+        "target_revenue_in_one_year": 2000000,
+        "target_round_funding": "not decided",
+    }
+    assert details.money("funding_raise") == Money(500000, "EUR")
+    assert details.money("target_revenue_in_one_year") == Money(2000000)
+    assert details.money("target_round_funding") is None
+
+    assumptions = AssumptionsInputSchema(target_round_funding="$2.5k")
+    assert assumptions.target_round_funding == "$2.5k"
+    assert assumptions.money("target_round_funding") == Money(2500, "USD")
+    assert assumptions.money("funding_raise") is None
+
+
+def test_money_amount_normalizes_strings_and_keeps_numbers():
+    class Opted(BaseModel):
+        amount: Optional[MoneyAmount] = None
+
+    assert Opted(amount="€500k").amount == "500000 EUR"
+    assert Opted(amount="1,200,000").amount == "1200000"
+    assert Opted(amount="not sure yet").amount == "not sure yet"
+    assert Opted(amount=1500000).amount == 1500000
+    assert Opted(amount=2.5).amount == 2.5
+    with pytest.raises(ValidationError):
+        Opted(amount=True)
+
+
+def test_failed_matches_do_not_backtrack():
+    start = time.perf_counter()
+    assert _AMOUNT.fullmatch("1" + " " * 2000 + "x") is None
+    assert parse_money("1" + " " * 50 + "x") is None
+    assert parse_money("1" * 65) is None
+    assert time.perf_counter() - start < 0.1
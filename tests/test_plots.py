@@ -0,0 +1,110 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lucid_ai_schemas.plots import (  # noqa: E402
+    LAYOUTS,
+    PlotEngine,
+    SeriesTable,
+)
+from lucid_ai_schemas.Schemas.schemas import (  # noqa: E402
+    GraphType,
+    PlotCollectionResponse,
+)
+
+SERIES = {
+    1: {"2025-01-01": 1.0, "2025-02-01": 2.0, "2025-03-01": 3.0},
+    2: {"2025-01-01": 10.0, "2025-03-01": 30.0},
+    3: {"2025-01-01": 5.0, "2025-02-01": 5.0, "2025-03-01": 5.0},
+}
+
+
+def plots(graph_type, formulas=(1, 2, 3), time_period=None):
+    return PlotCollectionResponse(
+        plots=[
+            {
+                "name": "Plot",
+                "type": graph_type,
+                "time_period": time_period,
+                "formulas": list(formulas),
+            }
+        ]
+    )
+
+
+def test_every_graph_type_has_a_layout():
+    assert set(LAYOUTS) == set(GraphType)
+
+
+def test_table_aligns_dates():
+    table = SeriesTable.from_series(SERIES)
+    assert [str(d) for d in table.dates] == [
+        "2025-01-01",
+        "2025-02-01",
+        "2025-03-01",
+    ]
+    assert np.isnan(table.values[1, 1])
+    with pytest.raises(ValueError, match="Invalid values"):
+        SeriesTable([1], ["2025-01-01"], [[1.0, 2.0]])
+
+
+def test_series_and_period():
+    engine = PlotEngine(SeriesTable.from_series(SERIES))
+    chart = engine.materialize(plots("Line", (1, 9), "2025-02-01:2025-03-31"))[
+        0
+    ]
+    assert chart.layout == "series"
+    assert chart.formulas == [1] and chart.missing == [9]
+    assert chart.series.tolist() == [[2.0, 3.0]]
+    assert engine.period("Feb 2025:2025-03-31") == (1, 3)
+    for bad in ("2025-03-01", "2025-03-01:2025-01-01", "soon:later"):
+        with pytest.raises(ValueError, match="Invalid time_period"):
+            engine.period(bad)
+
+
+def test_stacked_and_combo_layouts():
+    engine = PlotEngine(SeriesTable.from_series(SERIES))
+    stacked = engine.materialize(plots("Stacked"))[0]
+    assert stacked.data["top"][-1].tolist() == [16.0, 7.0, 38.0]
+    assert stacked.data["base"][1].tolist() == [1.0, 2.0, 3.0]
+
+    combo = engine.materialize(plots("BarCombo"))[0]
+    assert combo.data["bars"].shape == (2, 3)
+    assert combo.data["line"].tolist() == [5.0, 5.0, 5.0]
+
+    stacked_combo = engine.materialize(plots("StackedCombo"))[0]
+    assert stacked_combo.data["top"][-1].tolist() == [11.0, 2.0, 33.0]
+    assert stacked_combo.data["line"].tolist() == [5.0, 5.0, 5.0]
+
+
+def test_totals_layouts():
+    engine = PlotEngine(SeriesTable.from_series(SERIES))
+    donut = engine.materialize(plots("donut"))[0]
+    assert donut.type is GraphType.donut
+    assert donut.data["totals"].tolist() == [6.0, 40.0, 15.0]
+    assert donut.data["shares"].sum() == pytest.approx(1.0)
+
+    ranked = engine.materialize(plots("rankedList"))[0]
+    assert ranked.data["order"] == [2, 3, 1]
+
+    card = engine.materialize(plots("Scorecard", time_period=None))[0]
+    assert card.data["value"].tolist() == [3.0, 30.0, 5.0]
+    assert card.data["change"].tolist() == [2.0, 20.0, 0.0]
+
+
+def test_series_are_shared_and_cached():
+    engine = PlotEngine(SeriesTable.from_series(SERIES))
+    response = PlotCollectionResponse(
+        plots=[
+            {"type": "Bar", "formulas": [1, 2]},
+            {"type": "Area", "formulas": [2, 3]},
+            {"type": "Bar", "formulas": [1], "time_period": None},
+        ]
+    )
+    first = engine.materialize(response)
+    assert len(engine._cache) == 3
+    again = engine.materialize(response)
+    assert len(engine._cache) == 3
+    assert np.array_equal(first[1].series, again[1].series, equal_nan=True)
+    engine.clear()
+    assert not engine._cache
@@ -0,0 +1,50 @@
+import gc
+import os
+
+import pytest
+
+from lucid_ai_schemas import preload
+from lucid_ai_schemas.bench import SAMPLES
+from lucid_ai_schemas.Schemas.schemas import PositionSchema
+
+
+def test_preload_builds_everything_and_freezes():
+    try:
+        built = preload.preload()
+        assert built["models"] > built["json_schemas"] > 20
+        assert built["frozen_objects"] > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_preload_runs_caller_samples():
+    try:
+        built = preload.preload(
+            samples={PositionSchema: SAMPLES["PositionSchema"](2)}
+        )
+        assert built["samples"] == 1
+    finally:
+        gc.unfreeze()
+
+
+def test_json_schema_is_cached_and_copied():
+    schema = preload.json_schema(PositionSchema)
+    assert schema == PositionSchema.model_json_schema()
+    schema["title"] = "changed"
+    assert preload.json_schema(PositionSchema)["title"] == "PositionSchema"
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/smaps_rollup"), reason="Linux only"
+)
+def test_measure_uss_reports_every_worker():
+    results = preload.measure_uss(workers=2, rounds=1)
+    for mode in ("baseline", "preload"):
+        assert len(results[mode]["workers_uss"]) == 2
+        assert all(size > 0 for size in results[mode]["workers_uss"])
+
+
+def test_json_schema_without_copy_is_shared():
+    schema = preload.json_schema(PositionSchema, copy=False)
+    assert schema is preload.json_schema(PositionSchema, copy=False)
+    assert schema == preload.json_schema(PositionSchema)
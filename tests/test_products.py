@@ -0,0 +1,93 @@
+import math
+
+import pytest
+
+from lucid_ai_schemas.Schemas.schemas import ProductGeneratorOutput
+
+np = pytest.importorskip("numpy")
+
+from lucid_ai_schemas.products import (  # noqa: E402
+    ProductBatch,
+    company_totals,
+    product_metrics,
+    python_metrics,
+    subscription_codes,
+)
+
+
+def product(kind, price=10.0, last_m=30.0, y_ago=20.0, cac=60.0):
+    return {
+        "price": price,
+        "amount_sold_last_m": last_m,
+        "amount_sold_y_ago": y_ago,
+        "subscription_type": kind,
+        "CAC": cac,
+    }
+
+
+OUTPUTS = [
+    {
+        "products": [
+            product("Monthly Subscription"),
+            product("Yearly Subscription", price=120.0, y_ago=0.0),
+        ]
+    },
+    {
+        "products": [
+            product("One Time Purchase", price=5.0),
+            product("Monthly & Yearly Subscription", price=0.0),
+        ]
+    },
+]
+
+
+def test_metrics_per_product():
+    batch = ProductBatch.from_outputs(OUTPUTS)
+    assert len(batch) == 4
+    assert batch.company.tolist() == [0, 0, 1, 1]
+    metrics = product_metrics(batch)
+    assert metrics["monthly_price"].tolist() == [10.0, 10.0, 0.0, 0.0]
+    assert metrics["mrr"].tolist() == [300.0, 300.0, 0.0, 0.0]
+    assert metrics["arr"][0] == 3600.0
+    assert metrics["revenue_last_m"].tolist() == [300.0, 300.0, 150.0, 0.0]
+    growth = metrics["yoy_growth"]
+    assert growth[0] == 0.5 and math.isnan(growth[1])
+    payback = metrics["cac_payback_months"]
+    assert payback[0] == 6.0
+    assert math.isnan(payback[2]) and math.isnan(payback[3])
+    assert product_metrics(batch, margin=0.5)["cac_payback_months"][0] == 12
+
+
+def test_matches_the_python_reference():
+    batch = ProductBatch.from_outputs(OUTPUTS)
+    metrics = product_metrics(batch)
+    products = [
+        p
+        for output in OUTPUTS
+        for p in ProductGeneratorOutput.model_validate(output).products
+    ]
+    for i, item in enumerate(products):
+        expected = python_metrics(item)
+        assert np.allclose(
+            [metrics[key][i] for key in expected],
+            list(expected.values()),
+            equal_nan=True,
+        )
+
+
+def test_company_totals():
+    batch = ProductBatch.from_outputs(OUTPUTS)
+    totals = company_totals(batch)
+    assert totals["products"].tolist() == [2, 2]
+    assert totals["arr"].tolist() == [7200.0, 0.0]
+    assert totals["revenue_last_m"].tolist() == [600.0, 150.0]
+    # Only products sold a year ago count towards growth.
+    assert totals["yoy_growth"].tolist() == [0.5, 0.5]
+
+
+def test_subscription_codes_and_columns():
+    assert subscription_codes(["One Time Purchase"]).tolist() == [1]
+    with pytest.raises(ValueError, match="Invalid subscription_type"):
+        subscription_codes(["Weekly"])
+    with pytest.raises(ValueError, match="Invalid columns"):
+        ProductBatch([1.0], [1.0], [1.0], [1.0], [0, 0])
@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+from lucid_ai_schemas.cli import main
+from lucid_ai_schemas.logsink import LogSink
+from lucid_ai_schemas.metrics import Histogram
+from lucid_ai_schemas.replay import load_schemas, replay, replay_logs
+
+OLD = """
+from pydantic import BaseModel, field_validator
+
+
+class Item(BaseModel):
+    name: str
+    qty: int
+
+    @field_validator("name")
+    def clean(cls, value):
+        return value.strip()
+"""
+
+NEW = """
+from pydantic import BaseModel, Field, field_validator
+
+
+class Item(BaseModel):
+    name: str
+    qty: int = Field(ge=0)
+
+    @field_validator("name")
+    def clean(cls, value):
+        return value.strip().lower()
+"""
+
+RESPONSES = [
+    {"name": "Ann", "qty": 1},  # newly coerced
+    {"name": " Bob ", "qty": 1},  # changed values
+    {"name": "c", "qty": -1},  # newly failing
+    {"name": "d", "qty": "x"},  # fails in both
+    {"name": "e", "qty": 2},  # unchanged
+]
+
+
+@pytest.fixture
+def versions(tmpdir):
+    paths = []
+    for name, source in (("old.py", OLD), ("new.py", NEW)):
+        path = tmpdir.join(name)
+        path.write(source)
+        paths.append(str(path))
+    return paths
+
+
+def records():
+    for response in RESPONSES:
+        yield {
+            "prompt_object": {"response_schema": "Item"},
+            "response": response,
+        }
+    yield {"prompt_object": {}, "response": {"name": "skipped"}}
+
+
+def check(report):
+    assert report["records"] == 6
+    assert report["skipped"] == 1
+    item = report["schemas"]["Item"]
+    assert item["records"] == 5
+    assert item["old_failed"] == 1
+    assert item["new_failed"] == 2
+    assert item["newly_failing"] == 1
+    assert item["newly_passing"] == 0
+    assert item["newly_coerced"] == 1
+    assert item["changed_values"] == 1
+    assert item["examples"]["changed_values"] == [
+        {
+            "record": 1,
+            "response": {"name": " Bob ", "qty": 1},
+            "old": {"name": "Bob", "qty": 1},
+            "new": {"name": "bob", "qty": 1},
+        }
+    ]
+    assert item["new"]["mean_us"] > 0
+
+
+def test_replay_in_process(versions):
+    old, new = versions
+    check(replay(records(), old, new, workers=0, chunk_size=2))
+
+
+def test_replay_logs_in_a_process_pool(versions, tmpdir):
+    old, new = versions
+    with LogSink(str(tmpdir)) as sink:
+        for record in records():
+            sink.emit(record)
+    check(replay_logs(str(tmpdir), old, new=new, workers=2, chunk_size=2))
+
+    output = tmpdir.join("report.json")
+    main(
+        [
+            "replay",
+            str(tmpdir),
+            "--old",
+            old,
+            "--new",
+            new,
+            "--workers",
+            "0",
+            "-o",
+            str(output),
+        ]
+    )
+    check(json.loads(output.read()))
+
+
+def test_fixed_schema_and_module_sources(versions):
+    old, _ = versions
+    report = replay(
+        [{"response": {"status": "ok"}}],
+        old="lucid_ai_schemas.Schemas.schemas",
+        new=old,
+        schema_for="StringResponse",
+        workers=0,
+    )
+    # The new version does not define StringResponse: everything fails.
+    assert report["schemas"]["StringResponse"]["newly_failing"] == 1
+    assert load_schemas(old) is load_schemas(old)
+
+
+def test_histogram_merge_and_quantile():
+    first, second = Histogram((1, 2, 4)), Histogram((1, 2, 4))
+    for value in (0.5, 1.5, 3):
+        first.observe(value)
+    second.observe(10)
+    first.merge(second)
+    assert first.count == 4
+    assert first.quantile(0.5) == 2
+    assert first.quantile(1) == float("inf")
+    assert Histogram((1,)).quantile(0.5) is None
+
+
+BUGGY = """
+from pydantic import BaseModel, field_validator
+
+
+class Item(BaseModel):
+    name: str
+    qty: int
+
+    @field_validator("name")
+    def clean(cls, value):
+        return value.strip().upper() if value != "Bob" else value.when
+"""
+
+
+def test_unexpected_exceptions_only_fail_their_record(versions, tmpdir):
+    old, _ = versions
+    buggy = tmpdir.join("buggy.py")
+    buggy.write(BUGGY)
+    responses = [{"name": "Bob", "qty": 1}, {"name": "ann", "qty": 2}]
+    report = replay(
+        [{"response": r} for r in responses],
+        old,
+        str(buggy),
+        schema_for="Item",
+        workers=0,
+    )
+    item = report["schemas"]["Item"]
+    assert item["records"] == 2
+    assert item["new_raised"] == 1 and item["old_raised"] == 0
+    assert item["newly_failing"] == 1 and item["newly_coerced"] == 1
+    assert item["exceptions"] == {"old": {}, "new": {"AttributeError": 1}}
+    example = item["examples"]["newly_failing"][0]
+    assert example["new"] is None
+    assert example["new_error"].startswith("AttributeError: ")
+    assert "old_error" not in example
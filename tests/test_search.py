@@ -0,0 +1,66 @@
+import pytest
+
+from lucid_ai_schemas.Schemas.schemas import PlotORFormulaSchema
+from lucid_ai_schemas.search import FormulaIndex, TextIndex, terms
+from lucid_ai_schemas.tokens import count_tokens
+
+CATALOG = [
+    (1, "Monthly Revenue"),
+    (2, "grossMargin_EU"),
+    (3, "Churn Rate"),
+    (4, "Marketing Spend"),
+    (5, "Revenue per Customer"),
+    (6, "Headcount"),
+    (7, "Customer Acquisition Cost"),
+]
+
+
+def test_terms():
+    assert terms("grossMargin_EU") == ["gross", "margin", "eu"]
+    assert terms("Show me the revenues of MRR2025") == [
+        "revenue",
+        "mrr",
+        "2025",
+    ]
+    assert terms("Sales loss") == ["sale", "loss"]
+    assert terms(None) == []
+
+
+def test_ranking_typos_and_prefixes():
+    index = FormulaIndex(CATALOG)
+    assert [f.id for f in index.shortlist("monthly revenue", 2)] == [1, 5]
+    assert index.shortlist("gross margin in europe")[0].id == 2
+    assert index.shortlist("revnue", 2)[0].id in (1, 5)
+    assert index.shortlist("acq cost")[0].id == 7
+    assert index.shortlist("the weather") == []
+    scores = [score for _, score in index.search("customer revenue")]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_narrow_and_lookup():
+    formulas = [{"id": i, "name": name} for i, name in CATALOG]
+    schema = PlotORFormulaSchema(formulas=formulas, freetext="churn")
+    index = FormulaIndex.from_schema(schema)
+    narrowed = index.narrow(schema, k=3)
+    assert [f.id for f in narrowed.formulas] == [3]
+    assert narrowed.freetext == "churn"
+    assert count_tokens(narrowed) < count_tokens(schema)
+    # Nothing matches: the model gets the whole catalog.
+    unmatched = schema.model_copy(update={"freetext": "xyz"})
+    assert len(index.narrow(unmatched).formulas) == len(CATALOG)
+    assert index.formula(6).name == "Headcount"
+    assert index.formula(99) is None
+
+
+def test_bm25_prefers_rare_terms_and_short_texts():
+    index = TextIndex(["revenue", "revenue forecast", "forecast", "x y z"])
+    best = index.search("revenue forecast", 4)
+    assert best[0][0] == 1
+    assert [position for position, _ in index.search("revenue", 2)] == [0, 1]
+    assert TextIndex([]).search("revenue") == []
+
+
+@pytest.mark.parametrize("k", [1, 5])
+def test_shortlist_size(k):
+    index = FormulaIndex((i, f"Revenue {i}") for i in range(50))
+    assert len(index.shortlist("revenue", k)) == k
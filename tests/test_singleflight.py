@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyDetailsSchema,
+    OrchestratorSchema,
+)
+from lucid_ai_schemas.singleflight import SingleFlight, canonical_key
+
+
+def test_canonical_key_ignores_spelling_of_equal_inputs():
+    first = CompanyDetailsSchema(funding_raise="$2M", location="Germany")
+    second = CompanyDetailsSchema(
+        location="Germany", funding_raise="2,000,000 dollars"
+    )
+    assert canonical_key(first) == canonical_key(second)
+    assert canonical_key(
+        CompanyDetailsSchema(funding_raise=2000000)
+    ) == canonical_key(CompanyDetailsSchema(funding_raise="2,000,000"))
+    assert canonical_key(
+        CompanyDetailsSchema(funding_raise=2000000)
+    ) != canonical_key(CompanyDetailsSchema(funding_raise="$2M"))
+    assert canonical_key(OrchestratorSchema()) == canonical_key(
+        OrchestratorSchema(branch_id=None)
+    )
+    assert canonical_key(first) != canonical_key(
+        CompanyDetailsSchema(funding_raise="$3M", location="Germany")
+    )
+
+
+def counting_llm(delay=0.01, error=None):
+    calls = []
+
+    async def llm(schema):
+        calls.append(schema)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return {"branch_id": schema.branch_id}
+
+    return llm, calls
+
+
+def test_concurrent_identical_calls_share_one_flight():
+    flights = SingleFlight()
+    llm, calls = counting_llm()
+    call = flights.wrap(llm)
+
+    async def main():
+        schemas = [OrchestratorSchema(branch_id=i % 2) for i in range(10)]
+        results = await asyncio.gather(*(call(s) for s in schemas))
+        # Finished flights are not cached.
+        await call(OrchestratorSchema(branch_id=0))
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 3
+    assert results[0] == results[2] == {"branch_id": 0}
+    assert flights.stats == {
+        "calls": 11,
+        "flights": 3,
+        "shared": 8,
+        "in_flight": 0,
+        "orphans_cancelled": 0,
+    }
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+    llm, calls = counting_llm(error=RuntimeError("upstream down"))
+    schema = OrchestratorSchema(branch_id=1)
+
+    async def main():
+        return await asyncio.gather(
+            *(flights.do(schema, lambda: llm(schema)) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_timeouts_and_cancellation():
+    schema = OrchestratorSchema(branch_id=1)
+
+    async def main():
+        flights = SingleFlight()
+        llm, calls = counting_llm(delay=0.05)
+        patient = asyncio.ensure_future(
+            flights.do(schema, lambda: llm(schema))
+        )
+        # An impatient caller times out alone...
+        with pytest.raises(asyncio.TimeoutError):
+            await flights.do(schema, lambda: llm(schema), timeout=0.01)
+        # ...and a cancelled one does not cancel the shared call.
+        cancelled = asyncio.ensure_future(
+            flights.do(schema, lambda: llm(schema))
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert await patient == {"branch_id": 1}
+        assert len(calls) == 1
+
+        # Once every waiter is gone, the orphaned call is cancelled.
+        orphan = asyncio.ensure_future(flights.do(schema, lambda: llm(schema)))
+        await asyncio.sleep(0.01)
+        orphan.cancel()
+        await asyncio.sleep(0)
+        assert not flights.in_flight(schema)
+        assert flights.orphans_cancelled == 1
+
+        # The upstream call itself can be bounded for everyone.
+        bounded = SingleFlight(call_timeout=0.01)
+        results = await asyncio.gather(
+            *(bounded.do(schema, lambda: llm(schema)) for _ in range(2)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+
+    asyncio.run(main())
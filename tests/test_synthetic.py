@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from lucid_ai_schemas.bench import schema_classes
+from lucid_ai_schemas.dag import ONBOARDING
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyFieldExtractorResponse,
+    PlotCollectionResponse,
+    PositionSchema,
+    ProductGeneratorOutput,
+    PromptTypeResponse,
+    SalaryGeneratorResponse,
+)
+from lucid_ai_schemas.synthetic import (
+    FakeLLMClient,
+    FakeLLMServer,
+    Generator,
+)
+
+
+@pytest.mark.parametrize("name", sorted(schema_classes()))
+def test_valid_payloads_validate(name):
+    model = schema_classes()[name]
+    generator = Generator(model, items=(0, 4), seed=0)
+    for _ in range(20):
+        model.model_validate(generator.payload())
+
+
+def test_sizes_and_field_types():
+    generator = Generator(PositionSchema, items=7, seed=1)
+    positions = generator.payload()["positions"]
+    assert len(positions) == 7
+    instance = PositionSchema.model_validate({"positions": positions})
+    assert all(p.start_date.startswith("20") for p in instance.positions)
+
+    plots = Generator(PlotCollectionResponse, items=(2, 3), seed=1)
+    lengths = {len(plots.payload()["plots"]) for _ in range(50)}
+    assert lengths == {2, 3}
+    fields = Generator(CompanyFieldExtractorResponse, seed=1).payload()
+    assert CompanyFieldExtractorResponse(**fields).SECTORS
+
+
+def test_fields_that_never_validate_are_skipped():
+    generator = Generator(PromptTypeResponse, seed=0)
+    assert generator.skipped == {"PromptTypeResponse": ["category", "sector"]}
+    assert set(generator.payload()) == {"balance", "location"}
+
+
+@pytest.mark.parametrize(
+    "model, kind",
+    [
+        (PositionSchema, "type"),
+        (SalaryGeneratorResponse, "missing"),
+        (SalaryGeneratorResponse, "extra"),
+        (ProductGeneratorOutput, "range"),
+        (ProductGeneratorOutput, "missing"),
+    ],
+)
+def test_invalid_payloads_fail(model, kind):
+    generator = Generator(model, seed=2)
+    for _ in range(20):
+        payload, applied = generator.invalid(kind)
+        assert applied == kind
+        with pytest.raises(ValidationError):
+            model.model_validate(payload)
+
+
+def test_error_mix_and_fallbacks():
+    generator = Generator(
+        PositionSchema, invalid_rate=0.5, errors={"type": 1}, seed=3
+    )
+    kinds = [kind for _, kind in generator.batch(400)]
+    assert 150 < kinds.count("type") < 250
+    assert set(kinds) == {None, "type"}
+    # No required field in PositionSchema: falls back to a type error.
+    assert generator.invalid("missing")[1] == "type"
+
+    truncated = Generator(PositionSchema, invalid_rate=1.0, seed=3)
+    truncated.errors = {"truncate": 1}
+    text, kind = truncated.sample_json()
+    assert kind == "truncate"
+    with pytest.raises(ValueError):
+        json.loads(text)
+
+    with pytest.raises(ValueError, match="Invalid error kinds"):
+        Generator(PositionSchema, errors={"typo": 1})
+
+
+def test_server_replies_plain_and_streamed():
+    async def main():
+        async with FakeLLMServer(seed=0, chunk_size=16) as server:
+            plain = FakeLLMClient(server.port, items=4)
+            reply = await plain.get("PositionSchema")
+            assert reply.status == 200 and reply.error is None
+            assert len(json.loads(reply.text)["positions"]) == 4
+
+            streamed = FakeLLMClient(server.port, stream=True)
+            reply = await streamed.get("SalaryGeneratorResponse", items=20)
+            SalaryGeneratorResponse.model_validate_json(reply.text)
+
+            reply = await plain.get("SalaryGeneratorResponse", error="extra")
+            assert reply.error == "extra"
+            with pytest.raises(ValidationError):
+                SalaryGeneratorResponse.model_validate_json(reply.text)
+
+            assert (await plain.get("Nope")).status == 404
+            assert (await plain.get("PositionSchema", error="x")).status == 400
+            # One keep-alive connection per client.
+            assert server.requests == 5
+            for items in (-1, server.max_items + 1):
+                reply = await plain.get("PositionSchema", items=items)
+                assert reply.status == 400
+            await plain.close()
+            await streamed.close()
+
+    asyncio.run(main())
+
+
+def test_server_latency_and_dag_integration():
+    async def main():
+        async with FakeLLMServer(latency=0.05, seed=0) as server:
+            client = FakeLLMClient(server.port)
+            reply = await client.get("StringResponse")
+            assert reply.first_byte_s >= 0.04
+            result = await ONBOARDING.run(client, {"freetext": "x"})
+            await client.close()
+        return result
+
+    result = asyncio.run(main())
+    assert set(result.responses) == set(ONBOARDING.nodes)
+
+
+def test_server_rejects_malformed_requests():
+    async def send(port, data):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(data)
+        status = await reader.readline()
+        writer.close()
+        return status
+
+    async def main():
+        async with FakeLLMServer(seed=0) as server:
+            server.max_generators = 2
+            for data in (
+                b"NONSENSE\r\n\r\n",
+                b"GET /v1/PositionSchema HTTP/1.1\r\n"
+                b"Content-Length: lots\r\n\r\n",
+                b"GET /v1/PositionSchema HTTP/1.1\r\n"
+                b"Content-Length: -5\r\n\r\n",
+            ):
+                assert (await send(server.port, data)).startswith(
+                    b"HTTP/1.1 400"
+                )
+            client = FakeLLMClient(server.port)
+            for items in range(1, 6):
+                reply = await client.get("PositionSchema", items=items)
+                assert reply.status == 200
+            await client.close()
+            assert len(server._generators) == 2
+
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+import pytest
+
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyDetailsSchema,
+    Countries,
+    Sectors,
+    Stages,
+    TemplateAssignerSchema,
+)
+from lucid_ai_schemas.templates import Template, TemplateCatalog
+from lucid_ai_schemas.tokens import estimate_tokens
+
+TEMPLATES = [
+    Template("Generic P&L", "Revenue, costs and profit"),
+    Template(
+        "SaaS metrics",
+        "MRR, churn and CAC payback",
+        sectors={Sectors.SAAS_SOFTWARE_AS_A_SERVICE},
+    ),
+    {"name": "Seed fundraising", "stages": ["Seed Stage"]},
+    {
+        "name": "German payroll",
+        "description": "Payroll taxes and hiring costs",
+        "locations": ["Germany"],
+    },
+    Template("Clinical trials", sectors={Sectors.BIOTECHNOLOGY}),
+]
+
+
+def test_catalog_normalizes_templates():
+    catalog = TemplateCatalog(TEMPLATES)
+    assert len(catalog) == 5
+    assert catalog.templates[2].stages == {Stages.SEED_STAGE}
+    assert catalog.templates[3].locations == {Countries.GERMANY}
+    assert catalog.lines[1] == "SaaS metrics: MRR, churn and CAC payback"
+    with pytest.raises(ValueError, match="Invalid sector: Spacetech"):
+        TemplateCatalog([{"name": "x", "sectors": ["Spacetech"]}])
+
+
+def test_select_ranks_by_enums_and_text():
+    catalog = TemplateCatalog(TEMPLATES)
+    company = CompanyDetailsSchema(
+        sectors=["SaaS (Software as a Service)"],
+        company_stage="seed stage",
+        location="Germany",
+    )
+    names = [t.name for t in catalog.select(company)]
+    # One specific match beats matching any, in catalog order.
+    assert names == [
+        "SaaS metrics",
+        "Seed fundraising",
+        "German payroll",
+        "Generic P&L",
+        "Clinical trials",
+    ]
+
+    hiring = company.model_copy(update={"freetext": "hiring in Berlin"})
+    assert catalog.select(hiring, k=1)[0].name == "German payroll"
+    # Sectors outside the enum are searched as text.
+    trials = CompanyDetailsSchema(sectors="clinical research")
+    assert catalog.select(trials, k=1)[0].name == "Clinical trials"
+
+
+def test_assign_respects_the_budget():
+    catalog = TemplateCatalog(TEMPLATES)
+    company = TemplateAssignerSchema(
+        sectors="SaaS (Software as a Service)",
+        template_list="everything",
+        funding_raise="$2M",
+    )
+    schema = catalog.assign(company, budget=20)
+    assert estimate_tokens(schema.template_list) <= 20
+    assert schema.template_list.startswith("SaaS metrics")
+    assert schema.funding_raise == company.funding_raise
+    assert catalog.assign(company, budget=0).template_list == ""
+    assert catalog.assign(company, k=2).template_list.count("\n") == 1
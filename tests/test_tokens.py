@@ -0,0 +1,107 @@
+from lucid_ai_schemas.Schemas.schemas import (
+    AssumptionsInputSchema,
+    CompanySummaryRefinerSchema,
+    ExplainerSchema,
+)
+from lucid_ai_schemas.tokens import (
+    TRUNCATED,
+    count_tokens,
+    estimate_tokens,
+    field_tokens,
+    plan_budget,
+    truncate_text,
+)
+
+
+def test_estimate_tokens_is_close_to_bpe_counts():
+    assert estimate_tokens("Hello world, this is a test.") == 8
+    assert 12 <= estimate_tokens('{"name": "Revenue", "value": 12345}') <= 15
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("internationalization") == 3
+
+
+def test_field_tokens_skips_empty_fields():
+    schema = AssumptionsInputSchema(freetext="We sell shoes", formulas=None)
+    tokens = field_tokens(schema)
+    assert tokens["freetext"] == 3
+    assert tokens["formulas"] == 0
+
+
+def test_truncate_text_fits():
+    text = "revenue growth " * 500
+    cut = truncate_text(text, 100)
+    assert cut.endswith(TRUNCATED)
+    assert estimate_tokens(cut) <= 100
+    assert truncate_text("short", 100) == "short"
+
+
+def test_plan_trims_lowest_priority_fields_first():
+    schema = CompanySummaryRefinerSchema(
+        seo_description="Shoes for runners",
+        short_description="Running shoes",
+        scraped_website_data="running shoes for everyone " * 2000,
+    )
+    plan = plan_budget(schema, budget=500)
+    assert plan.fits
+    assert plan.tokens <= 450
+    assert [a.field for a in plan.actions] == ["scraped_website_data"]
+    assert plan.instance.seo_description == "Shoes for runners"
+    assert plan.instance.scraped_website_data.endswith(TRUNCATED)
+    # The input itself is left untouched.
+    assert count_tokens(schema) > 500
+
+
+def test_plan_keeps_leading_list_items_and_summarizes():
+    schema = AssumptionsInputSchema(
+        freetext="subscription software " * 300,
+        formulas=[{"id": i, "name": f"Formula {i}"} for i in range(500)],
+    )
+
+    def summarize(text, max_tokens):
+        return "subscription software"
+
+    plan = plan_budget(schema, budget=2000, summarize=summarize)
+    assert plan.fits
+    formulas = plan.instance.formulas
+    assert formulas == schema.formulas[: len(formulas)]
+    assert plan.actions[0].action == f"kept {len(formulas)} of 500"
+
+    plan = plan_budget(schema, budget=200, summarize=summarize)
+    assert plan.fits
+    assert plan.instance.formulas is None
+    assert plan.instance.freetext == "subscription software"
+
+
+def test_plan_reports_when_it_cannot_fit():
+    schema = ExplainerSchema(input=[])
+    assert plan_budget(schema, budget=10_000).fits
+    schema = CompanySummaryRefinerSchema(seo_description="word " * 5000)
+    plan = plan_budget(schema, budget=100, priorities={})
+    assert not plan.fits
+    assert plan.actions == []
+
+
+def test_plan_trims_a_formula_instead_of_dropping_it():
+    transactions = [
+        {"date": "2025-01-01", "name": f"Vendor {i}", "amount": i}
+        for i in range(2000)
+    ]
+    schema = ExplainerSchema(
+        input=[{"name": "Payroll", "transactions": transactions}]
+    )
+    plan = plan_budget(schema, budget=2000)
+    assert plan.fits
+    (formula,) = plan.instance.input
+    kept = formula.transactions
+    assert 0 < len(kept) < 2000
+    assert kept == schema.input[0].transactions[: len(kept)]
+    assert plan.actions[0].action == "kept 1 of 1, last trimmed"
+
+
+def test_only_short_texts_are_cached():
+    from lucid_ai_schemas.tokens import CACHED_CHARS, cache_info, clear_cache
+
+    clear_cache()
+    estimate_tokens("short text")
+    estimate_tokens("x" * (CACHED_CHARS + 1))
+    assert cache_info().currsize == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from lucid_ai_schemas.bench import SAMPLES
+from lucid_ai_schemas.introspect import field_kinds
+from lucid_ai_schemas.Schemas.schemas import (
+    Countries,
+    Departments,
+    ExplainerSchema,
+    PositionSchema,
+    ProductGeneratorOutput,
+)
+from lucid_ai_schemas.trusted import DriftError, TrustedLoader, construct
+
+
+def test_field_kinds_resolve_nested_and_forward_refs():
+    assert field_kinds(PositionSchema) == {
+        "positions": ("models", PositionSchema.Positions)
+    }
+    assert field_kinds(ExplainerSchema.Formula)["transactions"] == (
+        "models",
+        ExplainerSchema.Formula.Transaction,
+    )
+    assert field_kinds(PositionSchema.Positions)["department"] == (
+        "enum",
+        Departments,
+    )
+
+
+@pytest.mark.parametrize(
+    "model", [PositionSchema, ProductGeneratorOutput, ExplainerSchema]
+)
+def test_construct_matches_validation(model):
+    validated = model.model_validate(SAMPLES[model.__name__](3))
+    stored = validated.model_dump(mode="json")
+    trusted = construct(model, stored)
+    assert trusted == validated
+    assert trusted.model_dump() == validated.model_dump()
+
+
+def test_construct_builds_nested_models_and_enums():
+    trusted = construct(
+        PositionSchema,
+        {"positions": [{"id": 1, "department": "R&D"}]},
+    )
+    position = trusted.positions[0]
+    assert isinstance(position, PositionSchema.Positions)
+    assert position.department is Departments.R_D
+    assert position.geo_location is Countries.UNITED_STATES_OF_AMERICA_USA
+    # Fields keep the order of the model, like validated instances.
+    assert list(position.__dict__) == list(type(position).model_fields)
+    assert (
+        trusted.model_dump_json()
+        == PositionSchema.model_validate(
+            trusted.model_dump()
+        ).model_dump_json()
+    )
+
+
+def test_loader_samples_and_detects_drift():
+    stale = {"positions": [{"id": 1, "department": "rnd"}]}
+    loader = TrustedLoader(PositionSchema, sample_rate=1, on_drift="ignore")
+    fixed = loader.load(stale)
+    assert fixed.positions[0].department is Departments.R_D
+    assert loader.stats == {"loaded": 1, "verified": 1, "drifted": 1}
+
+    loader = TrustedLoader(PositionSchema, sample_rate=1, on_drift="raise")
+    with pytest.raises(DriftError):
+        loader.load(stale)
+
+    loader = TrustedLoader(PositionSchema, sample_rate=0)
+    loader.load_many([stale] * 5)
+    assert loader.stats == {"loaded": 5, "verified": 0, "drifted": 0}
@@ -0,0 +1,130 @@
+import gzip
+import json
+
+import pytest
+
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyDetailsSchema,
+    PositionSchema,
+    ProductGeneratorOutput,
+)
+from lucid_ai_schemas.versions import (
+    MIGRATIONS,
+    Migrations,
+    convert,
+    default,
+    drop,
+    each,
+    load,
+    migrate_file,
+    migrate_stream,
+    rename,
+    tag,
+    upgrade,
+)
+
+
+def test_builtin_versions():
+    assert MIGRATIONS.current("PositionSchema") == 2
+    assert MIGRATIONS.current("CompanyDetailsSchema") == 2
+    assert MIGRATIONS.current("ProductGeneratorOutput") == 1
+    record = tag(ProductGeneratorOutput, {"products": []})
+    assert record == {
+        "schema": "ProductGeneratorOutput",
+        "version": 1,
+        "data": {"products": []},
+    }
+    assert upgrade(record) == record
+
+
+def test_untagged_payloads_are_version_one():
+    payload = {"positions": [{"id": 1, "start_date": "March 2026"}]}
+    record = upgrade(payload, PositionSchema)
+    assert record["version"] == 2
+    assert record["data"]["positions"][0]["start_date"] == "2026-03-01"
+    with pytest.raises(ValueError, match="need their schema"):
+        upgrade({"positions": []})
+
+
+def test_load_matches_validation_of_upgraded_data():
+    record = {
+        "schema": "CompanyDetailsSchema",
+        "version": 1,
+        "data": {"funding_raise": "$2.5M", "raise_next_round_date": "Q3 2030"},
+    }
+    trusted = load(json.loads(json.dumps(record)), CompanyDetailsSchema, True)
+    assert trusted.funding_raise == "$2.5M"
+    assert trusted.raise_next_round_date == "2030-07-01"
+    assert load(record, CompanyDetailsSchema) == trusted
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"funding_raise": 2000000, "raise_next_round_date": "March 2026"},
+        {"funding_raise": "$2.5M", "target_round_funding": "not decided"},
+        {"target_revenue_in_one_year": "1,200,000"},
+    ],
+)
+def test_upgrade_agrees_with_validation(payload):
+    validated = CompanyDetailsSchema.model_validate(payload)
+    upgraded = upgrade(json.loads(json.dumps(payload)), CompanyDetailsSchema)
+    assert upgraded["data"] == validated.model_dump(exclude_unset=True)
+    assert CompanyDetailsSchema.model_validate(upgraded["data"]) == validated
+
+
+def test_upgrade_paths_are_compiled_from_every_step():
+    registry = Migrations()
+    registry.register(
+        "Plan", 2, rename("salary", "yearly_salary"), default("bonus", 0)
+    )
+    registry.register(
+        "Plan",
+        3,
+        drop("bonus"),
+        each("items", convert("qty", int)),
+    )
+    record = {
+        "schema": "Plan",
+        "version": 1,
+        "data": {"salary": 10, "items": [{"qty": "2"}]},
+    }
+    assert upgrade(record, registry=registry) == {
+        "schema": "Plan",
+        "version": 3,
+        "data": {"yearly_salary": 10, "items": [{"qty": 2}]},
+    }
+    assert registry.upgrader("Plan", 3) is None
+    assert registry.upgrader("Plan", 1) is registry.upgrader("Plan", 1)
+    with pytest.raises(ValueError, match="at most 3"):
+        registry.upgrader("Plan", 4)
+    registry.register("Gaps", 3)
+    with pytest.raises(ValueError, match="to version 2"):
+        registry.upgrader("Gaps", 1)
+    with pytest.raises(ValueError, match="Invalid version"):
+        registry.register("Plan", 1)
+
+
+def test_migrate_stream_and_file(tmpdir):
+    payloads = [
+        {"positions": [{"id": i, "start_date": "Jan 5, 2026"}]}
+        for i in range(25)
+    ]
+    batches = list(migrate_stream(payloads, PositionSchema, batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    source = str(tmpdir.join("v1.jsonl"))
+    destination = str(tmpdir.join("v2.jsonl.gz"))
+    with open(source, "w") as fh:
+        for i in range(5):
+            record = {"schema": "PositionSchema", "version": 1}
+            record["data"] = {"positions": [{"id": i, "start_date": "2026"}]}
+            fh.write(json.dumps(record) + "\n")
+    assert migrate_file(source, destination, batch_size=2) == 5
+    with gzip.open(destination, "rt") as fh:
+        records = [json.loads(line) for line in fh]
+    assert {r["version"] for r in records} == {2}
+    assert records[4]["data"]["positions"][0] == {
+        "id": 4,
+        "start_date": "2026-01-01",
+    }
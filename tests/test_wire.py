@@ -0,0 +1,138 @@
+import pytest
+
+from lucid_ai_schemas.bench import SAMPLES
+from lucid_ai_schemas.Schemas.schemas import (
+    CompanyFieldExtractorResponse,
+    Departments,
+    ExplainerSchema,
+    LogAIResponseObject,
+    PlotCollectionResponse,
+    PositionSchema,
+)
+from lucid_ai_schemas import wire
+from lucid_ai_schemas.wire import FORMATS, decode, encode
+
+
+# PromptTypeResponse validators reject its own dump, JSON included.
+@pytest.mark.parametrize("name", sorted(set(SAMPLES) - {"PromptTypeResponse"}))
+def test_round_trips_exactly_like_json(name):
+    from lucid_ai_schemas.bench import schema_classes
+
+    model = schema_classes()[name]
+    instance = model.model_validate(SAMPLES[name](5))
+    data = encode(instance)
+    for validate in (True, False):
+        back = decode(model, data, validate)
+        assert back.model_dump_json() == instance.model_dump_json()
+        assert back == model.model_validate_json(instance.model_dump_json())
+
+
+def test_methods_on_base_schemas():
+    plan = PositionSchema.model_validate(SAMPLES["PositionSchema"](100))
+    data = plan.to_bytes()
+    assert len(data) < len(plan.model_dump_json()) / 2
+    back = PositionSchema.from_bytes(data)
+    assert back.positions[0].department is plan.positions[0].department
+    assert isinstance(back.positions[0].department, Departments)
+
+    log = LogAIResponseObject(
+        response={"nested": [1, 2.5, None, {"a": "b"}]}, response_time=2.0
+    )
+    assert LogAIResponseObject.from_bytes(log.to_bytes()) == log
+    explainer = ExplainerSchema(
+        input=[{"name": "Costs", "transactions": [], "date": "March 2025"}]
+    )
+    assert ExplainerSchema.from_bytes(explainer.to_bytes()) == explainer
+
+
+def test_extras_enums_and_empty_lists():
+    fields = CompanyFieldExtractorResponse(
+        LOCATION="Germany", SECTORS=["Fintech", "Spacetech"], note="x"
+    )
+    back = decode(CompanyFieldExtractorResponse, encode(fields))
+    assert back.model_dump_json() == fields.model_dump_json()
+    assert back.note == "x"
+    plots = PlotCollectionResponse(
+        plots=[{"type": "donut"}, {"name": "b", "formulas": [1, 2]}]
+    )
+    assert decode(PlotCollectionResponse, encode(plots)) == plots
+    empty = PositionSchema(positions=[])
+    assert decode(PositionSchema, encode(empty)).positions == []
+
+
+def test_rejects_foreign_bytes():
+    data = encode(PositionSchema.model_validate(SAMPLES["PositionSchema"](2)))
+    with pytest.raises(ValueError, match="another layout of ExplainerSchema"):
+        decode(ExplainerSchema, data)
+    with pytest.raises(ValueError, match="not an encoded schema"):
+        decode(PositionSchema, b'{"positions": []}')
+    with pytest.raises(ValueError, match="Invalid format: bson"):
+        encode(PositionSchema(), "bson")
+    assert FORMATS[data[2]] in FORMATS
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_both_formats_round_trip(format):
+    if format == "msgpack":
+        pytest.importorskip("msgpack")
+    plan = PositionSchema.model_validate(SAMPLES["PositionSchema"](20))
+    data = encode(plan, format)
+    assert FORMATS[data[2]] == format
+    back = decode(PositionSchema, data, allow_marshal=format == "marshal")
+    assert back == plan
+
+
+def test_msgpack_is_the_default_and_marshal_is_opt_in(monkeypatch):
+    plan = PositionSchema.model_validate(SAMPLES["PositionSchema"](2))
+    data = encode(plan, "marshal")
+    with pytest.raises(ValueError, match="marshal format not allowed"):
+        PositionSchema.from_bytes(data)
+    assert PositionSchema.from_bytes(data, allow_marshal=True) == plan
+
+    monkeypatch.setattr(wire, "msgpack", None)
+    with pytest.raises(ImportError, match="pip install msgpack"):
+        plan.to_bytes()
+
+
+def test_malformed_bytes_raise_value_error():
+    pytest.importorskip("msgpack")
+    import msgpack
+
+    plan = PositionSchema.model_validate(SAMPLES["PositionSchema"](5))
+    data = encode(plan)
+    size = wire._HEADER
+    header = data[:size]
+    for body in (
+        data[size:-3],  # truncated
+        b"\xc1",  # never used by msgpack
+        msgpack.packb(5),
+        msgpack.packb([[3, [0] * 3]]),  # too few columns
+        msgpack.packb([None, [1]]),  # extra values
+    ):
+        with pytest.raises(ValueError, match="Invalid data"):
+            decode(PositionSchema, header + body)
+    fields = encode(CompanyFieldExtractorResponse(LOCATION="Germany"))
+    values = msgpack.unpackb(fields[size:])
+    values[0] = 9999  # no such country
+    with pytest.raises(ValueError, match="unknown enum code"):
+        decode(
+            CompanyFieldExtractorResponse,
+            fields[:size] + msgpack.packb(values),
+        )
+
+
+# Dumping the non-member values warns, as it does without encoding.
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_unvalidated_enum_values_are_written_as_is():
+    fields = CompanyFieldExtractorResponse.model_construct(
+        SECTORS=["Fintech", "Nope"], LOCATION="Germany"
+    )
+    back = decode(CompanyFieldExtractorResponse, encode(fields), False)
+    assert back.SECTORS == ["Fintech", "Nope"]
+    plan = PositionSchema.model_validate(SAMPLES["PositionSchema"](2))
+    plan.positions[1] = plan.positions[1].model_copy(
+        update={"department": "Moonshots"}
+    )
+    back = decode(PositionSchema, encode(plan), False)
+    assert back.positions[0].department is plan.positions[0].department
+    assert back.positions[1].department == "Moonshots"